@@ -0,0 +1,184 @@
+"""
+Async HTTP/WebSocket API for the Hiring Assistant.
+
+Serves many candidate conversations from one process: sessions live in a
+SessionManager, every session shares one DataHandler (and its write-behind
+writer thread), and process_message runs on a thread pool so translation
+round-trips and sentiment scoring never block the event loop.
+
+Run: uvicorn api_server:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, ValidationError
+
+from data_handler import DataHandler
+from utils import metrics
+from utils.logging_setup import configure_logging, shutdown_logging
+from utils.session_manager import Session, SessionManager
+
+logger = logging.getLogger(__name__)
+
+WELCOME_MESSAGE = "👋 Please type 'hi' to start."
+
+
+class MessageIn(BaseModel):
+    message: str
+    lang: Optional[str] = None  # ISO code; None lets the translator detect it
+
+
+class MessageOut(BaseModel):
+    session_id: str
+    response: str
+    stage: str
+
+
+class State:
+    """Process-wide resources, created in the lifespan handler."""
+    sessions: SessionManager
+    data_handler: DataHandler
+    executor: ThreadPoolExecutor
+
+
+async def _sweep_sessions(interval: float):
+    """Periodically spill idle sessions and expire abandoned ones; a failed sweep is retried next interval."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            state.sessions.sweep()
+        except Exception:
+            logger.exception("Session sweep failed")
+
+
+state = State()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+    state.sessions = SessionManager(
+        max_live=int(os.getenv("SESSION_MAX_LIVE", "1000")),
+        idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "900")),
+        expire_ttl=float(os.getenv("SESSION_EXPIRE_TTL", "86400")),
+        spill_dir=os.getenv("SESSION_SPILL_DIR") or None,
+        transcript_dir=os.getenv("SESSION_TRANSCRIPT_DIR") or None,
+    )
+    state.data_handler = DataHandler(os.getenv("CANDIDATE_STORE", "candidate_data.jsonl"))
+    state.executor = ThreadPoolExecutor(
+        max_workers=int(os.getenv("API_WORKERS", "32")), thread_name_prefix="chat"
+    )
+    sweeper = asyncio.create_task(_sweep_sessions(float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))))
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        state.executor.shutdown(wait=True)
+        state.data_handler.close()
+        shutdown_logging()
+
+
+app = FastAPI(title="TalentScout Hiring Assistant API", lifespan=lifespan)
+
+
+async def _handle(session: Session, payload: MessageIn) -> MessageOut:
+    """Run one chat turn off the event loop, one turn at a time per session."""
+    loop = asyncio.get_running_loop()
+    async with session.lock:
+        response = await loop.run_in_executor(
+            state.executor,
+            session.chatbot.process_message,
+            payload.message,
+            session.context,
+            state.data_handler,
+            payload.lang,
+        )
+    return MessageOut(session_id=session.session_id, response=response, stage=session.chatbot.stage)
+
+
+def _get_session(session_id: str) -> Session:
+    session = state.sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return session
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "sessions": len(state.sessions)}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of spans, counters and cache stats."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/sessions", response_model=MessageOut)
+async def create_session():
+    session = state.sessions.create()
+    return MessageOut(session_id=session.session_id, response=WELCOME_MESSAGE, stage=session.chatbot.stage)
+
+
+@app.post("/sessions/{session_id}/messages", response_model=MessageOut)
+async def post_message(session_id: str, payload: MessageIn):
+    return await _handle(_get_session(session_id), payload)
+
+
+@app.delete("/sessions/{session_id}")
+async def close_session(session_id: str):
+    if not state.sessions.close(session_id):
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return {"closed": session_id}
+
+
+@app.websocket("/ws")
+async def chat_socket(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    One conversation per socket. Clients send {"message": ..., "lang": ...}
+    and receive MessageOut JSON; pass ?session_id= to resume a session.
+    A malformed frame gets {"detail": ...} back and the socket stays open.
+    """
+    await websocket.accept()
+    session = state.sessions.get(session_id) if session_id else None
+    if session is None:
+        session = state.sessions.create()
+        await websocket.send_json(
+            MessageOut(session_id=session.session_id, response=WELCOME_MESSAGE, stage=session.chatbot.stage).model_dump()
+        )
+    held = session
+    held.sockets += 1  # keeps the live object from being spilled under the socket
+    try:
+        while True:
+            try:
+                payload = MessageIn(**await websocket.receive_json())
+            except (ValueError, TypeError) as exc:  # bad JSON (JSONDecodeError) or fields (ValidationError)
+                detail = exc.errors(include_url=False, include_context=False) \
+                    if isinstance(exc, ValidationError) else 'expected a JSON object like {"message": "hi"}'
+                await websocket.send_json({"detail": detail})
+                continue
+            # Look the session up every turn: refreshes last_seen and LRU order,
+            # and notices a session closed through the REST API
+            session = state.sessions.get(held.session_id)
+            if session is None:
+                await websocket.close(code=1000)
+                return
+            reply = await _handle(session, payload)
+            await websocket.send_json(reply.model_dump())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        held.sockets -= 1
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")))
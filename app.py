@@ -1,26 +1,70 @@
 # app.py
+import os
+import uuid
 import streamlit as st
 from chatbot import HiringAssistantChatbot
 from data_handler import DataHandler
-from textblob import TextBlob
-from googletrans import Translator
+from prompts import PREWARM_PROMPTS, SENTIMENT_SUFFIXES
+from utils.chat_history import PagedHistory
+from utils.context_manager import ContextManager, transcript_path
+from utils.conversation_state import ConversationState
+from utils.translation import SUPPORTED_LANGUAGES, get_translation_service
+from utils import metrics
+from utils.logging_setup import configure_logging
+from utils.warmup import start_background_warmup
+
+# ----------------------------
+# Logging (configured once per process, from the entry point only)
+# ----------------------------
+@st.cache_resource
+def _logging():
+    return configure_logging()
+
+_logging()
 
 # ----------------------------
 # Page Config
 # ----------------------------
 st.set_page_config(page_title="💼 TalentScout – AI Hiring Assistant", page_icon="🤖", layout="wide")
 
+# ----------------------------
+# Shared Services (heavy dependencies load on first use)
+# ----------------------------
+translation = get_translation_service()
+
+@st.cache_resource
+def _shared_data_handler():
+    """One store (and one writer thread) per process, so saves from all sessions are group-committed."""
+    return DataHandler()
+
 # ----------------------------
 # Init Session State
 # ----------------------------
-if "chatbot" not in st.session_state:
-    st.session_state.chatbot = HiringAssistantChatbot()
+# Only the compact conversation record is kept per session; the chatbot
+# wrapper around it (and the services it uses) is rebuilt each rerun.
+if "conversation" not in st.session_state:
+    st.session_state.conversation = ConversationState()
+chatbot = HiringAssistantChatbot.from_state(st.session_state.conversation)
 
 if "data_handler" not in st.session_state:
-    st.session_state.data_handler = DataHandler()
+    st.session_state.data_handler = _shared_data_handler()
+
+# The session's ContextManager is its only transcript. With
+# <TALENTSCOUT_TRANSCRIPT_DIR>/<session id>.jsonl (when that is set) a 40-message
+# window stays in memory and older pages are replayed from the file; without
+# one, the window holds everything the history can show.
+HISTORY_PAGE_SIZE, HISTORY_MAX_MESSAGES = 20, 400
+if "context" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+    path = transcript_path(st.session_state.session_id)
+    st.session_state.context = ContextManager(max_len=40 if path else HISTORY_MAX_MESSAGES, transcript_path=path)
 
 if "history" not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = PagedHistory(
+        page_size=HISTORY_PAGE_SIZE, max_messages=HISTORY_MAX_MESSAGES, context=st.session_state.context)
+
+if "visible_pages" not in st.session_state:
+    st.session_state.visible_pages = 1
 
 if "initialized" not in st.session_state:
     st.session_state.history.append(("Bot", "👋 Please type 'hi' to start."))
@@ -32,22 +76,12 @@ if "language" not in st.session_state:
 if "username" not in st.session_state:
     st.session_state.username = None
 
-translator = Translator()
-
 # ----------------------------
 # Sidebar Controls
 # ----------------------------
 st.sidebar.header("⚙️ Chat Settings")
-lang_choice = st.sidebar.selectbox("🌍 Language", ["English", "French", "German", "Spanish", "Telugu", "Hindi"])
-lang_map = {
-    "English": "en",
-    "French": "fr",
-    "German": "de",
-    "Spanish": "es",
-    "Telugu": "te",
-    "Hindi": "hi"
-}
-st.session_state.language = lang_map[lang_choice]
+lang_choice = st.sidebar.selectbox("🌍 Language", list(SUPPORTED_LANGUAGES))
+st.session_state.language = SUPPORTED_LANGUAGES[lang_choice]
 
 # ----------------------------
 # Main Title
@@ -63,45 +97,56 @@ with st.form(key="chat_form", clear_on_submit=True):
     submit = st.form_submit_button("Send")
 
 if submit and user_input:
-    # Translate input to English if needed
-    if st.session_state.language != "en":
-        translated = translator.translate(user_input, src=st.session_state.language, dest="en").text
-    else:
-        translated = user_input
-
-    # Process message with chatbot
-    response = st.session_state.chatbot.process_message(
-        translated, context=None, data_handler=st.session_state.data_handler
+    language = st.session_state.language
+
+    # Process message with chatbot (it translates input and reply itself)
+    response = chatbot.process_message(
+        user_input, context=None, data_handler=st.session_state.data_handler, lang=language
     )
 
-    # Sentiment Analysis
-    sentiment = TextBlob(translated).sentiment.polarity
-    if sentiment > 0.2:
-        response += "\n\n🙂 I sense positive vibes!"
-    elif sentiment < -0.2:
-        response += "\n\n😟 I sense some concerns. Don’t worry, I’ll guide you through."
+    # Sentiment Analysis (questions stage only): reuse the chatbot's per-turn score
+    # (suffixes are fixed strings, so translations come from the cache)
+    if chatbot.turn_stage == "questions":
+        sentiment = chatbot.turn_sentiment().label
+        if sentiment in SENTIMENT_SUFFIXES:
+            response += "\n\n" + translation.from_english(SENTIMENT_SUFFIXES[sentiment], language)
 
     # Personalization: Add candidate's name if known
-    if st.session_state.chatbot.candidate_info.get("full_name") and not st.session_state.username:
-        st.session_state.username = st.session_state.chatbot.candidate_info["full_name"]
+    if chatbot.candidate_info.get("full_name") and not st.session_state.username:
+        st.session_state.username = chatbot.candidate_info["full_name"]
     if st.session_state.username:
         response = f"{st.session_state.username}, {response}"
 
-    # Translate response back to selected language
-    if st.session_state.language != "en":
-        response = translator.translate(response, src="en", dest=st.session_state.language).text
-
-    # Save history
+    # Record the turn as displayed (the chatbot is not given the context, so it is recorded once)
     st.session_state.history.append(("You", user_input))
     st.session_state.history.append(("Bot", response))
 
 # ----------------------------
 # Conversation Display (Dark Mode)
 # ----------------------------
-for sender, msg in st.session_state.history:
-    st.markdown(f"""
-    <div style='background:black; color:white; padding:10px; border-radius:10px; margin:5px 0;'>
-    <b>{'🧑 You' if sender == 'You' else '🤖 Bot'}:</b> {msg}
-    </div>
-    """, unsafe_allow_html=True)
+# Only the newest pages are sent; full pages are rendered once and cached,
+# so each turn only formats the messages on the last page.
+history = st.session_state.history
+if history.page_count() > st.session_state.visible_pages:
+    if st.button("⬆️ Load earlier messages"):
+        st.session_state.visible_pages += 1
+
+for page_html in history.render_pages(st.session_state.visible_pages):
+    st.markdown(page_html, unsafe_allow_html=True)
+
+# ----------------------------
+# Background Warm-up (after the first paint)
+# ----------------------------
+@st.cache_resource
+def _warmup():
+    return start_background_warmup(SUPPORTED_LANGUAGES.values(), PREWARM_PROMPTS)
+
+_warmup()
+
+@st.cache_resource
+def _metrics_dump():
+    """Write Prometheus-format metrics to TALENTSCOUT_METRICS_DUMP every minute, if set."""
+    path = os.getenv("TALENTSCOUT_METRICS_DUMP")
+    return metrics.start_periodic_dump(path) if path else None
 
+_metrics_dump()
@@ -4,166 +4,275 @@ question generation, fallback, exit handling,
 plus sentiment analysis, multilingual support, and personalization.
 """
 
-import re
 import logging
 from typing import Optional
-from textblob import TextBlob
-from googletrans import Translator
 
-from prompts import GREETING_PROMPT, EXIT_KEYWORDS, FALLBACK_PROMPT, THANK_YOU_PROMPT
-from utils.question_generator import generate_questions
+from prompts import (
+    GREETING_PROMPT, FALLBACK_PROMPT, THANK_YOU_PROMPT, START_PROMPT,
+    TECH_STACK_PROMPT, TECH_STACK_PARSE_ERROR, VALIDATION_PROMPTS, SENTIMENT_PROMPTS,
+    MORE_QUESTIONS_HEADER, NO_MORE_QUESTIONS,
+)
+from utils.question_bank import get_question_bank
+from utils.question_generator import candidate_seed, generate_questions
+from utils.rendered_questions import RenderedQuestionCache, get_rendered_question_cache, stack_key
 from utils.fallback import handle_fallback
-from utils.validators import validate_email, sanitize_tech_stack
+from utils.intents import ROUTER
+from utils.validators import sanitize_tech_stack, validate_field
+from utils.translation import TranslationService, get_translation_service
+from utils.sentiment import SentimentResult, SentimentService, get_sentiment_service
+from utils.conversation_state import FIELDS, ConversationState, Stage
+from utils import metrics
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 
 class HiringAssistantChatbot:
-    def __init__(self):
-        # candidate_info keeps progressive fields as they are provided
-        self.candidate_info = {}
-        self.stage = "greeting"  # start directly at greeting
-        self.translator = Translator()
-        self.user_lang = "en"  # default language English
-
-        # Define the required fields in order
-        self.fields = [
-            ("full_name", "Full Name"),
-            ("email", "Email"),
-            ("phone", "Phone Number"),
-            ("years_experience", "Years of Experience"),
-            ("desired_position", "Desired Position(s)"),
-            ("current_location", "Current Location"),
-        ]
-        self.current_field_index = 0
-
-    def _translate_to_en(self, text: str) -> str:
-        """Translate user input to English for processing."""
-        detected = self.translator.detect(text)
-        self.user_lang = detected.lang
-        if detected.lang != "en":
-            return self.translator.translate(text, src=detected.lang, dest="en").text
-        return text
+    # Required fields in order (shared, not copied per instance)
+    fields = FIELDS
+
+    def __init__(
+        self,
+        translation: Optional[TranslationService] = None,
+        sentiment: Optional[SentimentService] = None,
+        conversation: Optional[ConversationState] = None,
+        rendered_questions: Optional[RenderedQuestionCache] = None,
+    ):
+        # All per-candidate state lives in a compact, serializable record
+        # (stage, field index, language, candidate_info)
+        self.conversation = conversation or ConversationState()
+        # Shared across sessions so the translation cache is shared too
+        self.translation = translation or get_translation_service()
+        self.sentiment = sentiment or get_sentiment_service()
+        # Question blocks for popular stacks, shared across candidates;
+        # set the attribute to None to render every block afresh
+        if rendered_questions is None:
+            rendered_questions = get_rendered_question_cache()
+        self.rendered_questions = rendered_questions
+        self.last_message_en = ""  # English form of the latest user message
+        self._turn_sentiment: Optional[SentimentResult] = None
+        self.turn_stage = self.stage  # stage the latest message was handled in
+
+    @classmethod
+    def from_state(cls, conversation: ConversationState, **kwargs) -> "HiringAssistantChatbot":
+        """Rehydrate a chatbot around an existing (e.g. deserialized) conversation."""
+        return cls(conversation=conversation, **kwargs)
+
+    # candidate_info keeps progressive fields as they are provided
+    @property
+    def candidate_info(self):
+        return self.conversation.candidate
+
+    @candidate_info.setter
+    def candidate_info(self, value):
+        self.conversation.candidate = value
+
+    @property
+    def stage(self) -> Stage:
+        return self.conversation.stage
+
+    @stage.setter
+    def stage(self, value):
+        self.conversation.stage = Stage(value)
+
+    @property
+    def current_field_index(self) -> int:
+        return self.conversation.field_index
+
+    @current_field_index.setter
+    def current_field_index(self, value: int):
+        self.conversation.field_index = value
+
+    @property
+    def user_lang(self) -> str:
+        return self.conversation.lang
+
+    @user_lang.setter
+    def user_lang(self, value: str):
+        self.conversation.lang = value
+
+    def _translate_to_en(self, text: str, lang: Optional[str] = None) -> str:
+        """
+        Translate user input to English for processing.
+        If lang is given (e.g. from the UI) it becomes the reply language, even
+        for language-neutral input (emails, numbers, names); otherwise such
+        input keeps the current language.
+        """
+        english, detected = self.translation.to_english(text, src=lang)
+        if detected:
+            self.user_lang = detected
+        return english
 
     def _translate_back(self, text: str) -> str:
         """Translate response back to user’s language if not English."""
-        if self.user_lang != "en":
-            return self.translator.translate(text, src="en", dest=self.user_lang).text
-        return text
+        return self.translation.from_english(text, self.user_lang)
+
+    def turn_sentiment(self) -> SentimentResult:
+        """
+        Sentiment of the latest user message, scored at most once per turn
+        and shared with the UI.
+        """
+        if self._turn_sentiment is None:
+            self._turn_sentiment = self.sentiment.score(self.last_message_en)
+        return self._turn_sentiment
 
     def _analyze_sentiment(self, text: str) -> str:
         """Return sentiment category: positive, neutral, or negative."""
-        analysis = TextBlob(text).sentiment.polarity
-        if analysis > 0.2:
-            return "positive"
-        elif analysis < -0.2:
-            return "negative"
-        else:
-            return "neutral"
-
-    def process_message(self, message: str, context, data_handler) -> str:
-        # Handle multilingual translation
+        with metrics.span("talentscout_sentiment_seconds"):
+            if text == self.last_message_en:
+                return self.turn_sentiment().label
+            return self.sentiment.score(text).label
+
+    def process_message(self, message: str, context, data_handler, lang: Optional[str] = None) -> str:
+        """Reply to one candidate message; the turn is recorded in context (a ContextManager) if given."""
+        # Handle multilingual translation (one round-trip per direction)
         original_msg = message.strip()
-        message = self._translate_to_en(original_msg)
-        logger.info("Processing message in stage '%s': %s", self.stage, message)
+        message = self._translate_to_en(original_msg, lang)
+        self.last_message_en = message
+        self._turn_sentiment = None
+        self.turn_stage = self.stage
+        stage = str(self.stage)
+        # Structured fields only; the message text can carry candidate PII
+        logger.info("turn", extra={"stage": stage, "chars": len(message), "lang": self.user_lang})
+        metrics.inc("talentscout_messages_total", stage=stage)
+        with metrics.span("talentscout_stage_seconds", stage=stage):
+            reply = self._handle_stage(message, data_handler)
+        if context is not None:
+            context.add_message("user", original_msg)
+            context.add_message("assistant", reply)
+        return reply
 
-        # Exit check
-        if any(token.lower() == message.lower() or token.lower() in message.lower() for token in EXIT_KEYWORDS):
+    def _handle_stage(self, message: str, data_handler) -> str:
+        """Route an (English) message to its intent or the current stage's handler."""
+        # While collecting details, "exit" must be the whole reply, not part of a name or address
+        intents = ROUTER.route(message, whole=("exit",) if self.stage == "collect" else ())
+        if "exit" in intents:
             if self.candidate_info:
                 data_handler.save(self.candidate_info)
             return self._translate_back(THANK_YOU_PROMPT)
+        handler = self._STAGE_HANDLERS.get(self.stage, HiringAssistantChatbot._on_fallback)
+        return handler(self, message, intents, data_handler)
+
+    # Stage handlers return replies already translated to the user's language
+
+    def _on_greeting(self, message: str, intents, data_handler) -> str:
+        if "greeting" not in intents:
+            return self._translate_back(START_PROMPT)
+        self.stage = "collect"  # move to collect after hi
+        # Translated in parts so both hit the prewarmed cache (see PREWARM_PROMPTS)
+        ask = f"Please provide your {self.fields[self.current_field_index][1]}."
+        return f"{self._translate_back(GREETING_PROMPT)}\n{self._translate_back(ask)}"
+
+    def _on_collect(self, message: str, intents, data_handler) -> str:
+        return self._translate_back(self._collect_info(message, data_handler))
+
+    def _on_tech_stack(self, message: str, intents, data_handler) -> str:
+        # "My tech stack is ..." carries the stack after the phrase
+        return self._accept_tech_stack(intents.get("new_stack") or message, data_handler)
 
-        # -------- GREETING --------
-        if self.stage == "greeting":
-            if message.lower() == "hi":
-                self.stage = "collect"  # move to collect after hi
-                return self._translate_back(
-                    f"{GREETING_PROMPT}\nPlease provide your {self.fields[self.current_field_index][1]}."
-                )
-            else:
-                return self._translate_back("Please type 'hi' to begin.")
-
-        # -------- COLLECT INFO --------
-        if self.stage == "collect":
-            return self._translate_back(self._collect_info(message, data_handler))
-
-        # -------- TECH STACK --------
-        if self.stage == "tech_stack":
-            techs = sanitize_tech_stack(message)
-            if not techs:
-                return self._translate_back(
-                    "I couldn't parse your tech stack. Please provide comma-separated technologies (e.g. Python, Django, PostgreSQL)."
-                )
-            self.candidate_info["tech_stack"] = techs
-            questions_by_tech = generate_questions(techs)
-            data_handler.save(self.candidate_info)
-            self.stage = "questions"
-
-            # Personalized response
-            name = self.candidate_info.get("full_name", "Candidate")
-            lines = [f"Thank you {name} — based on your tech stack, here are tailored technical questions:\n"]
-            for tech, qs in questions_by_tech.items():
-                lines.append(f"--- {tech.upper()} ---")
-                for i, q in enumerate(qs, 1):
-                    lines.append(f"{i}. {q}")
-                lines.append("")
-            lines.append("When you're done, say 'exit' or 'bye' to finish.")
-            return self._translate_back("\n".join(lines))
-
-        # -------- QUESTIONS --------
-        if self.stage == "questions":
-            sentiment = self._analyze_sentiment(message)
-            if sentiment == "negative":
-                return self._translate_back(
-                    "I sense some hesitation. Don’t worry, take your time — you’re doing great! "
-                    "If you want more questions, say 'more'. Otherwise, say 'exit' to finish."
-                )
-            elif sentiment == "positive":
-                return self._translate_back(
-                    "Glad to hear your enthusiasm! 🎉 If you want more questions, say 'more'. Otherwise, say 'exit' to finish."
-                )
-            else:
-                return self._translate_back(
-                    "If you want more questions, say 'more'. Otherwise, say 'exit' to finish. "
-                    "You can also provide a new tech stack for fresh questions."
-                )
-
-        # -------- FALLBACK --------
+    def _on_questions(self, message: str, intents, data_handler) -> str:
+        if "more" in intents:
+            questions_by_tech = self._next_questions()
+            if not questions_by_tech:
+                return self._translate_back(NO_MORE_QUESTIONS)
+            return self._translate_back(self._format_questions(MORE_QUESTIONS_HEADER, questions_by_tech))
+        if intents.get("new_stack"):
+            return self._accept_tech_stack(intents["new_stack"], data_handler)
+        return self._translate_back(SENTIMENT_PROMPTS[self._analyze_sentiment(message)])
+
+    def _on_fallback(self, message: str, intents, data_handler) -> str:
         return self._translate_back(handle_fallback(message))
 
+    _STAGE_HANDLERS = {
+        Stage.GREETING: _on_greeting,
+        Stage.COLLECT: _on_collect,
+        Stage.TECH_STACK: _on_tech_stack,
+        Stage.QUESTIONS: _on_questions,
+    }
+
+    def _accept_tech_stack(self, text: str, data_handler) -> str:
+        """Store a tech stack, save the candidate and reply with questions for it."""
+        techs = sanitize_tech_stack(text)
+        if not techs:
+            return self._translate_back(TECH_STACK_PARSE_ERROR)
+        self.candidate_info["tech_stack"] = techs
+        questions = self._question_block()
+        data_handler.save(self.candidate_info)
+        self.stage = "questions"
+
+        # Only the personalized line is rendered per candidate
+        name = self.candidate_info.get("full_name", "Candidate")
+        header = f"Thank you {name} — based on your tech stack, here are tailored technical questions:"
+        return f"{self._translate_back(header)}\n\n{questions}"
+
+    def _question_block(self) -> str:
+        """
+        Translated question list for a newly given stack. Before anything has
+        been asked it comes from the shared rendered-question cache, keyed by
+        the current question-bank generation.
+        """
+        if self.rendered_questions is None or self.conversation.asked:
+            return self._translate_back(self._format_question_list(self._next_questions()))
+
+        def render(stack, seed):
+            picked, fallbacks = set(), set()
+            with metrics.span("talentscout_question_generation_seconds"):
+                questions_by_tech = generate_questions(list(stack), seed=seed, exclude=picked, fallbacks=fallbacks)
+            # Template stand-ins for model questions still being generated are not shared
+            return self._translate_back(self._format_question_list(questions_by_tech)), picked, not fallbacks
+
+        techs = self.candidate_info["tech_stack"]
+        block = self.rendered_questions.get_or_render(
+            stack_key(techs), candidate_seed(self.candidate_info.get("email", ""), techs), self.user_lang, render,
+            get_question_bank().generation)
+        self.conversation.asked.update(block.question_ids)
+        return block.text
+
+    def _next_questions(self):
+        """
+        Questions for the stored tech stack that this candidate has not seen yet,
+        sampled deterministically from their email and stack.
+        """
+        techs = self.candidate_info.get("tech_stack", [])
+        seed = candidate_seed(self.candidate_info.get("email", ""), techs)
+        # Offset by what was already asked so each "more" draws a new sample
+        with metrics.span("talentscout_question_generation_seconds"):
+            return generate_questions(techs, seed=seed + len(self.conversation.asked), exclude=self.conversation.asked)
+
+    @classmethod
+    def _format_questions(cls, header: str, questions_by_tech) -> str:
+        return f"{header}\n{cls._format_question_list(questions_by_tech)}"
+
+    @staticmethod
+    def _format_question_list(questions_by_tech) -> str:
+        lines = []
+        for tech, qs in questions_by_tech.items():
+            lines.append(f"--- {tech.upper()} ---")
+            for i, q in enumerate(qs, 1):
+                lines.append(f"{i}. {q}")
+            lines.append("")
+        lines.append("When you're done, say 'exit' or 'bye' to finish.")
+        return "\n".join(lines)
+
     def _collect_info(self, message: str, data_handler) -> str:
         """
         Sequentially collect fields from the user with validation.
         """
         key, human = self.fields[self.current_field_index]
 
-        # Validation
-        if key == "full_name":
-            if not re.match(r"^[A-Za-z ]{2,50}$", message):
-                return "Please enter a valid name (only letters and spaces, 2–50 characters)."
-        if key == "email":
-            if not validate_email(message):
-                return "That doesn't look like a valid email. Please enter a valid email address (e.g. name@example.com)."
-        if key == "phone":
-            # ✅ Accept only global phone numbers with country code (+XX ...), allow spaces
-            if not re.match(r"^\+\d{1,3}[\s]?\d{6,14}$", message.replace(" ", "")):
-                return "That doesn't look like a valid phone number. Please include country code (e.g. +91 9876543210)."
-        if key == "years_experience":
-            if not message.isdigit() or int(message) < 0:
-                return "Please enter a valid number for Years of Experience (0 or more)."
-        if key == "current_location":
-            if not re.match(r"^[A-Za-z ]{2,50}$", message):
-                return "Please enter a valid location (only letters and spaces, 2–50 characters)."
+        # Validation (shared with bulk imports, see utils.validators)
+        ok, value = validate_field(key, message)
+        if not ok:
+            metrics.inc("talentscout_validation_failures_total", field=key)
+            return VALIDATION_PROMPTS[key]
 
         # Save field
-        self.candidate_info[key] = message
+        self.candidate_info[key] = value
         self.current_field_index += 1
 
         # Check if all fields collected
         if self.current_field_index >= len(self.fields):
             self.stage = "tech_stack"
-            return "✅ All set. Please now provide your Tech Stack (comma-separated): languages, frameworks, databases, tools."
+            return TECH_STACK_PROMPT
 
         # Otherwise ask next field
         next_key, next_human = self.fields[self.current_field_index]
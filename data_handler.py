@@ -0,0 +1,910 @@
+"""
+Candidate data storage (simulated secure storage + anonymization).
+
+Records are appended to JSON Lines files instead of rewriting one big JSON
+array, so the cost of a save does not depend on how many candidates are
+already stored. The store is partitioned by `_saved_at` into segments, one
+file per month (or day) in a directory next to the store path
+(candidate_data.jsonl -> candidate_data.segments/2025-01.jsonl). An in-memory
+index maps each candidate (by hashed email) to the segment and byte offset of
+its latest record, and a second index keeps records ordered by `_saved_at`.
+Superseded records are folded away by a background compaction pass, segment
+by segment, once they make up a large enough share of one.
+Secondary indexes (utils/candidate_index.py) on tech stack, years of
+experience and location back query(), which reads only the matching page.
+
+Retention and erasure never rewrite the whole store. purge_before() unlinks
+every segment older than the cutoff, so its cost follows the amount of data
+expired. erase() hides a candidate at once and appends a tombstone to
+tombstones.jsonl; only the segments holding that candidate's records are
+compacted, and the tombstone is folded away once they are clean. Until then
+the tombstone also hides those records when the store is reopened.
+
+Saves are deduplicated (utils/dedupe.py): a record matching a stored
+candidate by email, by phone and name, or by a near-identical name and profile
+is merged into that candidate as a new version, and a save that changes
+nothing is not written at all.
+
+Saves are write-behind: save() only queues the record and returns a
+Future, while a dedicated writer thread group-commits everything queued
+within a short batch window with a single write + fsync per segment.
+Each record is stamped with a sequence number (`_seq`) under the lock, so
+when concurrent saves of one candidate reach the queue out of order, the
+index (and a rebuild on reopen) still keeps the one saved last.
+"""
+
+import atexit
+import bisect
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from utils import metrics
+from utils.candidate_index import CandidateIndex
+from utils.dedupe import DuplicateIndex, merge_records, same_content
+
+logger = logging.getLogger(__name__)
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+_SENSITIVE_FIELDS = ("email", "phone")
+
+# Segment names per partition: 2025-01 (month) or 2025-01-31 (day)
+PARTITIONS = {"month": 7, "day": 10}
+_SEGMENT_RE = re.compile(r"^\d{4}-\d{2}(-\d{2})?$")
+_UNDATED = "0000-00-00"  # records without a usable _saved_at; sorts first
+TOMBSTONES = "tombstones.jsonl"
+
+
+def _hash_value(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def normalize_identifier(field: str, value: str) -> str:
+    """Canonical form hashed for a sensitive field: lowercased email, phone digits."""
+    if field == "phone":
+        return "".join(ch for ch in value if ch.isdigit())
+    return value.strip().lower()
+
+
+def anonymize(record: Dict) -> Dict:
+    """Return a copy of record with sensitive fields replaced by SHA-256 hashes."""
+    out = dict(record)
+    for field in _SENSITIVE_FIELDS:
+        value = out.get(field)
+        if isinstance(value, str) and value and not _HASH_RE.match(value):
+            out[field] = _hash_value(normalize_identifier(field, value))
+    return out
+
+
+def segment_dir_for(path: str) -> str:
+    """Segment directory of the store at path (candidate_data.jsonl -> candidate_data.segments)."""
+    return os.path.splitext(path)[0] + ".segments"
+
+
+def segment_name(saved_at: str, partition: str = "month") -> str:
+    """Segment holding a record saved at saved_at (an ISO timestamp or date)."""
+    width = PARTITIONS[partition]
+    name = (saved_at or "")[:width]
+    return name if len(name) == width and _SEGMENT_RE.match(name) else _UNDATED[:width]
+
+
+def segment_path(segment_dir: str, segment: str) -> str:
+    return os.path.join(segment_dir, segment + ".jsonl")
+
+
+def list_segments(segment_dir: str) -> List[str]:
+    """Segment names in segment_dir, oldest first."""
+    try:
+        names = os.listdir(segment_dir)
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-6] for name in names if name.endswith(".jsonl") and _SEGMENT_RE.match(name[:-6]))
+
+
+def load_tombstones(segment_dir: str) -> Dict[str, Tuple[str, List[str]]]:
+    """{key: (erased_at, segments)} of the erasures not yet folded away."""
+    tombstones = {}
+    try:
+        with open(os.path.join(segment_dir, TOMBSTONES), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    tombstones[entry["key"]] = (entry["erased_at"], entry.get("segments", []))
+    except FileNotFoundError:
+        pass
+    return tombstones
+
+
+def is_erased(record: Dict, erased: Dict[str, str]) -> bool:
+    """Whether a tombstone ({key: erased_at}) hides record: same key, saved no later."""
+    erased_at = erased.get(record.get("email") or "")
+    return erased_at is not None and (record.get("_saved_at") or "") <= erased_at
+
+
+# One page of query() results; total counts every match
+CandidatePage = namedtuple("CandidatePage", ["records", "total", "page", "page_size"])
+
+# Queue marker that stops the writer thread
+_STOP = object()
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class DataHandler:
+    """
+    Append-only, indexed, time-partitioned candidate store.
+
+    - save(): anonymize, merge into a matching candidate and queue the record for
+      the writer thread; returns a Future that resolves to the stored record
+      once it is fsynced
+    - flush() / close(): wait for queued saves / stop the writer thread
+    - get() / load_all(): read latest records through the index
+    - saved_between(): range lookup on `_saved_at`
+    - stats(): candidates per tech and years of experience, from the indexes
+    - query(): paginated filter by tech, years of experience and location
+      through secondary indexes kept up to date on every write
+    - erase() / purge_before(): per-candidate erasure and segment retention
+    - compact(): rewrite segments keeping only the latest record per candidate
+    """
+
+    def __init__(
+        self,
+        path: str = "candidate_data.jsonl",
+        legacy_path: Optional[str] = None,
+        compact_ratio: float = 0.5,
+        compact_min_records: int = 1000,
+        auto_compact: bool = True,
+        write_behind: bool = True,
+        batch_window_ms: float = 20.0,
+        max_queue: int = 10000,
+        fsync: bool = True,
+        dedupe: bool = True,
+        partition: str = "month",
+    ):
+        if partition not in PARTITIONS:
+            raise ValueError(f"partition must be one of {sorted(PARTITIONS)}")
+        self.path = path
+        self.segment_dir = segment_dir_for(path)
+        self.partition = partition
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self.auto_compact = auto_compact
+        self.write_behind = write_behind
+        self.batch_window = batch_window_ms / 1000.0
+        self.fsync = fsync
+        self.dedupe = dedupe
+
+        self._lock = threading.RLock()
+        self._maintenance = threading.Lock()  # one compaction or purge at a time
+        self._index: Dict[str, Tuple[str, int, int, str]] = {}  # key -> (segment, offset, length, saved_at)
+        self._saved_at: List[Tuple[str, str]] = []  # (saved_at, key), sorted
+        self._segment_keys: Dict[str, Set[str]] = {}  # segment -> keys whose latest record it holds
+        self._segment_lines: Dict[str, int] = {}  # segment -> lines, including superseded ones
+        self._older: Dict[str, Set[str]] = {}  # key -> other segments still holding its old records
+        self._tombstones: Dict[str, Tuple[str, Set[str]]] = {}  # key -> (erased_at, segments not yet clean)
+        self._secondary = CandidateIndex()  # tech / experience / location -> keys
+        self._duplicates = DuplicateIndex()  # phone / name blocks -> keys, email aliases
+        self._total = 0  # lines in all segments, including superseded ones
+        self._compacting = False
+        self._pending: Dict[str, Dict] = {}  # queued but not yet written, by key
+        self._seq: Dict[str, int] = {}  # key -> _seq of its indexed record
+        self._next_seq = 1
+        self._closed = False
+
+        if legacy_path is None:
+            # e.g. candidate_data.jsonl <- candidate_data.json
+            legacy_path = os.path.splitext(path)[0] + ".json"
+        self._migrate_legacy(legacy_path)
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self._rebuild_index()
+
+        # Bounded queue: save() blocks (backpressure) once max_queue saves are waiting
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._writer = None
+        if self.write_behind:
+            self._writer = threading.Thread(target=self._writer_loop, name="DataHandlerWriter", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    # ---------- public API ----------
+
+    def save(self, candidate_info: Dict) -> Future:
+        """
+        Anonymize and queue a candidate record, merged into the stored
+        candidate it duplicates. Returns a Future resolving to the stored
+        record once it is on disk (at once if the save changed nothing);
+        callers that do not need durability can ignore it.
+        """
+        if self._closed:
+            raise RuntimeError("DataHandler is closed")
+        with metrics.span("talentscout_save_seconds"):
+            record = anonymize(candidate_info)
+            future: Future = Future()
+            with self._lock:
+                record, changed = self._merge_duplicate(record)
+                if not changed:
+                    future.set_result(record)
+                    return future
+                record["_saved_at"] = _utc_now()
+                record["_seq"] = self._next_seq
+                self._next_seq += 1
+                email = record.get("email")
+                if email and self.dedupe:
+                    self._duplicates.add(email, record)
+                if not self.write_behind:
+                    self._write_batch([(record, future)])
+                    return future
+                if email:
+                    self._pending[email] = record
+            self._queue.put((record, future))
+            return future
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every save queued before this call is durable."""
+        if not self.write_behind or self._writer is None or not self._writer.is_alive():
+            return
+        marker: Future = Future()
+        self._queue.put((None, marker))
+        marker.result(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush pending saves and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join(timeout)
+
+    def get(self, email: str) -> Optional[Dict]:
+        """Return the latest record for an email (plain or already hashed, or a merged alias)."""
+        with self._lock:
+            key = self._resolve(email)
+            if key in self._pending:
+                return dict(self._pending[key])
+            loc = self._index.get(key)
+            if loc is None:
+                return None
+            return self._read_at(loc)
+
+    def load_all(self) -> List[Dict]:
+        """Return the latest record of every candidate, oldest segment first."""
+        return list(self.iter_latest())
+
+    def iter_latest(self) -> Iterator[Dict]:
+        self.flush()
+        with self._lock:
+            locs = sorted(self._index.values())
+            files = self._open_segments(loc[0] for loc in locs)
+        return _read_locations(files, locs)
+
+    def stats(self) -> Dict:
+        """
+        {"candidates", "techs", "years"} over the latest records, counted from
+        the secondary indexes without reading any (years as in CandidateIndex).
+        """
+        self.flush()
+        with self._lock:
+            techs, years = self._secondary.counts()
+            return {"candidates": len(self._index), "techs": techs, "years": years}
+
+    def saved_between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Latest records whose `_saved_at` falls in [start, end)."""
+        self.flush()
+        with self._lock:
+            lo = 0 if start is None else bisect.bisect_left(self._saved_at, (start, ""))
+            hi = len(self._saved_at) if end is None else bisect.bisect_left(self._saved_at, (end, ""))
+            locs = [self._index[key] for _, key in self._saved_at[lo:hi]]
+            files = self._open_segments(loc[0] for loc in locs)
+        return list(_read_locations(files, locs))
+
+    def query(
+        self,
+        tech=None,
+        min_years: Optional[int] = None,
+        max_years: Optional[int] = None,
+        location: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> CandidatePage:
+        """
+        Latest records matching every given filter (tech may be a name or a
+        list of names that must all be present; years are inclusive), oldest
+        candidate first. Only the records on the requested page are read.
+        """
+        if not self._queue.empty():
+            self.flush()
+        page = max(page, 1)
+        with self._lock:
+            keys, total = self._secondary.search(
+                tech, min_years, max_years, location, offset=(page - 1) * page_size, limit=page_size)
+            locs = [self._index[key] for key in keys]
+            files = self._open_segments(loc[0] for loc in locs)
+        return CandidatePage(list(_read_locations(files, locs)), total, page, page_size)
+
+    def segments(self) -> List[str]:
+        """Segment names, oldest first."""
+        with self._lock:
+            return sorted(self._segment_lines)
+
+    def erased_segments(self) -> List[str]:
+        """Segments still holding records of erased candidates (cleaned by compact())."""
+        with self._lock:
+            return sorted(set().union(*(segments for _, segments in self._tombstones.values())))
+
+    def erase(self, email: str) -> bool:
+        """
+        Erase a candidate (plain or hashed email, or a merged alias); False if
+        unknown. Reads stop returning it at once; the segments holding its
+        records are compacted in the background (or by the next compact()).
+        """
+        while True:
+            self.flush()
+            with self._lock:
+                key = self._resolve(email)
+                if key in self._pending:  # saved again meanwhile: write it first
+                    continue
+                loc = self._index.get(key)
+                if loc is None:
+                    return False
+                segments = ({loc[0]} | self._older.pop(key, set())) & self._segment_lines.keys()
+                erased_at = max(_utc_now(), loc[3])  # covers every record of the candidate
+                self._append_tombstone(key, erased_at, segments)
+                self._tombstones[key] = (erased_at, segments)
+                self._segment_keys[loc[0]].discard(key)
+                self._forget(key)
+                break
+        metrics.inc("talentscout_erasures_total")
+        if self.auto_compact:
+            self.compact_async(segments)
+        return True
+
+    def purge_before(self, cutoff: str) -> List[str]:
+        """
+        Retention: delete every segment older than the one cutoff (an ISO date
+        or timestamp) falls in, with the candidates whose latest record is in
+        them. Returns the deleted segment names. Records in cutoff's own
+        segment are kept, so retention is exact to a month (or day).
+        """
+        self.flush()
+        boundary = segment_name(cutoff, self.partition)
+        with self._maintenance, self._lock:
+            expired = [segment for segment in sorted(self._segment_lines) if segment < boundary]
+            if not expired:
+                return []
+            dropped = 0
+            for segment in expired:
+                for key in self._segment_keys.pop(segment, ()):
+                    self._forget(key, unsort=False)
+                    dropped += 1
+                self._total -= self._segment_lines.pop(segment)
+            # Expired records are exactly the oldest _saved_at entries unless
+            # some carry a timestamp that is not in ISO form
+            pos = bisect.bisect_left(self._saved_at, (boundary, ""))
+            if pos == dropped and all(key not in self._index for _, key in self._saved_at[:pos]):
+                del self._saved_at[:pos]
+            else:
+                self._saved_at = [entry for entry in self._saved_at if entry[1] in self._index]
+            self._segment_cleaned(expired)
+            for segment in expired:
+                os.remove(segment_path(self.segment_dir, segment))
+            if self.fsync:
+                _fsync_dir(self.segment_dir)
+        metrics.inc("talentscout_purged_segments_total", len(expired))
+        logger.info("Purged %d segments (%d candidates) before %s", len(expired), dropped, boundary)
+        return expired
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def superseded(self) -> int:
+        return self._total - len(self._index)
+
+    # ---------- writer thread ----------
+
+    def _writer_loop(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write_batch(batch)
+        # Drain whatever was queued behind the stop marker
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftovers.append(item)
+        if leftovers:
+            self._write_batch(leftovers)
+
+    def _write_batch(self, batch):
+        """Append a batch of (record, future) pairs with one write + fsync per segment."""
+        records = [(record, future) for record, future in batch if record is not None]
+        markers = [future for record, future in batch if record is None]
+        lines = [(json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8") for record, _ in records]
+        by_segment: Dict[str, List[int]] = {}
+        for i, (record, _) in enumerate(records):
+            by_segment.setdefault(segment_name(record.get("_saved_at", ""), self.partition), []).append(i)
+
+        try:
+            with self._lock:
+                for segment, members in by_segment.items():
+                    is_new = segment not in self._segment_lines
+                    with metrics.span("talentscout_store_commit_seconds"), \
+                            open(segment_path(self.segment_dir, segment), "ab") as f:
+                        offset = f.tell()
+                        f.write(b"".join(lines[i] for i in members))
+                        f.flush()
+                        if self.fsync:
+                            os.fsync(f.fileno())
+                    if is_new and self.fsync:
+                        _fsync_dir(self.segment_dir)
+                    for i in members:
+                        self._index_record(records[i][0], segment, offset, len(lines[i]))
+                        offset += len(lines[i])
+                for record, _ in records:
+                    email = record.get("email")
+                    if email and self._pending.get(email) is record:
+                        del self._pending[email]
+                to_compact = [] if self._compacting or not self.auto_compact else \
+                    self._segments_to_compact(by_segment)
+        except Exception as exc:
+            logger.exception("Writing %d records to %s failed", len(records), self.segment_dir)
+            with self._lock:
+                for record, _ in records:
+                    email = record.get("email")
+                    if email and self._pending.get(email) is record:
+                        del self._pending[email]
+            for _, future in records:
+                future.set_exception(exc)
+            for future in markers:
+                future.set_exception(exc)
+            return
+
+        for record, future in records:
+            future.set_result(record)
+        for future in markers:
+            future.set_result(None)
+        if to_compact:
+            self.compact_async(to_compact)
+
+    # ---------- compaction ----------
+
+    def compact_async(self, segments: Optional[Iterable[str]] = None) -> Optional[threading.Thread]:
+        """Run compact() on a daemon thread unless one is already running."""
+        with self._lock:
+            if self._compacting:
+                return None
+            self._compacting = True
+        thread = threading.Thread(target=self._compact_worker, args=(segments,), daemon=True)
+        thread.start()
+        return thread
+
+    def _compact_worker(self, segments):
+        try:
+            self.compact(segments, _already_claimed=True)
+        except Exception:
+            logger.exception("Compaction of %s failed", self.segment_dir)
+
+    def compact(self, segments: Optional[Iterable[str]] = None, _already_claimed: bool = False):
+        """
+        Rewrite segments keeping only the latest record per candidate (by
+        default every segment holding superseded or erased records), then
+        fold away tombstones whose segments are all clean. With auto_compact,
+        segments that need it by the time a pass ends (e.g. after an erase()
+        during the pass) are compacted too.
+        """
+        with self._lock:
+            if self._compacting and not _already_claimed:
+                return
+            self._compacting = True
+        try:
+            with self._maintenance:
+                while True:
+                    with self._lock:
+                        wanted = self._segment_lines if segments is None else set(segments)
+                        targets = [s for s in sorted(wanted) if s in self._segment_lines]
+                    for segment in targets:
+                        with self._lock:
+                            clean = not self._dead_lines(segment)
+                            if clean:
+                                self._segment_cleaned([segment])
+                        if not clean:
+                            self._compact_segment(segment)
+                    with self._lock:
+                        self._fold_tombstones()
+                        segments = self._segments_to_compact() if self.auto_compact else []
+                        if not segments:
+                            self._compacting = False
+                            return
+        except BaseException:
+            with self._lock:
+                self._compacting = False
+            raise
+
+    def _compact_segment(self, segment: str):
+        """
+        Copy a segment's live records to a new file and swap it in. The bulk
+        copy runs without the lock; records appended meanwhile are copied over
+        under the lock just before the atomic swap.
+        """
+        path = segment_path(self.segment_dir, segment)
+        with self._lock:
+            snapshot_size = os.path.getsize(path)
+            keys = self._segment_keys.setdefault(segment, set())
+            locs = sorted((self._index[key][1], self._index[key][2], key) for key in keys)
+
+        tmp_path = path + ".compact"
+        moved: Dict[str, Tuple[int, int, bytes]] = {}  # key -> (old offset, new offset, line)
+        try:
+            with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                for offset, length, key in locs:
+                    src.seek(offset)
+                    line = src.read(length)
+                    moved[key] = (offset, dst.tell(), line if key.startswith("#") else b"")
+                    dst.write(line)
+
+            with self._lock:
+                index = self._index
+                live_tail = {index[key][1] for key in keys if index[key][1] >= snapshot_size}
+                tail: Dict[int, Tuple[int, bytes]] = {}  # old offset -> (new offset, line)
+                with open(path, "rb") as src, open(tmp_path, "ab") as dst:
+                    src.seek(snapshot_size)
+                    offset = snapshot_size
+                    for line in src:
+                        if offset in live_tail:
+                            tail[offset] = (dst.tell(), line)
+                            dst.write(line)
+                        offset += len(line)
+                    dst.flush()
+                    if self.fsync:
+                        os.fsync(dst.fileno())
+                os.replace(tmp_path, path)
+
+                renamed = []
+                for key in list(keys):
+                    _, offset, length, saved_at = index[key]
+                    new_offset, line = tail[offset] if offset >= snapshot_size else moved[key][1:]
+                    if key.startswith("#"):  # email-less keys name their offset
+                        renamed.append((key, json.loads(line), new_offset, length, saved_at))
+                    else:
+                        index[key] = (segment, new_offset, length, saved_at)
+                for key, _, _, _, _ in renamed:
+                    self._forget(key)
+                    keys.discard(key)
+                for _, record, new_offset, length, saved_at in renamed:
+                    key = f"#{segment}:{new_offset}"
+                    index[key] = (segment, new_offset, length, saved_at)
+                    keys.add(key)
+                    bisect.insort(self._saved_at, (saved_at, key))
+                    self._secondary.add(key, record)
+
+                lines = len(moved) + len(tail)
+                self._total += lines - self._segment_lines[segment]
+                self._segment_lines[segment] = lines
+                if not lines:  # everything in it was erased or superseded elsewhere
+                    os.remove(path)
+                    del self._segment_lines[segment], self._segment_keys[segment]
+                self._segment_cleaned([segment])
+                # Copied records superseded or erased during the bulk copy are still in the segment
+                for key, (old_offset, _, _) in moved.items():
+                    loc = index.get(key)
+                    if loc is not None and loc[:2] == (segment, old_offset):
+                        continue
+                    if key in self._tombstones:
+                        self._tombstones[key][1].add(segment)
+                    elif loc is not None:
+                        self._older.setdefault(key, set()).add(segment)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ---------- internals ----------
+
+    def _resolve(self, email: str) -> str:
+        key = email if _HASH_RE.match(email or "") else _hash_value(normalize_identifier("email", email or ""))
+        return self._duplicates.resolve(key) or key
+
+    def _merge_duplicate(self, record: Dict) -> Tuple[Dict, bool]:
+        """
+        (record to store, whether anything changed). A duplicate comes back
+        merged into the stored candidate; an unchanged one as the stored record.
+        Called with the lock held.
+        """
+        if not self.dedupe:
+            return record, True
+        match = self._duplicates.match(record)
+        if match is None:
+            return record, True
+        key, reason = match
+        old = self._pending.get(key)
+        if old is None:
+            loc = self._index.get(key)
+            if loc is None:
+                return record, True
+            old = self._read_at(loc)
+        merged = merge_records(old, record)
+        if same_content(old, merged):
+            metrics.inc("talentscout_duplicates_total", match=reason, outcome="unchanged")
+            return old, False
+        metrics.inc("talentscout_duplicates_total", match=reason, outcome="merged")
+        merged["_merged_by"] = reason  # reports tell resubmissions (email) from duplicates
+        return merged, True
+
+    def _dead_lines(self, segment: str) -> int:
+        return self._segment_lines[segment] - len(self._segment_keys.get(segment, ()))
+
+    def _segments_to_compact(self, candidates: Optional[Iterable[str]] = None) -> List[str]:
+        """Segments holding erased records, or mostly superseded ones (of candidates, default all)."""
+        wanted = set()
+        for _, segments in self._tombstones.values():
+            wanted |= segments
+        for segment in self._segment_lines if candidates is None else candidates:
+            lines = self._segment_lines.get(segment, 0)
+            dead = self._dead_lines(segment) if lines else 0
+            if dead and lines >= self.compact_min_records and dead >= lines * self.compact_ratio:
+                wanted.add(segment)
+        return sorted(wanted & self._segment_lines.keys())
+
+    def _segment_cleaned(self, segments: List[str]):
+        """segments no longer hold superseded or erased records (compacted or deleted)."""
+        for key in list(self._older):
+            self._older[key].difference_update(segments)
+            if not self._older[key]:
+                del self._older[key]
+        for _, pending in self._tombstones.values():
+            pending.difference_update(segments)
+        self._fold_tombstones()
+
+    def _fold_tombstones(self):
+        """Drop tombstones whose records are all physically gone."""
+        done = [key for key, (_, segments) in self._tombstones.items() if not segments]
+        if not done:
+            return
+        for key in done:
+            del self._tombstones[key]
+        path = os.path.join(self.segment_dir, TOMBSTONES)
+        if not self._tombstones:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            for key, (erased_at, segments) in self._tombstones.items():
+                f.write(json.dumps({"key": key, "erased_at": erased_at, "segments": sorted(segments)}) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _append_tombstone(self, key: str, erased_at: str, segments: Set[str]):
+        with open(os.path.join(self.segment_dir, TOMBSTONES), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "erased_at": erased_at, "segments": sorted(segments)}) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def _key_for(self, record: Dict, segment: str, offset: int) -> str:
+        email = record.get("email")
+        return email if email else f"#{segment}:{offset}"
+
+    def _index_record(self, record: Dict, segment: str, offset: int, length: int, keep_sorted: bool = True) -> bool:
+        """Index a record just read or written; False (counted as superseded) if a later save is indexed."""
+        key = self._key_for(record, segment, offset)
+        saved_at = record.get("_saved_at", "")
+        seq = record.get("_seq") or 0
+        previous = self._index.get(key)
+        self._segment_lines[segment] = self._segment_lines.get(segment, 0) + 1
+        self._total += 1
+        if previous is not None and seq < self._seq.get(key, 0):
+            if previous[0] != segment:
+                self._older.setdefault(key, set()).add(segment)
+            return False
+        if previous is not None:
+            if keep_sorted:
+                self._unsort(key, previous[3])
+            if previous[0] != segment:
+                self._segment_keys[previous[0]].discard(key)
+                self._older.setdefault(key, set()).add(previous[0])
+        self._index[key] = (segment, offset, length, saved_at)
+        self._seq[key] = seq
+        self._segment_keys.setdefault(segment, set()).add(key)
+        if keep_sorted:
+            bisect.insort(self._saved_at, (saved_at, key))
+        self._secondary.add(key, record)
+        return True
+
+    def _unsort(self, key: str, saved_at: str):
+        entry = (saved_at, key)
+        pos = bisect.bisect_left(self._saved_at, entry)
+        if pos < len(self._saved_at) and self._saved_at[pos] == entry:
+            del self._saved_at[pos]
+
+    def _forget(self, key: str, unsort: bool = True):
+        """Drop key from every index except _segment_keys (the caller's job)."""
+        loc = self._index.pop(key)
+        self._seq.pop(key, None)
+        if unsort:
+            self._unsort(key, loc[3])
+        self._older.pop(key, None)
+        self._secondary.remove(key)
+        self._duplicates.remove(key)
+
+    def _read_at(self, loc: Tuple[str, int, int, str]) -> Dict:
+        with open(segment_path(self.segment_dir, loc[0]), "rb") as f:
+            f.seek(loc[1])
+            return json.loads(f.read(loc[2]))
+
+    def _open_segments(self, segments: Iterable[str]) -> Dict:
+        """Open each segment once; called under the lock so offsets match the files."""
+        return {segment: open(segment_path(self.segment_dir, segment), "rb") for segment in set(segments)}
+
+    def _rebuild_index(self):
+        self._index = {}
+        self._saved_at = []
+        self._segment_keys = {}
+        self._segment_lines = {}
+        self._older = {}
+        self._seq = {}
+        self._secondary.clear()
+        self._duplicates.clear()
+        self._total = 0
+        tombstones = load_tombstones(self.segment_dir)
+        erased = {key: erased_at for key, (erased_at, _) in tombstones.items()}
+        unclean: Dict[str, Set[str]] = {key: set() for key in tombstones}
+        for segment in list_segments(self.segment_dir):
+            self._segment_lines[segment] = 0
+            offset = 0
+            with open(segment_path(self.segment_dir, segment), "rb") as f:
+                for line in f:
+                    length = len(line)
+                    if line.strip():
+                        record = json.loads(line)
+                        if erased and is_erased(record, erased):
+                            unclean[record["email"]].add(segment)
+                            self._segment_lines[segment] += 1
+                            self._total += 1
+                        elif self._index_record(record, segment, offset, length, keep_sorted=False):
+                            if self.dedupe and record.get("email"):
+                                self._duplicates.add(record["email"], record)
+                        self._next_seq = max(self._next_seq, (record.get("_seq") or 0) + 1)
+                    offset += length
+        self._saved_at = sorted((loc[3], key) for key, loc in self._index.items())
+        self._tombstones = {key: (erased[key], segments) for key, segments in unclean.items()}
+        if self.dedupe:
+            for key, record in self._pending.items():  # saved but not yet written
+                self._duplicates.add(key, record)
+        self._fold_tombstones()
+
+    def _migrate_legacy(self, legacy_path: Optional[str]):
+        """
+        Convert an older store into segments: a JSON array (a separate legacy
+        file or stored at self.path itself) or a single JSON Lines file at
+        self.path, which is removed once its segments are in place.
+        """
+        if os.path.isdir(self.segment_dir):
+            if os.path.exists(self.path):
+                logger.warning("Ignoring %s: the store already lives in %s", self.path, self.segment_dir)
+            return
+        if os.path.exists(self.path):
+            source = self.path
+        elif legacy_path and os.path.exists(legacy_path) and _is_json_array(legacy_path):
+            source = legacy_path
+        else:
+            return
+
+        if _is_json_array(source):
+            with open(source, "r", encoding="utf-8") as f:
+                try:
+                    records = json.load(f)
+                except json.JSONDecodeError:
+                    logger.warning("Legacy store %s is not valid JSON; skipping migration", source)
+                    return
+            folded = self._fold_legacy(records)
+            lines = ((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8") for record in folded)
+            count = f"{len(records)} legacy records ({len(folded)} candidates)"
+        else:
+            lines = _iter_lines(source)
+            count = "records"
+
+        tmp_dir = self.segment_dir + ".migrate"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        files: Dict[str, object] = {}
+        try:
+            for line in lines:
+                segment = segment_name(json.loads(line).get("_saved_at", ""), self.partition)
+                if segment not in files:
+                    files[segment] = open(segment_path(tmp_dir, segment), "ab")
+                files[segment].write(line)
+        finally:
+            for f in files.values():
+                f.close()
+        os.replace(tmp_dir, self.segment_dir)
+        if source == self.path:
+            os.remove(self.path)
+        logger.info("Migrated %s from %s into %d segments", count, source, len(files))
+
+    def _fold_legacy(self, records: List[Dict]) -> List[Dict]:
+        """Duplicates in a legacy array are merged on the way in, as save() would have done."""
+        folded: Dict[str, Dict] = {}
+        duplicates = DuplicateIndex()
+        for record in records:
+            record = anonymize(record)
+            if "_saved_at" not in record and "saved_at" in record:
+                record["_saved_at"] = record.pop("saved_at")
+            match = duplicates.match(record) if self.dedupe else None
+            if match is not None:
+                old = folded[match[0]]
+                record = merge_records(old, record)
+                if same_content(old, record):
+                    continue
+            key = record.get("email") or f"#{len(folded)}"
+            folded[key] = record
+            if self.dedupe and record.get("email"):
+                duplicates.add(key, record)
+        return list(folded.values())
+
+
+def _iter_lines(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def _read_locations(files: Dict, locs) -> Iterator[Dict]:
+    """Yield records at the given (segment, offset, length, ...) locations, closing files when done."""
+    try:
+        for loc in locs:
+            f = files[loc[0]]
+            f.seek(loc[1])
+            yield json.loads(f.read(loc[2]))
+    finally:
+        for f in files.values():
+            f.close()
+
+
+def _fsync_dir(path: str):
+    """Make file creations and deletions in a directory durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _is_json_array(path: str) -> bool:
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(64).lstrip()
+    return head.startswith("[")
@@ -4,6 +4,15 @@ GREETING_PROMPT = "👋 Hello! I’m the Hiring Assistant. I’ll collect a few
 
 EXIT_KEYWORDS = ["exit", "bye", "quit", "goodbye"]
 
+# Intent phrases (utils/intents.py), matched on whole words.
+# Greeting and "more" must be the whole message; a new-stack phrase starts it.
+GREETING_KEYWORDS = ["hi", "hello", "hey", "hi there", "hello there"]
+
+MORE_KEYWORDS = ["more", "more questions", "more please", "more questions please", "next"]
+
+NEW_STACK_KEYWORDS = ["new tech stack", "new stack", "tech stack", "my tech stack", "change tech stack",
+                      "change stack", "change my tech stack", "switch stack", "switch tech stack"]
+
 THANK_YOU_PROMPT = "✅ Thank you for your time. We'll review your submission and contact you with next steps."
 
 FALLBACK_PROMPT = "⚠️ Sorry, I didn't quite understand that. Could you rephrase?"
@@ -18,3 +27,53 @@ DETAIL_PROMPTS = {
     "location": "Please provide your Current Location.",
     "tech_stack": "✅ All set. Please now provide your Tech Stack (comma-separated): languages, frameworks, databases, tools.",
 }
+
+START_PROMPT = "Please type 'hi' to begin."
+
+TECH_STACK_PROMPT = "✅ All set. Please now provide your Tech Stack (comma-separated): languages, frameworks, databases, tools."
+
+TECH_STACK_PARSE_ERROR = "I couldn't parse your tech stack. Please provide comma-separated technologies (e.g. Python, Django, PostgreSQL)."
+
+# Validation messages shown during info collection (keyed by field)
+VALIDATION_PROMPTS = {
+    "full_name": "Please enter a valid name (only letters and spaces, 2–50 characters).",
+    "email": "That doesn't look like a valid email. Please enter a valid email address (e.g. name@example.com).",
+    "phone": "That doesn't look like a valid phone number. Please include country code (e.g. +91 9876543210).",
+    "years_experience": "Please enter a valid number for Years of Experience (0 or more).",
+    "desired_position": "Please enter the position(s) you are applying for (e.g. Backend Engineer).",
+    "current_location": "Please enter a valid location (only letters and spaces, 2–50 characters).",
+}
+
+MORE_QUESTIONS_HEADER = "Here are some more questions for your tech stack:\n"
+
+NO_MORE_QUESTIONS = "You've seen all the questions I have for your tech stack. Provide a new tech stack for fresh questions, or say 'exit' to finish."
+
+# Questions-stage replies keyed by sentiment
+SENTIMENT_PROMPTS = {
+    "negative": "I sense some hesitation. Don’t worry, take your time — you’re doing great! "
+                "If you want more questions, say 'more'. Otherwise, say 'exit' to finish.",
+    "positive": "Glad to hear your enthusiasm! 🎉 If you want more questions, say 'more'. Otherwise, say 'exit' to finish.",
+    "neutral": "If you want more questions, say 'more'. Otherwise, say 'exit' to finish. "
+               "You can also provide a new tech stack for fresh questions.",
+}
+
+# Suffixes appended by the UI based on sentiment
+SENTIMENT_SUFFIXES = {
+    "positive": "🙂 I sense positive vibes!",
+    "negative": "😟 I sense some concerns. Don’t worry, I’ll guide you through.",
+}
+
+# Fixed strings worth pre-translating for every supported language
+PREWARM_PROMPTS = [
+    GREETING_PROMPT,
+    DETAIL_PROMPTS["full_name"],  # asked right after the greeting
+    THANK_YOU_PROMPT,
+    FALLBACK_PROMPT,
+    START_PROMPT,
+    TECH_STACK_PROMPT,
+    TECH_STACK_PARSE_ERROR,
+    NO_MORE_QUESTIONS,
+    *VALIDATION_PROMPTS.values(),
+    *SENTIMENT_PROMPTS.values(),
+    *SENTIMENT_SUFFIXES.values(),
+]
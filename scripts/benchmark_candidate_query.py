@@ -0,0 +1,85 @@
+"""
+Benchmark DataHandler.query() on a synthetic store.
+Writes --records candidate lines straight into one segment of a temporary
+store, opens it (index rebuild), then times typical recruiter filters.
+
+Run: python scripts/benchmark_candidate_query.py [--records 1000000] [--iterations 50]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_handler import DataHandler, _hash_value, segment_dir_for, segment_path  # noqa: E402
+
+TECHS = ["python", "django", "javascript", "react", "sql", "aws", "docker", "java", "go", "rust",
+         "kotlin", "swift", "c++", "node", "postgresql", "mongodb", "kubernetes", "scala", "ruby", "php"]
+CITIES = ["Berlin", "Paris", "Madrid", "Hyderabad", "Delhi", "London", "Singapore", "Austin", "Toronto", "Sydney"]
+
+QUERIES = {
+    "tech=python": dict(tech="python"),
+    "tech=python,sql": dict(tech=["python", "sql"]),
+    "years>3 + location": dict(min_years=4, location="Berlin"),
+    "python + years 3-5 + location": dict(tech="python", min_years=3, max_years=5, location="Paris"),
+    "rare tech + location": dict(tech="scala", location="Sydney"),
+    "no filter, page 100": dict(page=100),
+}
+
+
+def build_store(path, n, seed=0):
+    rng = random.Random(seed)
+    os.makedirs(segment_dir_for(path))
+    with open(segment_path(segment_dir_for(path), "2025-01"), "w", encoding="utf-8") as f:
+        for i in range(n):
+            record = {
+                "full_name": f"Candidate {i}",
+                "email": _hash_value(f"c{i}@example.com"),
+                "phone": _hash_value(f"+1 202 555 {i:07d}"),
+                "years_experience": str(rng.randint(0, 25)),
+                "desired_position": "Engineer",
+                "current_location": rng.choice(CITIES),
+                "tech_stack": rng.sample(TECHS, rng.randint(1, 5)),
+                "_saved_at": f"2025-01-01T00:00:00.{i:06d}Z",
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="query-bench-")
+    path = os.path.join(workdir, "candidates.jsonl")
+    start = time.perf_counter()
+    build_store(path, args.records)
+    print(f"wrote {args.records} records in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    dh = DataHandler(path, write_behind=False, auto_compact=False)
+    print(f"opened store (index rebuild) in {time.perf_counter() - start:.1f} s")
+
+    print(f"{'query':<32}{'matches':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, kwargs in QUERIES.items():
+        timings = []
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            result = dh.query(page_size=args.page_size, **kwargs)
+            timings.append((time.perf_counter() - t0) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<32}{result.total:>10}{statistics.median(timings):>10.2f}{p95:>10.2f}")
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for intent routing over a corpus of replayed chat messages.
+
+Builds the corpus from conversations (a transcripts JSONL as read by
+replay_transcripts.py, or --synthetic N generated ones) expanded into turns,
+then times the compiled router (utils/intents.py) against the per-keyword
+substring scans process_message used before, and counts messages where the
+two disagree on exit (substring hits such as "quite" -> "quit").
+
+Run: python scripts/benchmark_intents.py [--synthetic 20000] [--transcripts transcripts.jsonl] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from prompts import EXIT_KEYWORDS  # noqa: E402
+from scripts.replay_transcripts import synthetic_conversations  # noqa: E402
+from utils.batch_replay import conversation_turns, read_conversations  # noqa: E402
+from utils.intents import ROUTER  # noqa: E402
+
+# Free-text answers mixed into synthetic conversations
+_ANSWERS = [
+    "I'm quite comfortable with async code and event loops",
+    "For the second one I would use a byelaw-style config table",
+    "Exits and retries are handled by the supervisor, I think",
+    "Not sure, could you explain what a generator is?",
+    "more please",
+    "New tech stack: go, postgres, kubernetes",
+    "I would profile first, then cache the hot path and batch the writes to the database",
+]
+
+
+def legacy_route(message):
+    """The checks process_message ran before the router (exit, "hi", "more")."""
+    intents = {}
+    if any(token.lower() == message.lower() or token.lower() in message.lower() for token in EXIT_KEYWORDS):
+        intents["exit"] = ""
+    if message.lower() == "hi":
+        intents["greeting"] = ""
+    if message.lower() == "more":
+        intents["more"] = ""
+    return intents
+
+
+def build_corpus(args):
+    if args.transcripts:
+        with open(args.transcripts, "r", encoding="utf-8") as f:
+            conversations = list(read_conversations(f))
+    else:
+        conversations = list(synthetic_conversations(args.synthetic))
+    rng = random.Random(0)
+    corpus = []
+    for convo in conversations:
+        turns = conversation_turns(convo)
+        if not args.transcripts:
+            turns[-1:-1] = rng.sample(_ANSWERS, 2)
+        corpus.extend(turns)
+    return corpus
+
+
+def time_per_message(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in corpus:
+            fn(message)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=20000, help="synthetic conversations to expand into turns")
+    parser.add_argument("--transcripts", help="JSONL conversations to use instead of synthetic ones")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes (best is reported)")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args)
+    legacy_us = time_per_message(legacy_route, corpus, args.repeat)
+    router_us = time_per_message(ROUTER.route, corpus, args.repeat)
+
+    disagree = [m for m in corpus if ("exit" in legacy_route(m)) != ("exit" in ROUTER.route(m))]
+    print(f"{len(corpus)} messages ({len(set(corpus))} distinct), best of {args.repeat}")
+    print(f"  legacy substring scans  {legacy_us:8.3f} us/message")
+    print(f"  compiled router         {router_us:8.3f} us/message  ({legacy_us / router_us:.2f}x)")
+    print(f"  exit decisions changed  {len(disagree)} (e.g. {disagree[0]!r})" if disagree else
+          "  exit decisions changed  0")
+
+
+if __name__ == "__main__":
+    main()
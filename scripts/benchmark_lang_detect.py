@@ -0,0 +1,88 @@
+"""
+Offline accuracy and latency benchmark for the local language detector.
+Runs LocalLanguageDetector over a labeled sample (data/lang_detect_sample.tsv)
+and reports accuracy, how many turns are resolved in-process (confidence at or
+above --min-confidence), misclassifications and per-call latency.
+
+Run: python scripts/benchmark_lang_detect.py [--sample data/lang_detect_sample.tsv] [--repeat 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.lang_detect import LocalLanguageDetector  # noqa: E402
+
+NEUTRAL = "neutral"
+
+
+def load_sample(path):
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            label, text = line.split("\t", 1)
+            rows.append((label, text))
+    return rows
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", default=os.path.join(ROOT, "data", "lang_detect_sample.tsv"))
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--min-confidence", type=float, default=0.8)
+    args = parser.parse_args(argv)
+
+    rows = load_sample(args.sample)
+    detector = LocalLanguageDetector()
+
+    correct = local = local_correct = 0
+    per_label = Counter()
+    per_label_correct = Counter()
+    errors = []
+    for label, text in rows:
+        detection = detector.detect(text)
+        predicted = detection.lang or NEUTRAL
+        per_label[label] += 1
+        if predicted == label:
+            correct += 1
+            per_label_correct[label] += 1
+        if detection.confidence >= args.min_confidence:
+            local += 1
+            local_correct += predicted == label
+        if predicted != label:
+            errors.append((label, predicted, detection.confidence, text))
+
+    timings = []
+    for _ in range(args.repeat):
+        for _, text in rows:
+            start = time.perf_counter()
+            detector.detect(text)
+            timings.append((time.perf_counter() - start) * 1e6)
+
+    print(f"sample: {len(rows)} labeled inputs from {os.path.relpath(args.sample, ROOT)}")
+    print(f"accuracy: {correct / len(rows):.1%}")
+    print(f"resolved locally (confidence >= {args.min_confidence}): {local / len(rows):.1%}, "
+          f"accuracy when local {local_correct / max(local, 1):.1%}")
+    for label in sorted(per_label):
+        print(f"  {label:<8}{per_label_correct[label]:>3}/{per_label[label]:<3}")
+    for label, predicted, confidence, text in errors:
+        print(f"  miss: expected {label}, got {predicted} ({confidence:.2f}): {text}")
+    print(f"latency: p50 {statistics.median(timings):.1f} us, p95 {percentile(timings, 95):.1f} us, "
+          f"p99 {percentile(timings, 99):.1f} us over {len(timings)} calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Load test: N concurrent simulated candidates each walk the full
+greeting -> collect -> tech_stack -> questions -> exit flow.
+
+Translation goes through the real TranslationService (cache included) backed
+by a local stand-in translator that sleeps --translate-ms per remote call.
+Reports p50/p95/p99 latency per stage (process_message by the stage the turn
+was handled in) and per component (translate, sentiment, validation,
+question generation, save), plus throughput and peak RSS. Results are written
+as JSON so runs can be diffed between releases (--baseline prints p95 deltas).
+
+Run: python scripts/benchmark_load.py [--candidates 200] [--concurrency 32] [--translate-ms 40]
+         [--langs en,fr,de] [--json load.json] [--baseline previous.json]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import chatbot  # noqa: E402
+from data_handler import DataHandler  # noqa: E402
+from utils.sentiment import SentimentService  # noqa: E402
+from utils.translation import TranslationService  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_TECH_STACKS = ["python, django", "javascript, react", "java, sql", "aws, docker", "go, rust, sql"]
+_REPLIES = ["I enjoyed these questions", "These are quite hard", "Not sure about the second one"]
+
+
+class LocalTranslator:
+    """Stand-in for googletrans: echoes text after a configurable delay."""
+
+    def __init__(self, latency_ms: float, jitter: float = 0.2):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text, src="auto", dest="en"):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+        lang = "en" if src == "auto" else src
+        if isinstance(text, list):
+            return [SimpleNamespace(text=t, src=lang) for t in text]
+        return SimpleNamespace(text=text, src=lang)
+
+
+class Recorder:
+    """Collects wall-clock samples (seconds) per metric name."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, name, fn):
+        samples = self.samples[name]
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - start)  # list.append is atomic
+        return timed
+
+    def summary(self):
+        return {name: summarize(values) for name, values in sorted(self.samples.items()) if values}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize(values):
+    ms = [v * 1000 for v in values]
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p95_ms": round(percentile(ms, 95), 4),
+        "p99_ms": round(percentile(ms, 99), 4),
+    }
+
+
+def candidate_script(i, rng):
+    """The turns one simulated candidate types."""
+    return [
+        "hi",
+        f"Candidate {chr(65 + i % 26)}{chr(65 + i // 26 % 26)}",
+        f"load{i}@example.com",
+        f"+1 202 555 {i % 10000:04d}",
+        str(rng.randint(0, 20)),
+        "Backend Engineer",
+        "Berlin",
+        rng.choice(_TECH_STACKS),
+        "more",
+        rng.choice(_REPLIES),
+        "bye",
+    ]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def run(args):
+    langs = [lang.strip() for lang in args.langs.split(",") if lang.strip()]
+    translator = LocalTranslator(args.translate_ms)
+    translation = TranslationService(translator=translator)
+    sentiment = SentimentService()
+    sentiment.warm_up()
+    workdir = tempfile.mkdtemp(prefix="load-bench-")
+    data_handler = DataHandler(os.path.join(workdir, "candidates.jsonl"))
+
+    rec = Recorder()
+    translation.to_english = rec.wrap("translate", translation.to_english)
+    translation.from_english = rec.wrap("translate", translation.from_english)
+    sentiment.score = rec.wrap("sentiment", sentiment.score)
+    data_handler.save = rec.wrap("save", data_handler.save)
+    # The chatbot module looks these up as globals on every call
+    chatbot.validate_field = rec.wrap("validation", chatbot.validate_field)
+    chatbot.generate_questions = rec.wrap("question_generation", chatbot.generate_questions)
+
+    stage_samples = defaultdict(list)
+    errors = []
+
+    def candidate(i):
+        rng = random.Random(i)
+        lang = langs[i % len(langs)]
+        bot = chatbot.HiringAssistantChatbot(translation=translation, sentiment=sentiment)
+        for message in candidate_script(i, rng):
+            stage = str(bot.stage)
+            start = time.perf_counter()
+            try:
+                bot.process_message(message, None, data_handler, lang=lang)
+            except Exception as exc:
+                errors.append(repr(exc))
+                return
+            stage_samples[stage].append(time.perf_counter() - start)
+            if args.think_ms:
+                time.sleep(args.think_ms / 1000.0 * rng.random())
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(candidate, range(args.candidates)))
+    elapsed = time.perf_counter() - start
+    flush_start = time.perf_counter()
+    data_handler.close()
+    flush_ms = (time.perf_counter() - flush_start) * 1000
+
+    turns = sum(len(v) for v in stage_samples.values())
+    return {
+        "config": {
+            "candidates": args.candidates,
+            "concurrency": args.concurrency,
+            "translate_ms": args.translate_ms,
+            "think_ms": args.think_ms,
+            "langs": langs,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "throughput": {
+            "seconds": round(elapsed, 3),
+            "turns": turns,
+            "turns_per_second": round(turns / elapsed, 1),
+            "candidates_per_second": round(args.candidates / elapsed, 2),
+        },
+        "stages": {stage: summarize(values) for stage, values in sorted(stage_samples.items())},
+        "components": rec.summary(),
+        "remote_translate_calls": translator.calls,
+        "translation_cache": {"hits": translation.cache.hits, "misses": translation.cache.misses},
+        "final_flush_ms": round(flush_ms, 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "errors": errors[:20],
+    }
+
+
+def print_report(result, baseline=None):
+    t = result["throughput"]
+    print(f"{result['config']['candidates']} candidates x {result['config']['concurrency']} concurrent: "
+          f"{t['turns']} turns in {t['seconds']} s ({t['turns_per_second']} turns/s, "
+          f"{t['candidates_per_second']} candidates/s), peak RSS {result['peak_rss_mb']} MB")
+    for section in ("stages", "components"):
+        print(f"{section:<22}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}" + ("  p95 vs baseline" if baseline else ""))
+        for name, s in result[section].items():
+            line = f"  {name:<20}{s['count']:>8}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}"
+            old = (baseline or {}).get(section, {}).get(name)
+            if old and old["p95_ms"]:
+                line += f"  {(s['p95_ms'] - old['p95_ms']) / old['p95_ms']:+.1%}"
+            print(line)
+    if result["errors"]:
+        print(f"errors: {len(result['errors'])} (first: {result['errors'][0]})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--translate-ms", type=float, default=40.0, help="latency of each remote translate call")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="max random pause between a candidate's turns")
+    parser.add_argument("--langs", default="en,fr,de", help="languages assigned round-robin to candidates")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="previous --json output to compare p95 against")
+    args = parser.parse_args(argv)
+
+    # Per-turn INFO logs would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+
+    result = run(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Benchmark the compiled question bank on a synthetic bank.
+Builds a bank of --techs techs x --questions questions, then reports compile
+time, load time and generate_questions() latency for growing stack sizes.
+
+Run: python scripts/benchmark_question_bank.py [--techs 500] [--questions 60] [--iterations 2000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import question_bank  # noqa: E402
+from utils.question_generator import generate_questions  # noqa: E402
+
+
+def build_source(path, n_techs, n_questions):
+    techs = {}
+    for t in range(n_techs):
+        name = f"tech{t}"
+        techs[name] = {
+            "aliases": [f"t{t}", f"{name}js"],
+            "questions": [f"Question {q} about {name}: explain a realistic scenario in detail." for q in range(n_questions)],
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "techs": techs}, f)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--techs", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=60)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--stack-sizes", default="1,5,20,50")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="qbank-bench-")
+    source = os.path.join(workdir, "bank.json")
+    build_source(source, args.techs, args.questions)
+
+    start = time.perf_counter()
+    index_path = question_bank.compile_bank(source)
+    compile_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bank = question_bank.QuestionBank(index_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    print(f"bank: {len(bank)} techs, {bank.question_count} questions, "
+          f"index {os.path.getsize(index_path) / 1024:.0f} KiB")
+    print(f"compile: {compile_s * 1000:.1f} ms   load (mmap + key tables): {load_ms:.2f} ms")
+
+    os.environ["QUESTION_BANK_PATH"] = source
+    names = bank.techs() + [f"t{t}" for t in range(args.techs)] + ["unknowntech"]
+    print(f"{'stack size':>10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}")
+    for size in (int(s) for s in args.stack_sizes.split(",")):
+        timings = []
+        for _ in range(args.iterations):
+            stack = random.sample(names, min(size, len(names)))
+            start = time.perf_counter()
+            generate_questions(stack)
+            timings.append((time.perf_counter() - start) * 1e6)
+        print(f"{size:>10}{statistics.median(timings):>10.1f}{percentile(timings, 95):>10.1f}{percentile(timings, 99):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Latency / throughput benchmark for local-model question generation
+(utils/model_questions.py) across micro-batch sizes.
+
+Concurrent simulated sessions each ask for questions for unknown techs; every
+batch size gets a fresh generator without the disk cache, so each tech is
+really generated. Reports per-request p50/p95 latency, techs per second and
+the number of model calls. With --model the real seq2seq model is used
+(transformers + torch required); otherwise a stand-in whose batch cost is
+--base-ms + --per-item-ms per tech, the usual shape of batched CPU inference.
+
+Run: python scripts/benchmark_question_model.py [--batch-sizes 1,4,8,16] [--techs 64] [--sessions 16]
+         [--model google/flan-t5-small]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.model_questions import ModelQuestionGenerator, Seq2SeqBackend  # noqa: E402
+
+
+class SimulatedBackend:
+    """Sleeps base_ms + per_item_ms * batch size and returns canned questions."""
+
+    def __init__(self, base_ms: float, per_item_ms: float):
+        self.base = base_ms / 1000.0
+        self.per_item = per_item_ms / 1000.0
+        self._lock = threading.Lock()  # one forward pass at a time, like a CPU model
+
+    def __call__(self, prompts, per_prompt):
+        with self._lock:
+            time.sleep(self.base + self.per_item * len(prompts))
+        return [[f"How would you use feature {i} of this technology in production?" for i in range(per_prompt)]
+                for _ in prompts]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run_batch_size(backend, batch_size, args):
+    gen = ModelQuestionGenerator(backend, cache_dir=None, max_batch=batch_size, max_wait_ms=args.max_wait_ms,
+                                 per_tech=args.per_tech)
+    techs = [f"unknowntech{i}" for i in range(args.techs)]
+    latencies = []
+
+    def request(tech):
+        start = time.perf_counter()
+        result = gen.questions([tech], timeout=600)
+        latencies.append(time.perf_counter() - start)
+        return tech in result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        generated = sum(pool.map(request, techs))
+    elapsed = time.perf_counter() - start
+    gen.close()
+    ms = [v * 1000 for v in latencies]
+    return {
+        "batch_size": batch_size,
+        "generated": generated,
+        "model_calls": gen.batches,
+        "seconds": round(elapsed, 3),
+        "techs_per_second": round(len(techs) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(ms), 1),
+        "p50_ms": round(percentile(ms, 50), 1),
+        "p95_ms": round(percentile(ms, 95), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    parser.add_argument("--techs", type=int, default=64, help="distinct unknown techs to generate")
+    parser.add_argument("--sessions", type=int, default=16, help="concurrent requesting sessions")
+    parser.add_argument("--max-wait-ms", type=float, default=20.0)
+    parser.add_argument("--per-tech", type=int, default=8, help="questions generated per tech")
+    parser.add_argument("--model", help="seq2seq model name (default: simulated backend)")
+    parser.add_argument("--base-ms", type=float, default=120.0, help="simulated fixed cost per model call")
+    parser.add_argument("--per-item-ms", type=float, default=15.0, help="simulated cost per tech in a call")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    if args.model:
+        backend = Seq2SeqBackend(args.model)
+        backend(["warm up"], 1)  # load weights outside the timed runs
+    else:
+        backend = SimulatedBackend(args.base_ms, args.per_item_ms)
+
+    results = [run_batch_size(backend, int(size), args) for size in args.batch_sizes.split(",") if size.strip()]
+    print(f"{args.techs} techs, {args.sessions} concurrent sessions, "
+          f"backend: {args.model or f'simulated {args.base_ms:g} ms + {args.per_item_ms:g} ms/tech'}")
+    print(f"{'batch':>6}{'calls':>8}{'techs/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in results:
+        print(f"{r['batch_size']:>6}{r['model_calls']:>8}{r['techs_per_second']:>10.2f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
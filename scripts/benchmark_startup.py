@@ -0,0 +1,99 @@
+"""
+Measure cold-start import time of the app modules.
+Each module is imported in a fresh interpreter with `-X importtime`, so
+numbers include everything the module pulls in at import.
+
+Run: python scripts/benchmark_startup.py [--repeat 5] [--budget-ms 150] [--json out.json]
+Exits with status 1 if any module exceeds --budget-ms (useful in CI).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "prompts",
+    "utils.validators",
+    "utils.question_generator",
+    "utils.translation",
+    "utils.sentiment",
+    "data_handler",
+    "chatbot",
+]
+
+# Heavy dependencies that should only load on first use
+LAZY_MODULES = ["textblob", "googletrans", "nltk", "transformers", "torch"]
+
+
+def measure(module):
+    """Return ({imported_module: cumulative_us}, total_us) for one fresh import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cum_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        cumulative[name.strip()] = int(cum_us)
+    return cumulative, cumulative.get(module, 0)
+
+
+def run(modules, repeat):
+    results = {}
+    for module in modules:
+        totals = []
+        loaded_lazy = set()
+        for _ in range(repeat):
+            cumulative, total = measure(module)
+            totals.append(total)
+            loaded_lazy.update(m for m in LAZY_MODULES if m in cumulative)
+        results[module] = {
+            "median_ms": statistics.median(totals) / 1000.0,
+            "min_ms": min(totals) / 1000.0,
+            "max_ms": max(totals) / 1000.0,
+            "heavy_imports": sorted(loaded_lazy),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+
+    results = run(args.modules, args.repeat)
+
+    print(f"{'module':<28}{'median ms':>12}{'min ms':>10}{'max ms':>10}  heavy imports")
+    over_budget = []
+    for module, r in results.items():
+        heavy = ", ".join(r["heavy_imports"]) or "-"
+        print(f"{module:<28}{r['median_ms']:>12.1f}{r['min_ms']:>10.1f}{r['max_ms']:>10.1f}  {heavy}")
+        if args.budget_ms is not None and r["median_ms"] > args.budget_ms:
+            over_budget.append(module)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if over_budget:
+        print(f"Over budget ({args.budget_ms} ms): {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
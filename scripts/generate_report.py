@@ -1,47 +1,138 @@
 """
-Generate a simple PDF report for the repository. Requires `reportlab`.
-Run: python scripts/generate_report.py
+Candidate report and export. Requires `reportlab` for the PDF.
+
+Streams the candidate store record by record (segmented store, a single JSON
+Lines file, or a legacy JSON array) for resubmissions, duplicate rate and
+submissions per day; candidates per tech and the experience distribution
+count each candidate once, by their latest record, from the store's index.
+Writes a summary PDF and/or a CSV export in chunks. Records of erased
+candidates are skipped. With --incremental, the stream totals are resumed
+from --state and only records saved since the previous run are read (and
+appended to the CSV).
+
+Run: python scripts/generate_report.py [--store candidate_data.jsonl] [--pdf docs/report.pdf]
+         [--csv exports/candidates.csv] [--incremental] [--state reports/report_state.json]
 """
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
+import argparse
+import json
 import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_handler import anonymize, is_erased  # noqa: E402
+from utils.reporting import (  # noqa: E402
+    PdfReport, ReportAggregates, candidate_stats, erased_keys, iter_records, resolve_store, store_files,
+    write_csv_chunks)
+
+
+def default_store():
+    for name in ("candidate_data.segments", "candidate_data.jsonl", "candidate_data.json"):
+        path = os.path.join(ROOT, name)
+        if os.path.exists(path):
+            return path
+    return os.path.join(ROOT, "candidate_data.jsonl")
+
+
+def _fingerprint(path):
+    st = os.stat(path)
+    return {"inode": st.st_ino, "size": st.st_size}
+
+
+def generate_report(
+    output_path="docs/report.pdf",
+    store=None,
+    csv_path=None,
+    incremental=False,
+    state_path="reports/report_state.json",
+    chunk_size=1000,
+    pdf_max_rows=2000,
+):
+    store = resolve_store(store or default_store())
+    agg, resume, resumed = ReportAggregates(), {}, False
+    if incremental and os.path.exists(state_path):
+        agg, state = ReportAggregates.load_state(state_path)
+        resumed = True
+        if state.get("store") == os.path.abspath(store):
+            resume = state.get("files", {})
+    watermark = agg.watermark if resumed else ""
+    erased = erased_keys(store)
+
+    positions = {}  # file name -> {"inode", "offset"} for the next incremental run
+
+    def new_records():
+        for name, path in store_files(store):
+            fp = _fingerprint(path)
+            previous = resume.get(name, {})
+            # Resume by byte offset while the append-only file is the same one
+            # (compaction or migration replaces it); otherwise rescan and rely on the watermark
+            start_offset = previous.get("offset", 0) \
+                if previous.get("inode") == fp["inode"] and previous.get("offset", 0) <= fp["size"] else 0
+            # Past a resume offset every line is new, even one with an older _saved_at
+            skip_before = watermark if start_offset == 0 else ""
+            position = positions[name] = {"inode": fp["inode"], "offset": start_offset}
+            for record, end_offset in iter_records(path, start_offset):
+                position["offset"] = end_offset or position["offset"]
+                if skip_before and (record.get("_saved_at") or "") <= skip_before:
+                    continue
+                if erased and is_erased(record, erased):
+                    continue
+                record = anonymize(record)  # exports never carry raw email/phone
+                agg.add(record)
+                yield record
+
+    append = resumed and csv_path and os.path.exists(csv_path)
+    pdf = PdfReport(output_path, "Hiring Assistant - Candidate Report", pdf_max_rows) if output_path else None
+    listing = []  # bounded: only rows that fit in the PDF listing
+    if csv_path:
+        os.makedirs(os.path.dirname(os.path.abspath(csv_path)), exist_ok=True)
+        with open(csv_path, "a" if append else "w", encoding="utf-8", newline="") as out:
+            rows = write_csv_chunks(_tee(new_records(), listing, pdf_max_rows if pdf else 0), out,
+                                    chunk_size, header=not append)
+    else:
+        rows = 0
+        for _ in _tee(new_records(), listing, pdf_max_rows if pdf else 0):
+            rows += 1
+
+    agg.set_candidates(candidate_stats(store))
+    summary = agg.summary()
+    if pdf:
+        pdf.summary(summary)
+        pdf.candidates(listing)
+        pdf.save()
+    if incremental:
+        agg.save_state(state_path, {"store": os.path.abspath(store), "files": positions})
+
+    print(json.dumps({"new_records": rows, **{k: v for k, v in summary.items() if k != "submissions_per_day"}}))
+    if output_path:
+        print(f"Report generated at {output_path}")
+    if csv_path:
+        print(f"{'Appended' if append else 'Exported'} {rows} rows to {csv_path}")
+    return summary
+
+
+def _tee(records, listing, limit):
+    """Pass records through, keeping the first `limit` for the PDF listing."""
+    for record in records:
+        if len(listing) < limit:
+            listing.append(record)
+        yield record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", default=None, help="store path or segment directory (default: candidate_data.*)")
+    parser.add_argument("--pdf", default="docs/report.pdf", help="summary PDF ('' to skip)")
+    parser.add_argument("--csv", default=None, help="CSV export path")
+    parser.add_argument("--incremental", action="store_true", help="only process records saved since the last run")
+    parser.add_argument("--state", default="reports/report_state.json")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--pdf-max-rows", type=int, default=2000)
+    args = parser.parse_args(argv)
+    generate_report(args.pdf or None, args.store, args.csv, args.incremental, args.state,
+                    args.chunk_size, args.pdf_max_rows)
 
-def generate_report(output_path="docs/report.pdf"):
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    c = canvas.Canvas(output_path, pagesize=A4)
-    width, height = A4
-
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(50, height - 80, "Hiring Assistant Chatbot - Project Report")
-
-    c.setFont("Helvetica", 11)
-    text_lines = [
-        "Overview:",
-        "This project implements a Hiring Assistant chatbot using Streamlit.",
-        "",
-        "Components:",
-        "- Streamlit UI (app.py)",
-        "- Chatbot logic (chatbot.py, prompts.py)",
-        "- Utils (validators, question generator, context manager)",
-        "- Data handler (simulated storage)",
-        "",
-        "How to run:",
-        "1. pip install -r requirements.txt",
-        "2. streamlit run app.py",
-        "",
-        "This PDF was generated using reportlab.",
-    ]
-
-    y = height - 120
-    for line in text_lines:
-        c.drawString(50, y, line)
-        y -= 16
-        if y < 50:
-            c.showPage()
-            y = height - 50
-
-    c.save()
-    print(f"Report generated at {output_path}")
 
 if __name__ == "__main__":
-    generate_report()
+    main()
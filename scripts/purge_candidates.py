@@ -0,0 +1,96 @@
+"""
+Retention and erasure jobs for the candidate store.
+
+--retain-days N deletes every segment older than the segment N days ago falls
+in (one unlink per segment, however many candidates it holds). --erase removes
+candidates by email, hashed email or merged alias (repeatable; --erase-file
+reads one per line); each becomes a tombstone and only the segments holding
+that candidate are rewritten. Without --no-compact the job waits for that
+compaction, so the data is physically gone when it exits.
+
+Chat transcripts in --transcript-dir (default TALENTSCOUT_TRANSCRIPT_DIR or
+SESSION_TRANSCRIPT_DIR) get the same treatment: retention deletes those last
+written before the cutoff, erasure deletes those mentioning the candidate's
+email (or a merged alias).
+
+Run: python scripts/purge_candidates.py [--store candidate_data.jsonl] [--retain-days 365]
+         [--erase alice@example.com] [--erase-file erasures.txt] [--dry-run]
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_handler import DataHandler, anonymize, segment_name  # noqa: E402
+from utils.context_manager import erase_transcripts, purge_transcripts  # noqa: E402
+
+
+def retention_cutoff(days, now=None):
+    """ISO date `days` before now (UTC)."""
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", default=os.getenv("CANDIDATE_STORE", os.path.join(ROOT, "candidate_data.jsonl")))
+    parser.add_argument("--partition", choices=("month", "day"), default="month")
+    parser.add_argument("--retain-days", type=int, help="delete segments older than this many days")
+    parser.add_argument("--erase", action="append", default=[], help="email / hash to erase (repeatable)")
+    parser.add_argument("--erase-file", help="file with one email or hash per line to erase")
+    parser.add_argument("--transcript-dir",
+                        default=os.getenv("TALENTSCOUT_TRANSCRIPT_DIR") or os.getenv("SESSION_TRANSCRIPT_DIR"),
+                        help="chat transcripts to apply retention and erasure to")
+    parser.add_argument("--no-compact", action="store_true", help="leave erased records to the next compaction")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be deleted")
+    args = parser.parse_args(argv)
+
+    targets = list(args.erase)
+    if args.erase_file:
+        with open(args.erase_file, "r", encoding="utf-8") as f:
+            targets += [line.strip() for line in f if line.strip()]
+    if args.retain_days is None and not targets:
+        parser.error("nothing to do: give --retain-days and/or --erase/--erase-file")
+
+    dh = DataHandler(args.store, write_behind=False, auto_compact=False, partition=args.partition)
+    result = {"store": dh.segment_dir}
+    if args.retain_days is not None:
+        cutoff = retention_cutoff(args.retain_days)
+        result["cutoff"] = cutoff
+        if args.dry_run:
+            boundary = segment_name(cutoff, args.partition)
+            result["expired_segments"] = [segment for segment in dh.segments() if segment < boundary]
+        else:
+            result["expired_segments"] = dh.purge_before(cutoff)
+            if args.transcript_dir:
+                before = datetime.strptime(cutoff, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+                result["expired_transcripts"] = len(purge_transcripts(args.transcript_dir, before))
+    if targets:
+        # Every email hash a transcript may mention: the one given, the stored key and merged aliases
+        email_hashes = set()
+        for target in targets:
+            email_hashes.add(anonymize({"email": target})["email"])
+            record = dh.get(target)
+            if record:
+                email_hashes.update([record.get("email") or ""] + list(record.get("_aliases") or ()))
+        email_hashes.discard("")
+        if args.dry_run:
+            result["erased"] = sum(dh.get(target) is not None for target in targets)
+        else:
+            result["erased"] = sum(dh.erase(target) for target in targets)
+            if not args.no_compact:
+                dh.compact(dh.erased_segments())
+            if args.transcript_dir:
+                result["erased_transcripts"] = len(erase_transcripts(args.transcript_dir, email_hashes))
+        result["not_found"] = len(targets) - result["erased"]
+    result["candidates"] = len(dh)
+    dh.close()
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
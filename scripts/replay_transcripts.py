@@ -0,0 +1,75 @@
+"""
+Replay a JSONL file of candidate conversations / pre-filled forms through the
+chatbot stage logic across a process pool (see utils/batch_replay.py).
+Writes one result per conversation (saved candidate, generated questions) and
+stores candidates in the JSONL store. Reports conversations per second.
+
+Run: python scripts/replay_transcripts.py transcripts.jsonl --out results.jsonl [--store candidate_data.jsonl]
+     python scripts/replay_transcripts.py --synthetic 5000 --no-translate   (throughput check)
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_handler import DataHandler  # noqa: E402
+from utils.batch_replay import read_conversations, run_replay  # noqa: E402
+
+_TECHS = ["python", "django", "javascript", "react", "sql", "aws", "docker", "java", "go", "rust"]
+_REPLIES = ["more", "I think I can answer these well", "These are hard, not sure", "more", "bye"]
+
+
+def synthetic_conversations(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "id": f"syn-{i}",
+            "form": {
+                "full_name": f"Candidate {chr(65 + i % 26)}{chr(65 + i // 26 % 26)}",
+                "email": f"candidate{i}@example.com",
+                "phone": f"+1 202 555 {i % 10000:04d}",
+                "years_experience": str(rng.randint(0, 20)),
+                "desired_position": "Backend Engineer",
+                "current_location": "Berlin",
+                "tech_stack": rng.sample(_TECHS, rng.randint(1, 4)),
+            },
+            "messages": rng.sample(_REPLIES, 3),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", help="JSONL conversations (omit with --synthetic)")
+    parser.add_argument("--out", default=os.devnull, help="results JSONL (default: discard)")
+    parser.add_argument("--store", help="candidate JSONL store to save into (default: none)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--no-translate", action="store_true", help="treat every message as English")
+    parser.add_argument("--synthetic", type=int, default=0, help="generate N form conversations instead of reading input")
+    args = parser.parse_args(argv)
+    if not args.input and not args.synthetic:
+        parser.error("give an input file or --synthetic N")
+
+    # Per-turn INFO logs would dominate the replay
+    logging.getLogger().setLevel(logging.WARNING)
+
+    data_handler = DataHandler(args.store) if args.store else None
+    with open(args.out, "w", encoding="utf-8") as out:
+        if args.synthetic:
+            conversations = synthetic_conversations(args.synthetic)
+            stats = run_replay(conversations, out, data_handler, args.workers, args.chunk_size, not args.no_translate)
+        else:
+            with open(args.input, "r", encoding="utf-8") as f:
+                stats = run_replay(read_conversations(f), out, data_handler, args.workers, args.chunk_size,
+                                   not args.no_translate)
+    if data_handler is not None:
+        data_handler.close()
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
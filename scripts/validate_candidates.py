@@ -0,0 +1,69 @@
+"""
+Re-validate candidate rows in bulk with the same field rules as the chatbot.
+Accepts the segmented store (candidate_data.segments/, or its base path
+candidate_data.jsonl once segmented; every segment is read in order and
+erased candidates are skipped), a single JSON Lines file, a legacy JSON array
+(candidate_data.json) or a recruiter CSV upload with one column per field.
+Email/phone values that are already anonymized (SHA-256) are accepted as is.
+
+Run: python scripts/validate_candidates.py candidate_data.segments [--output clean.csv] [--show 10]
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_handler import is_erased  # noqa: E402
+from utils.conversation_state import FIELD_KEYS  # noqa: E402
+from utils.reporting import erased_keys, iter_records, resolve_store, store_files  # noqa: E402
+from utils.validators import validate_batch  # noqa: E402
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def load_rows(path):
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+    store = resolve_store(path)
+    erased = erased_keys(store)
+    return [record for _, file_path in store_files(store) for record, _ in iter_records(file_path)
+            if not (erased and is_erased(record, erased))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--output", help="write normalized valid rows to this CSV")
+    parser.add_argument("--show", type=int, default=10, help="row numbers to list per failing field")
+    args = parser.parse_args(argv)
+
+    rows = load_rows(args.path)
+    start = time.perf_counter()
+    result = validate_batch(rows, accept=_HASH_RE.match)
+    elapsed = time.perf_counter() - start
+
+    n_valid = sum(result.valid)
+    print(f"{len(rows)} rows, {n_valid} valid, {len(rows) - n_valid} invalid "
+          f"({elapsed * 1000:.1f} ms, {len(rows) / max(elapsed, 1e-9):,.0f} rows/s)")
+    for key, failed in result.errors.items():
+        shown = ", ".join(str(i + 1) for i in failed[: args.show])
+        more = f" (+{len(failed) - args.show} more)" if len(failed) > args.show else ""
+        print(f"  {key:<18}{len(failed):>6} invalid  rows {shown}{more}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELD_KEYS)
+            for i, ok in enumerate(result.valid):
+                if ok:
+                    writer.writerow([result.columns[key][i] for key in FIELD_KEYS])
+        print(f"wrote {n_valid} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import io
+import json
+
+from data_handler import DataHandler
+from utils.batch_replay import conversation_turns, replay_chunk, run_replay
+
+FORM = {
+    "full_name": "Ann Lee", "email": "ann@example.com", "phone": "+1 202 555 0147",
+    "years_experience": "4", "desired_position": "Backend Engineer", "current_location": "Berlin",
+    "tech_stack": ["python", "sql"],
+}
+
+
+def test_form_becomes_turns():
+    turns = conversation_turns({"form": FORM, "messages": ["bye"]})
+    assert turns[0] == "hi" and turns[1] == "Ann Lee"
+    assert turns[-2:] == ["python, sql", "bye"]
+
+
+def test_replay_chunk_collects_candidate_and_questions():
+    bad = dict(FORM, email="nope")
+    results = replay_chunk([{"id": 1, "form": FORM, "messages": ["more"]}, {"id": 2, "form": bad}], translate=False)
+    assert results[0]["stage"] == "questions"
+    assert results[0]["candidate"]["email"] == "ann@example.com"
+    assert set(results[0]["questions"]) == {"python", "sql"}
+    assert results[1]["candidate"] is None and results[1]["stage"] == "collect"
+
+
+def test_run_replay_saves_through_data_handler(tmp_path):
+    dh = DataHandler(str(tmp_path / "store.jsonl"))
+    convos = [{"id": i, "form": dict(FORM, email=f"c{i}@example.com", phone=f"+1 202 555 010{i}")} for i in range(5)]
+    out = io.StringIO()
+    stats = run_replay(convos, out, dh, workers=0, chunk_size=2, translate=False)
+    assert stats["conversations"] == 5 and stats["saved"] == 5
+    assert len(dh) == 5
+    first = json.loads(out.getvalue().splitlines()[0])
+    assert first["candidate"]["email"] != "c0@example.com"  # anonymized in results
+    dh.close()
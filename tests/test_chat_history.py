@@ -0,0 +1,20 @@
+from utils.chat_history import PagedHistory
+
+def test_full_pages_are_cached():
+    h = PagedHistory(page_size=2, max_messages=10)
+    for i in range(5):
+        h.append(("You", f"m{i}"))
+    assert h.page_count() == 3
+    pages = h.render_pages(visible_pages=3)
+    assert len(pages) == 3 and "m4" in pages[-1]
+    assert h.render_pages(visible_pages=3)[0] is pages[0]  # cached, not re-rendered
+    assert len(h.render_pages(visible_pages=1)) == 1
+
+def test_history_is_capped_by_whole_pages():
+    h = PagedHistory(page_size=2, max_messages=4)
+    for i in range(7):
+        h.append(("Bot", f"m{i}"))
+    assert len(h) <= 4
+    assert h.offset == 4
+    assert "m6" in h.render_pages(visible_pages=5)[-1]
+    assert "m0" not in "".join(h.render_pages(visible_pages=5))
@@ -6,7 +6,7 @@ import tempfile
 import json
 
 def test_greeting_and_flow(tmp_path):
-    data_file = tmp_path / "test_data.json"
+    data_file = tmp_path / "test_data.jsonl"
     dh = DataHandler(str(data_file))
     bot = HiringAssistantChatbot()
     ctx = ContextManager()
@@ -43,6 +43,85 @@ def test_greeting_and_flow(tmp_path):
     assert "technical questions" in r_q.lower()
 
     # Data file should exist with at least one entry
-    with open(str(data_file), "r") as f:
-        data = json.load(f)
+    dh.close()
+    data = dh.load_all()
     assert len(data) >= 1
+
+def test_intents_in_questions_stage(tmp_path):
+    dh = DataHandler(str(tmp_path / "d.jsonl"), write_behind=False)
+    bot = HiringAssistantChatbot()
+    for msg in ["hi", "Jane Roe", "jane@example.com", "+1234567890", "4", "Engineer", "Berlin", "python"]:
+        bot.process_message(msg, None, dh, lang="en")
+    assert str(bot.stage) == "questions"
+    # "quite" used to end the conversation through a substring match on "quit"
+    assert "Thank you for your time" not in bot.process_message("That was quite fun", None, dh, lang="en")
+    r = bot.process_message("New tech stack: SQL, Docker", None, dh, lang="en")
+    assert "technical questions" in r.lower()
+    assert bot.candidate_info["tech_stack"] == ["sql", "docker"]
+    assert "Thank you for your time" in bot.process_message("ok bye", None, dh, lang="en")
+
+def test_turns_are_recorded_in_context(tmp_path):
+    dh = DataHandler(str(tmp_path / "d.jsonl"), write_behind=False)
+    ctx = ContextManager(max_len=4)
+    bot = HiringAssistantChatbot()
+    reply = bot.process_message("hi", ctx, dh)
+    assert ctx.last(2) == [{"role": "user", "content": "hi"}, {"role": "assistant", "content": reply}]
+
+def test_exit_words_inside_details_do_not_end_the_chat(tmp_path):
+    dh = DataHandler(str(tmp_path / "test_data.jsonl"))
+    bot = HiringAssistantChatbot()
+    ctx = ContextManager()
+    bot.process_message("hi", ctx, dh)
+    assert "recorded" in bot.process_message("Max Quit", ctx, dh).lower()
+    assert "recorded" in bot.process_message("john.quit@example.com", ctx, dh).lower()
+    assert bot.candidate_info["email"] == "john.quit@example.com"
+    assert bot.stage == "collect"
+
+def test_every_field_has_a_validation_prompt():
+    from prompts import VALIDATION_PROMPTS
+    from utils.conversation_state import FIELDS
+
+    for i, (key, _) in enumerate(FIELDS):
+        bot = HiringAssistantChatbot()
+        bot.stage = "collect"
+        bot.current_field_index = i
+        assert bot.process_message("   ", None, None, lang="en") == VALIDATION_PROMPTS[key]
+        assert bot.current_field_index == i
+
+def test_prewarmed_greeting_needs_no_translator_calls():
+    from types import SimpleNamespace
+
+    from prompts import PREWARM_PROMPTS
+    from utils.translation import TranslationService
+
+    class CountingTranslator:
+        calls = 0
+
+        def translate(self, text, src="auto", dest="en"):
+            self.calls += 1
+            return SimpleNamespace(text="hello" if text == "bonjour" else f"{dest}:{text}", src=src)
+
+    fake = CountingTranslator()
+    svc = TranslationService(translator=fake)
+    svc.prewarm(PREWARM_PROMPTS, ["fr"])
+    svc.to_english("bonjour")  # the candidate's greeting itself, translated once before
+    calls = fake.calls
+    bot = HiringAssistantChatbot(translation=svc)
+    reply = bot.process_message("bonjour", None, None)
+    assert reply.startswith("fr:") and bot.stage == "collect"
+    assert fake.calls == calls
+
+def test_language_chosen_in_the_ui_applies_to_neutral_input():
+    from types import SimpleNamespace
+
+    from utils.translation import TranslationService
+
+    class Translator:
+        def translate(self, text, src="auto", dest="en"):
+            return SimpleNamespace(text=f"{dest}:{text}", src=src)
+
+    bot = HiringAssistantChatbot(translation=TranslationService(translator=Translator()))
+    bot.stage = "collect"
+    bot.current_field_index = 1
+    assert bot.process_message("jane@example.com", None, None, lang="de").startswith("de:")
+    assert bot.user_lang == "de" and bot.candidate_info["email"] == "jane@example.com"
@@ -0,0 +1,54 @@
+import os
+import time
+
+from data_handler import anonymize
+from utils.chat_history import PagedHistory
+from utils.context_manager import ContextManager, erase_transcripts, purge_transcripts, transcript_path
+
+def test_ring_buffer_window():
+    ctx = ContextManager(max_len=3)
+    for i in range(5):
+        ctx.add_message("user", f"m{i}")
+    assert len(ctx) == 5 and ctx.window_start == 2
+    assert [m["content"] for m in ctx.get_context()] == ["m2", "m3", "m4"]
+    assert [m["content"] for m in ctx.last(2)] == ["m3", "m4"]
+    assert ctx.last(10) == ctx.get_context() and ctx.last(0) == []
+    assert [e["i"] for e in ctx.replay()] == [2, 3, 4]  # no transcript: only the window
+
+def test_transcript_keeps_full_history(tmp_path):
+    path = transcript_path("abc123", str(tmp_path))
+    ctx = ContextManager(max_len=2, transcript_path=path)
+    for i in range(5):
+        ctx.add_message("user" if i % 2 else "assistant", f"m{i}")
+    assert [e["content"] for e in ctx.replay()] == ["m0", "m1", "m2", "m3", "m4"]
+    assert [m["content"] for m in ctx.messages(1, 4)] == ["m1", "m2", "m3"]
+    # Reopening resumes numbering and the window
+    resumed = ContextManager(max_len=2, transcript_path=path)
+    assert [m["content"] for m in resumed.get_context()] == ["m3", "m4"]
+    resumed.add_message("user", "m5")
+    assert [e["i"] for e in resumed.replay(4)] == [4, 5]
+    assert transcript_path("../etc/passwd", str(tmp_path)) is None
+
+def test_paged_history_replays_old_pages(tmp_path):
+    ctx = ContextManager(max_len=2, transcript_path=str(tmp_path / "s.jsonl"))
+    h = PagedHistory(page_size=2, max_messages=4, context=ctx)
+    for i in range(7):
+        h.append(("You", f"m{i}"))
+    assert h.offset == 0 and h.page_count() == 4
+    pages = h.render_pages(visible_pages=4)
+    assert "m0" in pages[0] and "m6" in pages[-1]
+
+def test_transcripts_are_opt_in_and_hash_contacts(tmp_path, monkeypatch):
+    monkeypatch.delenv("TALENTSCOUT_TRANSCRIPT_DIR", raising=False)
+    assert transcript_path("abc123") is None
+    ctx = ContextManager(transcript_path=transcript_path("abc123", str(tmp_path)))
+    ctx.add_message("user", "reach me at Alice@Example.com or +1 415 555 0100")
+    assert "Alice@Example.com" in ctx.last(1)[0]["content"]  # the live window keeps the message
+    written = (tmp_path / "abc123.jsonl").read_text(encoding="utf-8")
+    assert "Example.com" not in written and "555" not in written
+    key = anonymize({"email": "alice@example.com"})["email"]
+    assert f"[email:{key}]" in written
+    ContextManager(transcript_path=transcript_path("other", str(tmp_path))).add_message("user", "hi")
+    assert erase_transcripts(str(tmp_path), [key]) == [str(tmp_path / "abc123.jsonl")]
+    assert purge_transcripts(str(tmp_path), time.time() + 60) == [str(tmp_path / "other.jsonl")]
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,29 @@
+from utils.conversation_state import ConversationState, Stage
+
+def test_round_trip():
+    state = ConversationState(
+        Stage.QUESTIONS, 6, "fr",
+        {"full_name": "Jo", "email": "jo@example.com", "tech_stack": ["python", "go"], "extra": 1},
+        {3, 17, -42},
+    )
+    blob = state.to_bytes()
+    assert ConversationState.from_bytes(blob) == state
+    assert len(blob) < 96
+
+
+def test_oversized_values_round_trip():
+    big = "é" * 40000  # 80,000 UTF-8 bytes, past a 16-bit length
+    state = ConversationState(Stage.COLLECT, 2, "en", {"full_name": big, "tech_stack": ["go"] * 70000},
+                              set(range(70000)))
+    assert ConversationState.from_bytes(state.to_bytes()) == state
+
+
+def test_reads_version_2_blobs():
+    blob = bytes([2, 1, 1, 1]) + b"\x00\x02en" + b"\x00\x02Jo" + b"\x00\x01" + b"\x00\x00\x00\x07"
+    state = ConversationState.from_bytes(blob)
+    assert (state.stage, state.lang, state.candidate, state.asked) == ("collect", "en", {"full_name": "Jo"}, {7})
+
+def test_stage_compares_to_names():
+    state = ConversationState()
+    assert state.stage == "greeting"
+    assert str(Stage.TECH_STACK) == "tech_stack"
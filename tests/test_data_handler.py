@@ -1,14 +1,209 @@
 import json
 import os
-from data_handler import DataHandler
+from data_handler import DataHandler, anonymize, list_segments, segment_path
 import tempfile
+import time
+
+
+def _stored_lines(dh):
+    lines = []
+    for segment in list_segments(dh.segment_dir):
+        with open(segment_path(dh.segment_dir, segment), "r") as f:
+            lines += [json.loads(line) for line in f]
+    return lines
 
 def test_save_and_persistence(tmp_path):
-    path = tmp_path / "cand.json"
+    path = tmp_path / "cand.jsonl"
     dh = DataHandler(str(path))
-    assert os.path.exists(str(path))
+    assert os.path.isdir(str(tmp_path / "cand.segments"))
     dh.save({"full_name": "Alice", "email": "a@b.com"})
-    with open(str(path), "r") as f:
-        arr = json.load(f)
+    dh.flush()
+    arr = _stored_lines(dh)
     assert isinstance(arr, list)
     assert arr[0]["full_name"] == "Alice"
+    assert arr[0]["email"] != "a@b.com"  # anonymized
+
+def test_upsert_by_email(tmp_path):
+    path = tmp_path / "cand.jsonl"
+    dh = DataHandler(str(path))
+    dh.save({"full_name": "Alice", "email": "a@b.com"})
+    dh.save({"full_name": "Alice B", "email": "a@b.com"})
+    dh.save({"full_name": "Bob", "email": "b@b.com"})
+    dh.flush()
+    assert len(dh) == 2
+    assert dh.superseded == 1
+    assert dh.get("a@b.com")["full_name"] == "Alice B"
+    dh.close()
+    # index is rebuilt from disk on reopen
+    assert DataHandler(str(path)).get("a@b.com")["full_name"] == "Alice B"
+
+def test_compaction_folds_superseded(tmp_path):
+    path = tmp_path / "cand.jsonl"
+    dh = DataHandler(str(path), auto_compact=False)
+    for i in range(5):
+        dh.save({"full_name": f"Alice {i}", "email": "a@b.com"})
+    dh.flush()
+    dh.compact()
+    assert len(_stored_lines(dh)) == 1 and dh.superseded == 0
+    assert dh.get("a@b.com")["full_name"] == "Alice 4"
+
+def test_migrates_legacy_json_array(tmp_path):
+    legacy = tmp_path / "cand.json"
+    legacy.write_text(json.dumps([{"full_name": "Old", "email": "o@b.com", "saved_at": "2025-01-01T00:00:00"}]))
+    dh = DataHandler(str(tmp_path / "cand.jsonl"), legacy_path=str(legacy))
+    rec = dh.get("o@b.com")
+    assert rec["full_name"] == "Old"
+    assert rec["_saved_at"] == "2025-01-01T00:00:00"
+
+def test_save_returns_durability_future(tmp_path):
+    path = tmp_path / "cand.jsonl"
+    dh = DataHandler(str(path), batch_window_ms=5)
+    futures = [dh.save({"full_name": "C", "email": f"{i}@b.com"}) for i in range(20)]
+    stored = futures[-1].result(timeout=5)
+    assert stored["full_name"] == "C"
+    dh.close()
+    assert len(_stored_lines(dh)) == 20
+
+def test_synchronous_mode(tmp_path):
+    dh = DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False)
+    assert dh.save({"full_name": "D", "email": "d@b.com"}).done()
+    assert len(dh) == 1
+
+def test_query_secondary_indexes(tmp_path):
+    path = tmp_path / "cand.jsonl"
+    dh = DataHandler(str(path), batch_window_ms=1)
+    dh.save({"full_name": "A", "email": "a@b.com", "years_experience": "2", "current_location": "Berlin", "tech_stack": ["python"]})
+    dh.save({"full_name": "B", "email": "b@b.com", "years_experience": "5", "current_location": "berlin", "tech_stack": ["python", "sql"]})
+    dh.save({"full_name": "C", "email": "c@b.com", "years_experience": "9", "current_location": "Paris", "tech_stack": ["Python"]})
+    page = dh.query(tech="python", min_years=4, location="Berlin")
+    assert [r["full_name"] for r in page.records] == ["B"] and page.total == 1
+    # Upsert moves B out of the python index; pagination keeps first-save order
+    dh.save({"full_name": "B", "email": "b@b.com", "years_experience": "5", "current_location": "Berlin", "tech_stack": ["go"]})
+    page = dh.query(tech="python", page=2, page_size=1)
+    assert page.total == 2 and [r["full_name"] for r in page.records] == ["C"]
+    dh.close()
+    # Indexes are rebuilt from the file on open
+    assert DataHandler(str(path), write_behind=False).query(tech=["go"], max_years=5).total == 1
+
+def test_duplicate_by_phone_and_name_is_merged(tmp_path):
+    dh = DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False)
+    dh.save({"full_name": "John Doe", "email": "John@X.com ", "phone": "+1 (202) 555-0100", "current_location": "Berlin"})
+    dh.save({"full_name": "Jon Doe", "email": "jdoe@y.com", "phone": "12025550100", "current_location": "Paris"})
+    assert len(dh) == 1
+    rec = dh.get("john@x.com")
+    assert rec["full_name"] == "Jon Doe" and rec["current_location"] == "Paris"
+    assert rec["_version"] == 2
+    # the second email is an alias of the same candidate
+    assert dh.get("JDOE@y.com")["full_name"] == "Jon Doe"
+    # different person sharing a phone number stays separate
+    dh.save({"full_name": "Alice Smith", "email": "alice@x.com", "phone": "12025550100"})
+    assert len(dh) == 2
+
+def test_duplicate_by_name_and_profile(tmp_path):
+    dh = DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False)
+    profile = {"current_location": "Guntur", "desired_position": "Data Engineer", "years_experience": "3"}
+    dh.save(dict(profile, full_name="Venkata Sai", email="sai@gmail.com"))
+    dh.save(dict(profile, full_name="venkata  sai", email="sai@gmial.com"))
+    dh.save(dict(profile, full_name="Sai", email="other@gmail.com"))
+    assert len(dh) == 2
+    assert dh.get("sai@gmial.com")["_aliases"]
+
+def test_unchanged_save_is_not_written(tmp_path):
+    path = tmp_path / "cand.jsonl"
+    dh = DataHandler(str(path), batch_window_ms=1)
+    dh.save({"full_name": "Alice", "email": "a@b.com", "tech_stack": ["python"]})
+    stored = dh.save({"full_name": "Alice", "email": "a@b.com", "tech_stack": ["python"]}).result(timeout=5)
+    assert stored["full_name"] == "Alice"
+    dh.close()
+    assert len(_stored_lines(dh)) == 1
+
+def test_migration_folds_duplicates(tmp_path):
+    legacy = tmp_path / "cand.json"
+    legacy.write_text(json.dumps([
+        {"full_name": "sai", "email": "sai@gmail.com", "phone": "1234567890"},
+        {"full_name": "sai", "email": "sai@gmail.com", "phone": "1234567890"},
+        {"full_name": "Venkata Sai", "email": "Sai@gmail.com", "phone": "+91 7013171112"},
+    ]))
+    dh = DataHandler(str(tmp_path / "cand.jsonl"), legacy_path=str(legacy))
+    assert len(dh) == 1 and dh.superseded == 0
+    assert dh.get("sai@gmail.com")["full_name"] == "Venkata Sai"
+
+def test_migrates_single_jsonl_file_into_segments(tmp_path):
+    path = tmp_path / "cand.jsonl"
+    path.write_text("".join(json.dumps(anonymize(r)) + "\n" for r in [
+        {"full_name": "Jan", "email": "j@b.com", "_saved_at": "2025-01-05T00:00:00Z"},
+        {"full_name": "Feb", "email": "f@b.com", "_saved_at": "2025-02-05T00:00:00Z"},
+        {"full_name": "Nodate"},
+    ]))
+    dh = DataHandler(str(path), write_behind=False)
+    assert not os.path.exists(str(path))
+    assert dh.segments() == ["0000-00", "2025-01", "2025-02"]
+    assert dh.get("j@b.com")["full_name"] == "Jan" and len(dh) == 3
+
+def _dated(path, **kwargs):
+    path.write_text("".join(json.dumps(anonymize(r)) + "\n" for r in [
+        {"full_name": "Old", "email": "old@b.com", "_saved_at": "2024-11-02T00:00:00Z", "tech_stack": ["go"]},
+        {"full_name": "Mid", "email": "mid@b.com", "_saved_at": "2024-12-02T00:00:00Z", "tech_stack": ["go"]},
+        {"full_name": "New", "email": "new@b.com", "_saved_at": "2025-01-02T00:00:00Z", "tech_stack": ["go"]},
+    ]))
+    return DataHandler(str(path), write_behind=False, **kwargs)
+
+def test_purge_before_unlinks_whole_segments(tmp_path):
+    dh = _dated(tmp_path / "cand.jsonl")
+    assert dh.purge_before("2024-12-15") == ["2024-11"]
+    assert dh.segments() == ["2024-12", "2025-01"]
+    assert not os.path.exists(segment_path(dh.segment_dir, "2024-11"))
+    assert dh.get("old@b.com") is None and len(dh) == 2
+    assert dh.query(tech="go").total == 2
+    assert [r["full_name"] for r in dh.saved_between()] == ["Mid", "New"]
+    assert dh.purge_before("2024-12-15") == []
+    assert len(DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False)) == 2
+
+def test_erase_hides_at_once_and_compacts_its_segments(tmp_path):
+    dh = _dated(tmp_path / "cand.jsonl", auto_compact=False)
+    dh.save({"full_name": "Mid 2", "email": "mid@b.com"})  # now in the current segment too
+    assert dh.erase("MID@b.com")
+    assert dh.get("mid@b.com") is None and dh.query(tech="go").total == 2
+    assert not dh.erase("mid@b.com")
+    # Not compacted yet: the tombstone hides the records when the store is reopened
+    reopened = DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False, auto_compact=False)
+    assert reopened.get("mid@b.com") is None and len(reopened) == 2
+    reopened.compact()
+    assert not os.path.exists(os.path.join(reopened.segment_dir, "tombstones.jsonl"))
+    assert all(r["full_name"] in ("Old", "New") for r in _stored_lines(reopened))
+    # Saving the candidate again after the erasure is a new record
+    reopened.save({"full_name": "Mid 3", "email": "mid@b.com"})
+    assert DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False).get("mid@b.com")["full_name"] == "Mid 3"
+
+def test_erase_compacts_in_background(tmp_path):
+    dh = _dated(tmp_path / "cand.jsonl")
+    assert dh.erase("old@b.com")
+    for _ in range(100):
+        if not dh._compacting:
+            break
+        time.sleep(0.01)
+    assert "2024-11" not in dh.segments()
+    assert not os.path.exists(os.path.join(dh.segment_dir, "tombstones.jsonl"))
+
+def test_concurrent_saves_keep_the_last_one_through_a_full_queue(tmp_path):
+    import threading
+
+    for run in range(5):
+        path = str(tmp_path / f"run{run}.jsonl")
+        dh = DataHandler(path, max_queue=2, batch_window_ms=1, fsync=False, auto_compact=False)
+
+        def worker(n):
+            for i in range(50):
+                dh.save({"full_name": "Ann Lee", "email": "ann@example.com", "years_experience": f"{n}{i:02}"})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 9)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        dh.close()
+        # Every save merges into the one before it, so the last one saved is version 400
+        assert dh.get("ann@example.com")["_version"] == 400
+        reopened = DataHandler(path, write_behind=False, auto_compact=False)
+        assert reopened.get("ann@example.com")["_version"] == 400
+        reopened.close()
@@ -0,0 +1,38 @@
+import pytest
+
+from utils.intents import ROUTER, IntentRouter
+
+
+def test_exit_matches_whole_words_only():
+    assert "exit" in ROUTER.route("ok, Bye!")
+    assert "exit" in ROUTER.route("I want to QUIT now")
+    assert "exit" not in ROUTER.route("I'm quite sure, byelaws and exits aside")
+
+
+def test_whole_message_intents():
+    assert "greeting" in ROUTER.route("Hi!")
+    assert "greeting" not in ROUTER.route("Hi, I'm John")
+    assert "more" in ROUTER.route(" More questions, please ")
+    assert "more" not in ROUTER.route("I need more time")
+
+
+def test_prefix_payload():
+    intents = ROUTER.route("New tech stack is: Go, Rust")
+    assert intents["new_stack"] == "Go, Rust"
+    assert ROUTER.route("my tech stack: python")["new_stack"] == "python"
+    assert "new_stack" not in ROUTER.route("I like your tech stack")
+
+
+def test_custom_router_rejects_unknown_placement():
+    router = IntentRouter([("help", "whole", "help me")])
+    assert router.route("Help me") == {"help": ""}
+    with pytest.raises(ValueError):
+        router.add("x", "middle", "x")
+
+
+def test_structured_tokens_and_whole_only_exit():
+    assert "exit" not in ROUTER.route("john.quit@example.com")
+    assert "exit" not in ROUTER.route("see https://example.com/bye")
+    assert "exit" in ROUTER.route("bye, my email is a@b.com")
+    assert "exit" not in ROUTER.route("Exit, Ohio", whole=("exit",))
+    assert "exit" in ROUTER.route(" Quit! ", whole=("exit",))
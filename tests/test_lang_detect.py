@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from utils.lang_detect import LocalLanguageDetector
+from utils.translation import TranslationService
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text, src="auto", dest="en"):
+        self.calls.append(src)
+        return SimpleNamespace(text=f"{dest}:{text}", src="fr" if src == "auto" else src)
+
+
+def test_scripts_and_latin_languages():
+    d = LocalLanguageDetector()
+    assert d.detect("నా పేరు రవి").lang == "te"
+    assert d.detect("मेरा नाम राहुल है").lang == "hi"
+    assert d.detect("I have five years of experience").lang == "en"
+    assert d.detect("Je suis développeur depuis cinq ans").lang == "fr"
+    assert d.detect("Ich habe viel Erfahrung mit Datenbanken").lang == "de"
+    assert d.detect("Tengo mucha experiencia con bases de datos").lang == "es"
+
+
+def test_structured_and_short_inputs():
+    d = LocalLanguageDetector()
+    for text in ["john@example.com", "+91 98765 43210", "3", "John Doe", "Python, Django, AWS"]:
+        assert d.detect(text).lang is None
+    assert d.detect("hi") == ("en", 0.95)
+    assert d.detect("merci").lang == "fr"
+
+
+def test_translation_skips_network_when_confident():
+    fake = FakeTranslator()
+    svc = TranslationService(translator=fake)
+    assert svc.to_english("hi") == ("hi", "en")
+    assert svc.to_english("john@example.com") == ("john@example.com", None)
+    assert svc.to_english("Je suis développeur") == ("en:Je suis développeur", "fr")
+    assert fake.calls == ["fr"]
+    assert svc.local_detections == 3
+
+
+def test_low_confidence_falls_back_to_remote():
+    fake = FakeTranslator()
+    svc = TranslationService(translator=fake, min_confidence=1.01)
+    assert svc.to_english("bonjour tout le monde")[1] == "fr"
+    assert fake.calls == ["auto"]
+    assert svc.remote_detections == 1
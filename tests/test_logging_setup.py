@@ -0,0 +1,34 @@
+import json
+import logging
+
+from utils.logging_setup import configure_logging, redact, shutdown_logging
+
+
+def test_redact():
+    assert redact("mail ann@example.com or call +91 98765 43210") == "mail [email] or call [phone]"
+    assert redact("3 years") == "3 years"
+
+
+def test_redact_keeps_dates_and_timestamps():
+    assert redact("spilled at 2026-10-18T06:57:46Z") == "spilled at 2026-10-18T06:57:46Z"
+    assert redact("2026-10-18 06:57:46,123 sweep") == "2026-10-18 06:57:46,123 sweep"
+    assert redact("order 12345, call (415) 555-0100 or 4155550100") == "order 12345, call [phone] or [phone]"
+
+
+def test_queue_logging_writes_redacted_json(tmp_path):
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    log_path = tmp_path / "logs" / "chatbot.log"
+    try:
+        listener = configure_logging(str(log_path), level="INFO", console=False)
+        assert configure_logging() is listener  # idempotent
+        logging.getLogger("test").info("turn", extra={"stage": "collect", "note": "from ann@example.com"})
+        logging.getLogger("test").info("saved %s", "+1 202 555 0147")
+    finally:
+        shutdown_logging()
+        root.handlers[:] = saved[0]
+        root.setLevel(saved[1])
+    lines = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["event"] == "turn" and lines[0]["stage"] == "collect"
+    assert lines[0]["note"] == "from [email]"
+    assert lines[1]["event"] == "saved [phone]"
@@ -0,0 +1,45 @@
+from utils import metrics
+from utils.metrics import Registry
+
+
+def test_render_prometheus_text():
+    reg = Registry()
+    reg.describe("demo_seconds", "Demo span")
+    reg.histogram("demo_seconds", (("stage", "collect"),)).observe(0.003)
+    reg.inc("demo_total", (("field", "email"),), 2)
+    reg.register_callback("demo_hits_total", lambda: 7, "counter")
+    text = reg.render()
+    assert "# HELP demo_seconds Demo span" in text
+    assert 'demo_seconds_bucket{stage="collect",le="0.005"} 1' in text
+    assert 'demo_seconds_bucket{stage="collect",le="0.0025"} 0' in text
+    assert 'demo_seconds_count{stage="collect"} 1' in text
+    assert 'demo_total{field="email"} 2' in text
+    assert "# TYPE demo_hits_total counter" in text and "demo_hits_total 7" in text
+
+
+def test_disabled_spans_are_noops():
+    metrics.disable()
+    try:
+        before = metrics.REGISTRY.counter_value("test_disabled_total")
+        with metrics.span("test_disabled_seconds"):
+            metrics.inc("test_disabled_total")
+        assert metrics.REGISTRY.counter_value("test_disabled_total") == before
+        assert "test_disabled_seconds" not in metrics.render_prometheus()
+    finally:
+        metrics.enable()
+
+
+def test_chatbot_counts_stages_and_validation_failures(tmp_path):
+    from chatbot import HiringAssistantChatbot
+    from data_handler import DataHandler
+
+    dh = DataHandler(str(tmp_path / "m.jsonl"))
+    bot = HiringAssistantChatbot()
+    msgs = metrics.REGISTRY.counter_value("talentscout_messages_total", stage="collect")
+    fails = metrics.REGISTRY.counter_value("talentscout_validation_failures_total", field="full_name")
+    bot.process_message("hi", None, dh, lang="en")
+    bot.process_message("R2D2!", None, dh, lang="en")
+    assert metrics.REGISTRY.counter_value("talentscout_messages_total", stage="collect") == msgs + 1
+    assert metrics.REGISTRY.counter_value("talentscout_validation_failures_total", field="full_name") == fails + 1
+    assert 'talentscout_stage_seconds_count{stage="greeting"}' in metrics.render_prometheus()
+    dh.close()
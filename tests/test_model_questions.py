@@ -0,0 +1,87 @@
+import threading
+import time
+
+from chatbot import HiringAssistantChatbot
+from utils import model_questions
+from utils.model_questions import ModelQuestionGenerator, clean_questions
+from utils.question_generator import generate_questions
+from utils.rendered_questions import RenderedQuestionCache
+
+
+class FakeBackend:
+    """Echoes numbered questions per prompt after a fixed delay."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batch_sizes = []
+
+    def __call__(self, prompts, per_prompt):
+        self.batch_sizes.append(len(prompts))
+        time.sleep(self.delay)
+        return [[f"Question {i} from '{p[-20:]}'" for i in range(per_prompt)] for p in prompts]
+
+
+def test_clean_questions():
+    out = clean_questions(["  How does X   scale", "How does X scale?", "short", "Explain X caching."], 5)
+    assert out == ["How does X scale?", "Explain X caching?"]
+
+
+def test_concurrent_requests_share_a_batch_and_disk_cache(tmp_path):
+    backend = FakeBackend(delay=0.05)
+    gen = ModelQuestionGenerator(backend, cache_dir=str(tmp_path), max_batch=8, max_wait_ms=30)
+    results = {}
+    threads = [threading.Thread(target=lambda t=t: results.update(gen.questions([t], timeout=5)))
+               for t in ("elixir", "zig", "nim", "zig")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    gen.close()
+    assert set(results) == {"elixir", "zig", "nim"} and sum(backend.batch_sizes) == 3
+    assert len(backend.batch_sizes) < 3
+    # A new generator (e.g. after a restart) reads the disk cache instead of the model
+    backend2 = FakeBackend()
+    gen2 = ModelQuestionGenerator(backend2, cache_dir=str(tmp_path))
+    assert gen2.questions(["zig"]) == {"zig": results["zig"]} and backend2.batch_sizes == []
+    gen2.close()
+
+
+def test_missed_deadline_falls_back_to_templates(tmp_path):
+    gen = ModelQuestionGenerator(FakeBackend(delay=0.3), cache_dir=str(tmp_path), deadline_ms=20)
+    model_questions.set_question_model(gen)
+    try:
+        first = generate_questions(["zig"], seed=1)
+        assert "core concepts" in " ".join(first["zig"]) or "best practices" in " ".join(first["zig"])
+        assert gen.timeouts == 1
+        time.sleep(0.5)  # generation finished in the background
+        second = generate_questions(["zig", "python"], seed=1)
+        assert all(q.startswith("[zig] Question") for q in second["zig"]) and "python" in second
+    finally:
+        model_questions.set_question_model(None)
+        gen.close()
+
+
+def test_fallback_blocks_are_not_cached(tmp_path):
+    class Store:
+        def save(self, record):
+            pass
+
+    def reply(email):
+        bot = HiringAssistantChatbot(rendered_questions=cache)
+        bot.stage = "tech_stack"
+        bot.candidate_info.update(full_name="Ann", email=email)
+        return bot.process_message("zig", None, Store(), lang="en")
+
+    gen = ModelQuestionGenerator(FakeBackend(delay=0.3), cache_dir=str(tmp_path), deadline_ms=20)
+    model_questions.set_question_model(gen)
+    cache = RenderedQuestionCache(variants=1)
+    try:
+        fallbacks = set()
+        generate_questions(["zig", "python"], seed=1, fallbacks=fallbacks)
+        assert fallbacks == {"zig"}
+        assert "[zig] Question" not in reply("ann@example.com") and len(cache) == 0
+        time.sleep(0.5)
+        assert "[zig] Question" in reply("bob@example.com") and len(cache) == 1
+    finally:
+        model_questions.set_question_model(None)
+        gen.close()
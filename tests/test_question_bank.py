@@ -0,0 +1,46 @@
+import json
+import os
+from utils import question_bank
+from utils.question_bank import compile_bank, QuestionBank
+
+def _write(path, techs):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "techs": techs}, f)
+
+def test_compile_and_aliases(tmp_path):
+    src = str(tmp_path / "bank.json")
+    _write(src, {
+        "PostgreSQL": {"aliases": ["postgres", "pg"], "questions": ["Q1 ü", "Q2", "Q2"]},
+        "go": {"aliases": ["golang"], "questions": ["G1"]},
+    })
+    bank = QuestionBank(compile_bank(src))
+    assert len(bank) == 2
+    assert bank.resolve("Postgres") == "postgresql"
+    assert bank.resolve("golang") == "go"
+    assert bank.resolve("cobol") is None
+    assert bank.questions("pg") == ["Q1 ü", "Q2"]  # duplicates dropped
+    assert bank.questions("go") == ["G1"]
+
+def test_hot_reload(tmp_path, monkeypatch):
+    src = str(tmp_path / "bank.json")
+    _write(src, {"go": {"questions": ["G1"]}})
+    monkeypatch.setenv("QUESTION_BANK_PATH", src)
+    monkeypatch.setattr(question_bank, "RELOAD_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(question_bank, "_bank", None)
+    assert question_bank.get_question_bank().questions("go") == ["G1"]
+
+    _write(src, {"go": {"questions": ["G1", "G2"]}, "rust": {"questions": ["R1"]}})
+    os.utime(src, (os.path.getmtime(src) + 5,) * 2)
+    bank = question_bank.get_question_bank()
+    assert bank.questions("go") == ["G1", "G2"]
+    assert "rust" in bank
+
+def test_question_ids_survive_recompile(tmp_path):
+    src = str(tmp_path / "bank.json")
+    _write(src, {"go": {"questions": ["G1", "G2"]}})
+    old = QuestionBank(compile_bank(src))
+    _write(src, {"ada": {"questions": ["A1"]}, "go": {"questions": ["G0", "G2", "G1"]}})
+    new = QuestionBank(compile_bank(src))
+    ids = {new.question("go", i): new.question_id("go", i) for i in range(3)}
+    assert ids["G1"] == old.question_id("go", 0) and ids["G2"] == old.question_id("go", 1)
+    assert len(set(ids.values())) == 3 and all(qid >= 0 for qid in ids.values())
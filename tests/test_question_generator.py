@@ -8,3 +8,16 @@ def test_generate_for_known_tech():
 def test_generate_for_unknown_tech():
     q = generate_questions(["someobscuretech"])
     assert any("someobscuretech" in s.lower() for s in q)
+
+def test_seeded_sampling_is_reproducible():
+    from utils.question_generator import candidate_seed
+    seed = candidate_seed("a@b.com", ["python", "django"])
+    assert generate_questions(["python", "django"], seed=seed) == generate_questions(["python", "django"], seed=seed)
+
+def test_exclude_draws_fresh_questions():
+    asked = set()
+    first = generate_questions(["python", "someobscuretech"], seed=1, exclude=asked)
+    second = generate_questions(["python", "someobscuretech"], seed=2, exclude=asked)
+    for tech, qs in second.items():
+        assert not set(qs) & set(first[tech])
+    assert len(asked) == sum(len(q) for q in first.values()) + sum(len(q) for q in second.values())
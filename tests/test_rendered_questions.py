@@ -0,0 +1,63 @@
+import json
+import os
+
+from chatbot import HiringAssistantChatbot
+from utils import question_bank
+from utils.rendered_questions import RenderedQuestionCache, stack_key
+
+
+class _Store:
+    def save(self, record):
+        pass
+
+
+def _questions(reply):
+    return {line.split(". ", 1)[1] for line in reply.splitlines() if ". [" in line}
+
+
+def _bot(cache, name, email):
+    bot = HiringAssistantChatbot(rendered_questions=cache)
+    bot.stage = "tech_stack"
+    bot.candidate_info.update(full_name=name, email=email)
+    return bot
+
+
+def test_stack_key_normalizes():
+    assert stack_key(["Django", " python", "django", ""]) == ("django", "python")
+
+
+def test_block_shared_between_candidates():
+    cache = RenderedQuestionCache(variants=1)
+    first = _bot(cache, "Ann", "ann@example.com")
+    second = _bot(cache, "Bob", "bob@example.com")
+    r1 = first.process_message("Python, Django", None, _Store(), lang="en")
+    r2 = second.process_message("django, python", None, _Store(), lang="en")
+    assert r1.startswith("Thank you Ann") and r2.startswith("Thank you Bob")
+    assert r1.split("\n", 1)[1] == r2.split("\n", 1)[1]
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Cached picks count as asked, so "more" draws fresh questions
+    assert first.conversation.asked == second.conversation.asked and first.conversation.asked
+    more = first.process_message("more", None, _Store(), lang="en")
+    assert _questions(more) and not _questions(more) & _questions(r1)
+
+
+def test_cache_is_bounded():
+    cache = RenderedQuestionCache(maxsize=2, variants=1)
+    for stack in ("python", "java", "go"):
+        _bot(cache, "Ann", "ann@example.com").process_message(stack, None, _Store(), lang="en")
+    assert len(cache) == 2 and cache.misses == 3
+
+
+def test_hot_reloaded_bank_is_not_served_stale(tmp_path, monkeypatch):
+    src = tmp_path / "bank.json"
+    src.write_text(json.dumps({"techs": {"go": {"questions": ["G1", "G2", "G3", "G4"]}}}), encoding="utf-8")
+    monkeypatch.setenv("QUESTION_BANK_PATH", str(src))
+    monkeypatch.setattr(question_bank, "RELOAD_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(question_bank, "_bank", None)
+    cache = RenderedQuestionCache(variants=1)
+    assert "G1" in _bot(cache, "Ann", "ann@example.com").process_message("go", None, _Store(), lang="en")
+
+    src.write_text(json.dumps({"techs": {"go": {"questions": ["N1", "N2", "N3", "N4"]}}}), encoding="utf-8")
+    os.utime(src, (os.path.getmtime(src) + 5,) * 2)
+    reply = _bot(cache, "Bob", "bob@example.com").process_message("go", None, _Store(), lang="en")
+    assert "N1" in reply and "G1" not in reply and cache.misses == 2
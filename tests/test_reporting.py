@@ -0,0 +1,91 @@
+import io
+import json
+
+from utils import reporting
+from data_handler import DataHandler, anonymize
+from utils.reporting import ReportAggregates, candidate_stats, erased_keys, iter_records, resolve_store, store_files, write_csv_chunks
+
+
+def _records():
+    return [
+        {"full_name": "A", "email": "a@b.com", "years_experience": "1", "tech_stack": ["Python"], "_saved_at": "2025-01-01T10:00:00Z"},
+        {"full_name": "B", "email": "b@b.com", "years_experience": "7", "tech_stack": ["python", "sql"], "_saved_at": "2025-01-02T10:00:00Z"},
+        {"full_name": "A2", "email": "a@b.com", "years_experience": "2", "tech_stack": ["go"], "_saved_at": "2025-01-02T11:00:00Z"},
+    ]
+
+
+def test_streams_json_array_in_small_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, "_READ_CHUNK", 7)
+    path = tmp_path / "legacy.json"
+    path.write_text(json.dumps(_records(), indent=2, ensure_ascii=False), encoding="utf-8")
+    assert [r["full_name"] for r, _ in iter_records(str(path))] == ["A", "B", "A2"]
+
+
+def test_jsonl_resumes_from_offset(tmp_path):
+    path = tmp_path / "store.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in _records()))
+    pairs = list(iter_records(str(path)))
+    assert [r["full_name"] for r, _ in iter_records(str(path), pairs[0][1])] == ["B", "A2"]
+
+
+def test_aggregates_and_state_round_trip(tmp_path):
+    agg = ReportAggregates()
+    for record in _records()[:2]:
+        assert agg.add(record) is True
+    state_path = str(tmp_path / "state.json")
+    agg.save_state(state_path, {"offset": 10})
+    resumed, state = ReportAggregates.load_state(state_path)
+    assert state["offset"] == 10
+    assert resumed.add({**_records()[2], "_version": 2, "_merged_by": "email"}) is False
+    assert resumed.add({"email": "c@b.com", "_version": 2, "_merged_by": "phone", "_saved_at": "2025-01-03"}) is False
+    resumed.set_candidates({"candidates": 2, "techs": {"go": 1, "sql": 1}, "years": {2: 1, 7: 1}})
+    summary = resumed.summary()
+    assert summary["candidates"] == 2 and summary["candidates_per_tech"] == {"go": 1, "sql": 1}
+    assert summary["experience"] == {"2-4": 1, "5-9": 1}
+    assert summary["resubmissions"] == 1 and summary["duplicates"] == 1
+    assert summary["submissions_per_day"] == {"2025-01-01": 1, "2025-01-02": 2, "2025-01-03": 1}
+
+
+def test_candidate_stats_count_latest_records_whatever_was_compacted(tmp_path):
+    dh = DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False, auto_compact=False)
+    dh.save({"full_name": "Ann Lee", "email": "a@b.com", "years_experience": "1", "tech_stack": ["Python"]})
+    dh.save({"full_name": "Bob Ray", "email": "b@b.com", "phone": "+14155550100", "years_experience": "7",
+             "tech_stack": ["python", "sql"]})
+    dh.save({"full_name": "Ann Lee", "email": "a@b.com", "years_experience": "2", "tech_stack": ["go"]})
+    dh.save({"full_name": "Bob Ray", "email": "bob@b.com", "phone": "+14155550100", "years_experience": "8"})
+    store = resolve_store(str(tmp_path / "cand.jsonl"))
+    before = candidate_stats(store)
+    assert before == {"candidates": 2, "techs": {"go": 1, "python": 1, "sql": 1}, "years": {2: 1, 8: 1}}
+    agg = ReportAggregates()
+    for name, path in store_files(store):
+        for record, _ in iter_records(path):
+            agg.add(record)
+    assert (agg.records, agg.resubmissions, agg.duplicates) == (4, 1, 1)
+    dh.compact()
+    dh.close()
+    assert candidate_stats(store) == before
+    single = tmp_path / "single.jsonl"
+    single.write_text("".join(json.dumps(r) + "\n" for r in _records()))
+    assert candidate_stats(str(single)) == {"candidates": 2, "techs": {"go": 1, "python": 1, "sql": 1},
+                                            "years": {2: 1, 7: 1}}
+
+
+def test_csv_chunks():
+    out = io.StringIO()
+    assert write_csv_chunks(_records(), out, chunk_size=2) == 3
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("full_name,email") and len(lines) == 4
+    assert '"python, sql"' in lines[2]
+
+
+def test_segmented_store_files_and_erasures(tmp_path):
+    (tmp_path / "cand.jsonl").write_text("".join(json.dumps(anonymize(r)) + "\n" for r in _records()))
+    dh = DataHandler(str(tmp_path / "cand.jsonl"), write_behind=False, auto_compact=False, dedupe=False)
+    dh.erase("b@b.com")
+    store = resolve_store(str(tmp_path / "cand.jsonl"))
+    assert store == dh.segment_dir
+    assert [name for name, _ in store_files(store)] == ["2025-01"]
+    erased = erased_keys(store)
+    visible = [r["full_name"] for name, path in store_files(store) for r, _ in iter_records(path)
+               if r["email"] not in erased]
+    assert visible == ["A", "A2"]
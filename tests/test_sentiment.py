@@ -0,0 +1,28 @@
+from textblob import TextBlob
+from utils.sentiment import SentimentService, label_for
+
+SAMPLES = [
+    "I am very happy!",
+    "not good",
+    "This is not a bad idea",
+    "I hate this, terrible",
+    "great, awesome :)",
+    "Python, Django",
+]
+
+def test_matches_textblob_polarity():
+    svc = SentimentService()
+    for text in SAMPLES:
+        assert abs(svc.score(text).polarity - TextBlob(text).sentiment.polarity) < 1e-9
+
+def test_batch_matches_single_and_memoizes():
+    svc = SentimentService()
+    batch = svc.score_batch(SAMPLES + SAMPLES)
+    assert batch[:len(SAMPLES)] == batch[len(SAMPLES):]
+    assert [svc.score(t) for t in SAMPLES] == batch[:len(SAMPLES)]
+    assert svc.hits == len(SAMPLES)
+
+def test_labels():
+    assert label_for(0.5) == "positive"
+    assert label_for(-0.5) == "negative"
+    assert label_for(0.0) == "neutral"
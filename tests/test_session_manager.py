@@ -0,0 +1,54 @@
+from utils.session_manager import SessionManager
+
+def test_create_get_close():
+    sm = SessionManager()
+    s = sm.create()
+    assert sm.get(s.session_id) is s
+    assert s.chatbot.stage == "greeting"
+    assert len(sm) == 1
+    assert sm.close(s.session_id)
+    assert sm.get(s.session_id) is None
+    assert not sm.close(s.session_id)
+
+def test_sessions_share_services():
+    sm = SessionManager()
+    a, b = sm.create(), sm.create()
+    assert a.session_id != b.session_id
+    assert a.chatbot.translation is b.chatbot.translation
+
+def test_idle_sessions_spill_and_rehydrate(tmp_path):
+    sm = SessionManager(idle_ttl=10, spill_dir=str(tmp_path))
+    s = sm.create()
+    s.chatbot.stage = "collect"
+    s.chatbot.candidate_info["full_name"] = "Jo"
+    assert sm.sweep(now=s.last_seen + 60) == (1, 0)
+    assert len(sm) == 0
+    restored = sm.get(s.session_id)
+    assert restored.chatbot.stage == "collect"
+    assert restored.chatbot.candidate_info == {"full_name": "Jo"}
+
+def test_lru_bound_without_spill_drops():
+    sm = SessionManager(max_live=2)
+    first = sm.create()
+    sm.create()
+    sm.create()
+    assert len(sm) == 2
+    assert sm.get(first.session_id) is None
+
+def test_transcript_survives_spill(tmp_path):
+    sm = SessionManager(idle_ttl=10, spill_dir=str(tmp_path / "spill"), transcript_dir=str(tmp_path / "tx"))
+    s = sm.create()
+    s.context.add_message("user", "hi")
+    s.context.add_message("assistant", "hello")
+    sm.sweep(now=s.last_seen + 60)
+    restored = sm.get(s.session_id)
+    assert restored is not s and [m["content"] for m in restored.context.get_context()] == ["hi", "hello"]
+
+def test_sessions_held_by_a_socket_are_not_spilled(tmp_path):
+    sm = SessionManager(idle_ttl=10, spill_dir=str(tmp_path))
+    s = sm.create()
+    s.sockets += 1
+    assert sm.sweep(now=s.last_seen + 60) == (0, 0)
+    assert sm.get(s.session_id) is s
+    s.sockets -= 1
+    assert sm.sweep(now=s.last_seen + 60) == (1, 0)
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from utils.translation import TranslationService, TranslationCache
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text, src="auto", dest="en"):
+        self.calls += 1
+        detected = "fr" if src == "auto" else src
+        return SimpleNamespace(text=f"{dest}:{text}", src=detected)
+
+
+def test_single_call_and_cache():
+    fake = FakeTranslator()
+    svc = TranslationService(translator=fake, cache=TranslationCache(maxsize=8))
+    assert svc.to_english("bonjour") == ("en:bonjour", "fr")
+    assert svc.to_english("bonjour") == ("en:bonjour", "fr")
+    assert svc.from_english("hello", "fr") == "fr:hello"
+    assert svc.from_english("hello", "fr") == "fr:hello"
+    assert fake.calls == 2
+    assert svc.cache.hits == 2
+
+
+def test_english_skips_network():
+    fake = FakeTranslator()
+    svc = TranslationService(translator=fake)
+    assert svc.to_english("hello", src="en") == ("hello", "en")
+    assert svc.from_english("hello", "en") == "hello"
+    assert fake.calls == 0
+
+
+def test_prewarm_and_eviction():
+    fake = FakeTranslator()
+    svc = TranslationService(translator=fake, cache=TranslationCache(maxsize=3))
+    assert svc.prewarm(["a", "b"], ["en", "fr", "de"]) == 4
+    assert len(svc.cache) == 3
+
+
+class BulkTranslator(FakeTranslator):
+    def translate(self, text, src="auto", dest="en"):
+        if isinstance(text, list):
+            self.calls += 1
+            return [SimpleNamespace(text=f"{dest}:{t}", src=src) for t in text]
+        return super().translate(text, src, dest)
+
+
+def test_batch_groups_by_language():
+    fake = BulkTranslator()
+    svc = TranslationService(translator=fake)
+    texts = ["hi", "Je suis développeur", "Ich habe viel Erfahrung", "Je suis développeur"]
+    out = svc.to_english_batch(texts)
+    assert out[0] == ("hi", "en")
+    assert out[1] == ("en:Je suis développeur", "fr")
+    assert out[2] == ("en:Ich habe viel Erfahrung", "de")
+    assert fake.calls == 2  # one per source language, then served from cache
+
+
+def test_neutral_input_skips_network_with_known_source():
+    fake = BulkTranslator()
+    svc = TranslationService(translator=fake)
+    assert svc.to_english("jane.doe@example.com", src="fr") == ("jane.doe@example.com", "fr")
+    assert svc.to_english_batch(["+33 6 12 34 56 78", "Python, Django"], src="fr") == [
+        ("+33 6 12 34 56 78", "fr"), ("Python, Django", "fr")]
+    assert svc.to_english("jane.doe@example.com") == ("jane.doe@example.com", None)
+    assert fake.calls == 0
+    assert svc.to_english("Je suis développeur", src="fr") == ("en:Je suis développeur", "fr")
@@ -12,3 +12,23 @@ def test_phone():
 def test_sanitize_stack():
     l = sanitize_tech_stack("Python, Django , Postgres")
     assert "Python" in [x.capitalize() for x in l] or "python" in l
+
+def test_validate_field_normalizes():
+    from utils.validators import validate_field
+    assert validate_field("full_name", "  John   Doe ") == (True, "John Doe")
+    assert validate_field("phone", "+91  98765 43210") == (True, "+91 98765 43210")
+    assert validate_field("years_experience", "x")[0] is False
+
+def test_validate_batch_columnar_errors():
+    from utils.validators import validate_batch
+    rows = [
+        {"full_name": "Ann Lee", "email": "a@b.com", "phone": "+1 202 555 0147",
+         "years_experience": "3", "desired_position": "Dev", "current_location": "Paris"},
+        {"full_name": "A1", "email": "bad", "phone": "+1 202 555 0147",
+         "years_experience": "3", "desired_position": "Dev"},
+    ]
+    result = validate_batch(rows)
+    assert result.valid == [True, False]
+    assert result.errors == {"full_name": [1], "email": [1], "current_location": [1]}
+    assert result.columns["full_name"] == ["Ann Lee", "A1"]
+    assert validate_batch(rows, fields=["email"], accept=lambda v: v == "bad").valid == [True, True]
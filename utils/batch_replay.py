@@ -0,0 +1,195 @@
+"""
+Bulk replay of recruiter-supplied conversations through the chatbot.
+
+Input is JSON Lines, one conversation per line:
+
+    {"id": "c1", "lang": "fr", "messages": ["hi", "Jean Dupont", ...]}
+    {"id": "c2", "form": {"full_name": "...", ..., "tech_stack": "python, sql"}}
+
+A pre-filled "form" is turned into the turns a candidate would have typed
+("hi", each field in order, then the tech stack), so every conversation goes
+through the same stage logic as the UI. Conversations are replayed in chunks
+across a process pool. Per chunk, inbound messages are translated with one
+remote call per source language and scored with one sentiment batch before
+the turns run. Records the chatbot saves are sent back to the parent, which
+writes them through a single (write-behind, group-committed) DataHandler.
+Bot replies are not translated back, since only state is kept.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from chatbot import HiringAssistantChatbot
+from data_handler import anonymize
+from utils.conversation_state import FIELD_KEYS
+from utils.sentiment import get_sentiment_service
+from utils.translation import get_translation_service
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayChatbot(HiringAssistantChatbot):
+    """Chatbot that records generated questions and skips reply translation."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rendered_questions = None  # every question must go through _next_questions
+        self.generated: Dict[str, List[str]] = {}
+
+    def _translate_back(self, text: str) -> str:
+        return text
+
+    def _next_questions(self):
+        questions_by_tech = super()._next_questions()
+        for tech, qs in questions_by_tech.items():
+            self.generated.setdefault(tech, []).extend(qs)
+        return questions_by_tech
+
+
+class _CollectingStore:
+    """Stands in for DataHandler inside workers; keeps the latest saved record."""
+
+    def __init__(self):
+        self.record: Optional[Dict] = None
+
+    def save(self, record: Dict) -> Future:
+        self.record = dict(record)
+        future = Future()
+        future.set_result(self.record)
+        return future
+
+
+def conversation_turns(convo: Dict) -> List[str]:
+    """The messages to replay for one conversation (a form becomes turns)."""
+    form = convo.get("form")
+    if not form:
+        return [str(m) for m in convo.get("messages", [])]
+    turns = ["hi"] + [str(form.get(key, "")) for key in FIELD_KEYS]
+    stack = form.get("tech_stack")
+    if stack:
+        turns.append(", ".join(stack) if isinstance(stack, list) else str(stack))
+    return turns + [str(m) for m in convo.get("messages", [])]
+
+
+def replay_chunk(chunk: List[Dict], translate: bool = True) -> List[Dict]:
+    """Replay a chunk of conversations in this process; one result per conversation."""
+    translation = get_translation_service()
+    sentiment = get_sentiment_service()
+    turns = [conversation_turns(convo) for convo in chunk]
+
+    if translate:
+        by_lang: Dict[Optional[str], List[str]] = {}
+        for convo, messages in zip(chunk, turns):
+            by_lang.setdefault(convo.get("lang"), []).extend(m.strip() for m in messages)
+        english = []
+        for lang, texts in by_lang.items():
+            try:
+                english.extend(text for text, _ in translation.to_english_batch(texts, src=lang))
+            except Exception as exc:  # fall back to per-turn translation
+                logger.warning("Batch translation failed for lang '%s': %s", lang, exc)
+        sentiment.score_batch(english)
+    else:
+        sentiment.score_batch(m for messages in turns for m in messages)
+
+    results = []
+    for convo, messages in zip(chunk, turns):
+        store = _CollectingStore()
+        bot = ReplayChatbot(translation=translation, sentiment=sentiment)
+        lang = convo.get("lang") if translate else "en"
+        error = None
+        for message in messages:
+            try:
+                bot.process_message(message, None, store, lang=lang)
+            except Exception as exc:
+                error = str(exc)
+                break
+        # Conversations that never said "exit" still keep what they collected
+        if store.record is None and bot.candidate_info.get("tech_stack"):
+            store.save(bot.candidate_info)
+        results.append({
+            "id": convo.get("id"),
+            "stage": str(bot.stage),
+            "turns": len(messages),
+            "candidate": store.record,
+            "questions": bot.generated,
+            "error": error,
+        })
+    return results
+
+
+def read_conversations(f: TextIO) -> Iterator[Dict]:
+    for n, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        convo = json.loads(line)
+        convo.setdefault("id", n)
+        yield convo
+
+
+def _chunks(items: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_replay(
+    conversations: Iterable[Dict],
+    out: TextIO,
+    data_handler=None,
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+    translate: bool = True,
+) -> Dict:
+    """
+    Replay conversations, writing one JSON result per line to out and saving
+    candidates through data_handler. workers=0 runs in-process.
+    Returns summary stats including conversations per second.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    stats = {"conversations": 0, "saved": 0, "errors": 0}
+    start = time.perf_counter()
+
+    def consume(results: List[Dict]):
+        for result in results:
+            stats["conversations"] += 1
+            if result["error"]:
+                stats["errors"] += 1
+            if result["candidate"] is not None:
+                if data_handler is not None:
+                    data_handler.save(result["candidate"])
+                    stats["saved"] += 1
+                result["candidate"] = anonymize(result["candidate"])  # results never carry raw PII
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    chunks = _chunks(conversations, chunk_size)
+    if workers == 0:
+        for chunk in chunks:
+            consume(replay_chunk(chunk, translate))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Bounded in-flight window keeps memory flat on huge inputs
+            pending = []
+            for chunk in chunks:
+                pending.append(pool.submit(replay_chunk, chunk, translate))
+                if len(pending) >= workers * 2:
+                    consume(pending.pop(0).result())
+            for future in pending:
+                consume(future.result())
+
+    if data_handler is not None:
+        data_handler.flush()
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 3)
+    stats["conversations_per_second"] = round(stats["conversations"] / elapsed, 1) if elapsed else 0.0
+    return stats
@@ -0,0 +1,177 @@
+"""
+Secondary indexes over the candidate store, maintained on every save.
+
+Each candidate key (hashed email, or "#offset") gets a dense document id in
+first-save order. Three indexes map attribute values to sets of ids:
+
+- tech_stack: inverted index, tech -> ids
+- years_experience: one bucket per whole year (capped at MAX_YEARS; -1 holds
+  unparseable values), plus each document's bucket for in-order scans
+- current_location: normalized location -> ids
+
+search() intersects the smallest sets first and returns only the keys of the
+requested page, so DataHandler reads (and deserializes) just those records.
+remove() leaves a hole in the id space (filled again when the store is
+reopened), so purges cost one unlink per removed candidate.
+"""
+
+import heapq
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+MAX_YEARS = 50  # years_experience above this share the top bucket
+
+
+def normalize_value(value) -> str:
+    return " ".join(str(value or "").casefold().split())
+
+
+def years_bucket(value) -> Optional[int]:
+    try:
+        years = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return min(max(years, 0), MAX_YEARS) if years >= 0 else None
+
+
+class CandidateIndex:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._doc_ids: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []  # None where a key was removed
+        self._removed = 0
+        self._years_by_doc = array("h")  # bucket per document, -1 if unknown, -2 if removed
+        self._attrs: Dict[int, Tuple[Tuple[str, ...], int, str]] = {}
+        self._techs: Dict[str, Set[int]] = {}
+        self._years: Dict[int, Set[int]] = {}
+        self._locations: Dict[str, Set[int]] = {}
+
+    def __len__(self):
+        return len(self._keys) - self._removed
+
+    def add(self, key: str, record: Dict):
+        """Index record under key, replacing what was indexed for key before."""
+        doc = self._doc_ids.get(key)
+        if doc is None:
+            doc = self._doc_ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._years_by_doc.append(-1)
+        else:
+            self._unlink(doc)
+
+        techs = tuple(dict.fromkeys(normalize_value(t) for t in record.get("tech_stack") or () if normalize_value(t)))
+        years = years_bucket(record.get("years_experience"))
+        location = normalize_value(record.get("current_location"))
+        for tech in techs:
+            self._techs.setdefault(tech, set()).add(doc)
+        years = -1 if years is None else years
+        self._years.setdefault(years, set()).add(doc)
+        self._years_by_doc[doc] = years
+        if location:
+            self._locations.setdefault(location, set()).add(doc)
+        self._attrs[doc] = (techs, years, location)
+
+    def counts(self) -> Tuple[Dict[str, int], Dict[int, int]]:
+        """(documents per tech, documents per years bucket); -1 holds unknown years."""
+        return ({tech: len(docs) for tech, docs in self._techs.items()},
+                {years: len(docs) for years, docs in self._years.items()})
+
+    def remove(self, key: str):
+        doc = self._doc_ids.pop(key, None)
+        if doc is None:
+            return
+        self._unlink(doc)
+        self._keys[doc] = None
+        self._years_by_doc[doc] = -2
+        self._removed += 1
+
+    def _unlink(self, doc: int):
+        techs, years, location = self._attrs.pop(doc, ((), -1, ""))
+        for tech in techs:
+            _discard(self._techs, tech, doc)
+        _discard(self._years, years, doc)
+        if location:
+            _discard(self._locations, location, doc)
+
+    def search(
+        self,
+        tech: Union[str, Iterable[str], None] = None,
+        min_years: Optional[int] = None,
+        max_years: Optional[int] = None,
+        location: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Tuple[List[str], int]:
+        """
+        Keys of matching candidates (all given filters must match) in first-save
+        order, sliced to [offset, offset + limit), plus the total match count.
+        """
+        sets: List[Set[int]] = []
+        if tech:
+            for name in [tech] if isinstance(tech, str) else tech:
+                sets.append(self._techs.get(normalize_value(name), set()))
+        if location:
+            sets.append(self._locations.get(normalize_value(location), set()))
+        by_years = min_years is not None or max_years is not None
+        lo = max(min_years or 0, 0)
+        hi = min(MAX_YEARS if max_years is None else max_years, MAX_YEARS)
+        years_of = self._years_by_doc
+
+        if sets:
+            sets.sort(key=len)
+            matches = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+            if by_years:
+                matches = self._filter_years(matches, lo, hi)
+            return self._page(matches.__contains__, matches, len(matches), offset, limit)
+        if by_years:
+            total = sum(len(self._years.get(y, ())) for y in range(lo, hi + 1))
+            return self._page(lambda doc: lo <= years_of[doc] <= hi, None, total, offset, limit,
+                              lambda: set().union(*(self._years.get(y, ()) for y in range(lo, hi + 1))))
+        # No filters: document ids are already in order
+        if not self._removed:
+            return self._keys[offset: offset + limit], len(self._keys)
+        live = (key for key in self._keys if key is not None)
+        return list(islice(live, offset, offset + limit)), len(self)
+
+    def _filter_years(self, docs: Set[int], lo: int, hi: int) -> Set[int]:
+        """docs restricted to buckets lo..hi, via whichever set operation touches fewer ids."""
+        inside = [b for y, b in self._years.items() if lo <= y <= hi]
+        outside = [b for y, b in self._years.items() if not lo <= y <= hi]
+        if len(docs) + sum(map(len, outside)) < sum(min(len(docs), len(b)) for b in inside):
+            return docs.difference(*outside)
+        return set().union(*(docs.intersection(b) for b in inside))
+
+    def _page(self, member, matches, total, offset, limit, materialize=None) -> Tuple[List[str], int]:
+        """
+        Pick the page's documents in id order. Dense matches are found by
+        walking ids from 0 (about need * n / total steps); sparse ones by a
+        heap over the match set (about total steps).
+        """
+        need = offset + limit
+        n = len(self._keys)
+        if total == 0 or offset >= total:
+            return [], total
+        if need * n < total * total:
+            page = []
+            for doc in range(n):
+                if member(doc):
+                    page.append(doc)
+                    if len(page) == need:
+                        break
+            page = page[offset:]
+        else:
+            if matches is None:
+                matches = materialize()
+            page = heapq.nsmallest(need, matches)[offset:]
+        return [self._keys[doc] for doc in page], total
+
+
+def _discard(index: Dict, value, doc: int):
+    docs = index.get(value)
+    if docs is not None:
+        docs.discard(doc)
+        if not docs:
+            del index[value]
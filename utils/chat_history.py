@@ -0,0 +1,89 @@
+"""
+Paged chat history for the Streamlit UI, over the session's ContextManager.
+
+Messages are grouped into fixed-size pages. A full page never changes, so
+its HTML is rendered once and cached; each turn only formats the messages on
+the last (partial) page. Only the newest pages are shown, with older ones
+revealed on demand: pages still in the context's window are read from it,
+older ones are replayed from its transcript. Without a transcript, pages
+that have left the window are dropped. At most max_messages worth of page
+HTML is cached.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.context_manager import ContextManager
+
+MESSAGE_TEMPLATE = """
+    <div style='background:black; color:white; padding:10px; border-radius:10px; margin:5px 0;'>
+    <b>{label}:</b> {msg}
+    </div>
+    """
+
+# UI sender <-> transcript role
+_ROLES = {"You": "user", "Bot": "assistant"}
+_SENDERS = {role: sender for sender, role in _ROLES.items()}
+
+
+def render_message(sender: str, msg: str) -> str:
+    return MESSAGE_TEMPLATE.format(label="🧑 You" if sender == "You" else "🤖 Bot", msg=msg)
+
+
+class PagedHistory:
+    def __init__(self, page_size: int = 20, max_messages: int = 400, context: Optional[ContextManager] = None):
+        self.page_size = page_size
+        self.max_messages = max(max_messages, page_size)
+        # Without a caller's context, the window doubles as the cap
+        self.context = context if context is not None else ContextManager(max_len=self.max_messages)
+        self._page_html: Dict[int, str] = {}  # absolute page number -> cached HTML
+
+    def append(self, item: Tuple[str, str]):
+        """Append a (sender, msg) pair to the context, like list.append on the old history list."""
+        sender, msg = item
+        self.context.add_message(_ROLES.get(sender, "assistant"), msg)
+
+    @property
+    def offset(self) -> int:
+        """Absolute index of the first message that can still be shown."""
+        if self.context.transcript_path:
+            return 0
+        first = self.context.window_start
+        return -(-first // self.page_size) * self.page_size  # whole pages only
+
+    def __len__(self):
+        return len(self.context) - self.offset
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for message in self.context.messages(self.offset):
+            yield _SENDERS.get(message["role"], "Bot"), message["content"]
+
+    @property
+    def first_page(self) -> int:
+        return self.offset // self.page_size
+
+    @property
+    def last_page(self) -> int:
+        return max(len(self.context) - 1, self.offset) // self.page_size
+
+    def page_count(self) -> int:
+        return self.last_page - self.first_page + 1 if len(self) else 0
+
+    def render_pages(self, visible_pages: int = 1) -> List[str]:
+        """HTML blocks for the newest visible_pages pages, oldest first."""
+        if not len(self):
+            return []
+        start = max(self.first_page, self.last_page - visible_pages + 1)
+        return [self._render_page(page) for page in range(start, self.last_page + 1)]
+
+    def _render_page(self, page: int) -> str:
+        cached = self._page_html.get(page)
+        if cached is not None:
+            return cached
+        lo = max(page * self.page_size, self.offset)
+        chunk = self.context.messages(lo, page * self.page_size + self.page_size)
+        html = "".join(render_message(_SENDERS.get(m["role"], "Bot"), m["content"]) for m in chunk)
+        if len(chunk) == self.page_size:  # full pages never change
+            self._page_html[page] = html
+            if len(self._page_html) > self.max_messages // self.page_size:
+                del self._page_html[min(self._page_html)]
+        return html
@@ -1,19 +1,168 @@
 """
-Simple context manager that stores recent messages (in-memory).
-Used to pass context to LLMs if integrated in the future.
+Per-session chat transcript: the single record of a conversation.
+
+Recent messages live in a fixed-size ring buffer (the hot window passed to
+LLMs and shown in the UI); every message is also appended to an optional
+per-session JSON Lines transcript file as it is added, so the full interview
+survives the window and the process. last(n) and get_context() only touch
+the window, replay() streams the transcript back lazily for audits, and
+memory per session stays bounded by max_len however long the interview runs.
+Reopening an existing transcript resumes its numbering and window.
+
+Transcripts are off unless TALENTSCOUT_TRANSCRIPT_DIR (or an explicit
+directory) is set. Emails and phone numbers are written as the same hashes
+the candidate store uses ("[email:<sha256>]"), so erase_transcripts() can
+find a candidate's transcripts and purge_transcripts() applies retention.
 """
 
-from collections import deque
+import json
+import os
+import re
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from data_handler import anonymize
+from utils.logging_setup import pseudonymize
+
+_SESSION_ID_RE = re.compile(r"^[0-9A-Za-z_-]{1,64}$")
+
+
+def transcript_path(session_id: str, directory: Optional[str] = None) -> Optional[str]:
+    """
+    Transcript file for a session under directory (default
+    TALENTSCOUT_TRANSCRIPT_DIR); None when no directory is configured (the
+    default) or the id is not a plain token.
+    """
+    if directory is None:
+        directory = os.getenv("TALENTSCOUT_TRANSCRIPT_DIR", "")
+    if not directory or not _SESSION_ID_RE.match(session_id or ""):
+        return None
+    return os.path.join(directory, session_id + ".jsonl")
+
+
+def _digest(field: str, value: str) -> str:
+    return anonymize({field: value})[field]
+
+
+def _transcripts(directory: str) -> List[str]:
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in names if name.endswith(".jsonl")]
+
+
+def purge_transcripts(directory: str, before: float) -> List[str]:
+    """Retention: delete transcripts last written before `before` (Unix time); returns their paths."""
+    expired = [path for path in _transcripts(directory) if os.path.getmtime(path) < before]
+    for path in expired:
+        os.remove(path)
+    return expired
+
+
+def erase_transcripts(directory: str, email_hashes: Iterable[str]) -> List[str]:
+    """Erasure: delete transcripts mentioning any of the hashed emails; returns their paths."""
+    markers = [f"[email:{key}]" for key in email_hashes]
+    erased = []
+    for path in _transcripts(directory):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if any(marker in text for marker in markers):
+            os.remove(path)
+            erased.append(path)
+    return erased
+
 
 class ContextManager:
-    def __init__(self, max_len: int = 20):
-        self.history = deque(maxlen=max_len)
+    def __init__(self, max_len: int = 20, transcript_path: Optional[str] = None):
+        self.max_len = max(max_len, 1)
+        self.transcript_path = transcript_path
+        self._ring: List[Optional[Dict]] = [None] * self.max_len
+        self._count = 0  # messages in the session, including those only in the transcript
+        self._loaded = not (transcript_path and os.path.exists(transcript_path))
 
     def add_message(self, role: str, content: str):
-        self.history.append({"role": role, "content": content})
+        if not self._loaded:
+            self._load()
+        message = {"role": role, "content": content}
+        if self.transcript_path:
+            entry = {"i": self._count, "role": role, "content": pseudonymize(content, _digest),
+                     "at": datetime.now(timezone.utc).isoformat()}
+            os.makedirs(os.path.dirname(os.path.abspath(self.transcript_path)), exist_ok=True)
+            with open(self.transcript_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._ring[self._count % self.max_len] = message
+        self._count += 1
+
+    def get_context(self) -> List[Dict]:
+        """The hot window, oldest first."""
+        return self.last(self.max_len)
+
+    def last(self, n: int = 5) -> List[Dict]:
+        """The newest n messages (at most the window), oldest first."""
+        if not self._loaded:
+            self._load()
+        n = min(max(n, 0), self._count, self.max_len)
+        if not n:
+            return []
+        end = self._count % self.max_len
+        start = end - n
+        if start >= 0:
+            return self._ring[start:end]
+        return self._ring[start:] + self._ring[:end]
+
+    def messages(self, start: int, stop: Optional[int] = None) -> List[Dict]:
+        """
+        Messages start..stop-1 of the session (0 is the first), from the
+        window while they are in it, else replayed from the transcript.
+        """
+        if not self._loaded:
+            self._load()
+        stop = self._count if stop is None else min(stop, self._count)
+        start = max(start, 0)
+        if start >= stop:
+            return []
+        if start >= self.window_start:
+            return self.last(self._count - start)[: stop - start]
+        return list(islice(self.replay(start), stop - start))
+
+    def replay(self, start: int = 0) -> Iterator[Dict]:
+        """
+        Stream transcript entries ({"i", "role", "content", "at"}) from message
+        start on; without a transcript only the window can be replayed.
+        """
+        if not self.transcript_path:
+            first = self.window_start
+            for i, message in enumerate(self.last(self._count - max(start, first)), max(start, first)):
+                yield {"i": i, **message}
+            return
+        try:
+            f = open(self.transcript_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry["i"] >= start:
+                        yield entry
+
+    @property
+    def window_start(self) -> int:
+        """Index of the oldest message still in the window."""
+        if not self._loaded:
+            self._load()
+        return max(self._count - self.max_len, 0)
 
-    def get_context(self):
-        return list(self.history)
+    def __len__(self):
+        if not self._loaded:
+            self._load()
+        return self._count
 
-    def last(self, n=5):
-        return list(self.history)[-n:]
+    def _load(self):
+        """Resume from an existing transcript: message count and window."""
+        self._loaded = True
+        for entry in self.replay():
+            self._ring[self._count % self.max_len] = {"role": entry["role"], "content": entry["content"]}
+            self._count += 1
@@ -0,0 +1,138 @@
+"""
+Compact, serializable conversation state.
+
+Everything a conversation needs between turns fits in a small __slots__
+record (stage, field index, language, candidate fields, ids of questions
+already asked), which packs into
+a compact binary blob so sessions can be spilled to disk or moved between
+replicas and rehydrated later.
+"""
+
+import json
+import struct
+from enum import Enum
+from typing import Dict, Optional, Set
+
+# Required candidate fields, asked in this order (key, human label)
+FIELDS = (
+    ("full_name", "Full Name"),
+    ("email", "Email"),
+    ("phone", "Phone Number"),
+    ("years_experience", "Years of Experience"),
+    ("desired_position", "Desired Position(s)"),
+    ("current_location", "Current Location"),
+)
+FIELD_KEYS = tuple(key for key, _ in FIELDS)
+
+
+class Stage(str, Enum):
+    """Conversation stages; str-valued so they compare equal to plain names."""
+    GREETING = "greeting"
+    COLLECT = "collect"
+    TECH_STACK = "tech_stack"
+    QUESTIONS = "questions"
+
+    def __str__(self):
+        return self.value
+
+
+_STAGES = tuple(Stage)
+_FORMAT_VERSION = 3  # v2 appends the asked-question ids; v3 widens lengths and counts to 32 bits
+_HEADER = struct.Struct("!BBBB")  # version, stage, field index, presence bits
+_LEN = struct.Struct("!I")
+_LEN_V2 = struct.Struct("!H")  # lengths and counts in v1/v2 blobs
+_ID = struct.Struct("!i")
+_TECH_BIT = 1 << len(FIELD_KEYS)
+_EXTRA_BIT = _TECH_BIT << 1
+
+
+class ConversationState:
+    __slots__ = ("stage", "field_index", "lang", "candidate", "asked")
+
+    def __init__(
+        self,
+        stage: Stage = Stage.GREETING,
+        field_index: int = 0,
+        lang: str = "en",
+        candidate: Optional[Dict] = None,
+        asked: Optional[Set[int]] = None,
+    ):
+        self.stage = Stage(stage)
+        self.field_index = field_index
+        self.lang = lang
+        self.candidate = candidate if candidate is not None else {}
+        self.asked = asked if asked is not None else set()  # question ids (see generate_questions)
+
+    def __eq__(self, other):
+        if not isinstance(other, ConversationState):
+            return NotImplemented
+        return (self.stage, self.field_index, self.lang, self.candidate, self.asked) == \
+            (other.stage, other.field_index, other.lang, other.candidate, other.asked)
+
+    def __repr__(self):
+        return (f"ConversationState(stage={self.stage.value!r}, field_index={self.field_index}, "
+                f"lang={self.lang!r}, fields={sorted(self.candidate)})")
+
+    def to_bytes(self) -> bytes:
+        """Pack into a compact binary blob (see from_bytes)."""
+        candidate = dict(self.candidate)
+        bits = 0
+        body = [_pack_str(self.lang)]
+        for i, key in enumerate(FIELD_KEYS):
+            value = candidate.pop(key, None)
+            if value is not None:
+                bits |= 1 << i
+                body.append(_pack_str(str(value)))
+        techs = candidate.pop("tech_stack", None)
+        if techs is not None:
+            bits |= _TECH_BIT
+            body.append(_LEN.pack(len(techs)))
+            body.extend(_pack_str(t) for t in techs)
+        if candidate:
+            bits |= _EXTRA_BIT
+            body.append(_pack_str(json.dumps(candidate, separators=(",", ":"), ensure_ascii=False)))
+        body.append(_LEN.pack(len(self.asked)))
+        body.extend(_ID.pack(qid) for qid in sorted(self.asked))
+        header = _HEADER.pack(_FORMAT_VERSION, _STAGES.index(self.stage), self.field_index, bits)
+        return header + b"".join(body)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "ConversationState":
+        version, stage, field_index, bits = _HEADER.unpack_from(blob, 0)
+        if version not in (1, 2, _FORMAT_VERSION):
+            raise ValueError(f"Unsupported conversation state version {version}")
+        length = _LEN if version >= 3 else _LEN_V2
+        pos = _HEADER.size
+        lang, pos = _unpack_str(blob, pos, length)
+        candidate = {}
+        for i, key in enumerate(FIELD_KEYS):
+            if bits & (1 << i):
+                candidate[key], pos = _unpack_str(blob, pos, length)
+        if bits & _TECH_BIT:
+            (count,) = length.unpack_from(blob, pos)
+            pos += length.size
+            techs = []
+            for _ in range(count):
+                tech, pos = _unpack_str(blob, pos, length)
+                techs.append(tech)
+            candidate["tech_stack"] = techs
+        if bits & _EXTRA_BIT:
+            extra, pos = _unpack_str(blob, pos, length)
+            candidate.update(json.loads(extra))
+        asked = set()
+        if version >= 2:
+            (count,) = length.unpack_from(blob, pos)
+            pos += length.size
+            asked = {_ID.unpack_from(blob, pos + i * _ID.size)[0] for i in range(count)}
+        return cls(_STAGES[stage], field_index, lang, candidate, asked)
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _LEN.pack(len(data)) + data
+
+
+def _unpack_str(blob: bytes, pos: int, length_struct: struct.Struct = _LEN):
+    (length,) = length_struct.unpack_from(blob, pos)
+    start = pos + length_struct.size
+    return blob[start:start + length].decode("utf-8"), start + length
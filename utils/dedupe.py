@@ -0,0 +1,178 @@
+"""
+Duplicate detection for candidate records, run by DataHandler on every save.
+
+A record belongs to a candidate already stored when
+
+- its hashed email is that candidate's key or one of its aliases (exact), or
+- its hashed phone matches and the names are similar (phone), or
+- the names are near-identical, location, desired position and years of
+  experience all agree and the phones do not conflict, e.g. a retry with a
+  mistyped email (name).
+
+Only candidates sharing a block with the incoming record are compared: one
+block per hashed phone and one per (name token prefix, location, years), so an
+insert looks at a handful of candidates however large the store is.
+"""
+
+from difflib import SequenceMatcher
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.candidate_index import normalize_value
+
+PHONE_NAME_THRESHOLD = 0.8  # name similarity needed when phones match
+NAME_THRESHOLD = 0.9  # name similarity needed when only the profile matches
+MAX_BLOCK_COMPARE = 64  # candidates compared per block (shared placeholder phones)
+
+# Bookkeeping fields that do not count as a change to the candidate
+_META_FIELDS = ("_saved_at", "_seq", "_version", "_first_saved_at", "_merged_by")
+
+
+def normalize_name(value) -> str:
+    """Casefolded name tokens in sorted order ("Doe,  John" -> "doe john")."""
+    text = "".join(ch if ch.isalnum() else " " for ch in str(value or "").casefold())
+    return " ".join(sorted(text.split()))
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of two normalize_name() values in [0, 1]."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < PHONE_NAME_THRESHOLD:
+        return 0.0
+    return matcher.ratio()
+
+
+def merge_records(old: Dict, new: Dict) -> Dict:
+    """
+    new folded into old: non-empty fields of new win, the candidate keeps old's
+    email (new's becomes an alias), and the version is bumped.
+    """
+    merged = dict(old)
+    for field, value in new.items():
+        if value not in (None, "", [], ()):
+            merged[field] = value
+    old_email, new_email = old.get("email"), new.get("email")
+    if old_email and new_email and new_email != old_email:
+        merged["email"] = old_email
+        aliases = list(old.get("_aliases") or ())
+        if new_email not in aliases:
+            aliases.append(new_email)
+        merged["_aliases"] = aliases
+    merged["_version"] = int(old.get("_version") or 1) + 1
+    merged["_first_saved_at"] = old.get("_first_saved_at") or old.get("_saved_at")
+    return merged
+
+
+def same_content(a: Dict, b: Dict) -> bool:
+    """True when a and b differ at most in bookkeeping fields."""
+    keys = (set(a) | set(b)).difference(_META_FIELDS)
+    return all(a.get(key) == b.get(key) for key in keys)
+
+
+class DuplicateIndex:
+    """Blocking index over anonymized records keyed by hashed email."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # key -> (phone, name, blocks, aliases)
+        self._entries: Dict[str, Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._aliases: Dict[str, str] = {}  # alias email hash -> key
+        self._by_phone: Dict[str, Set[str]] = {}
+        self._by_block: Dict[str, Set[str]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key: str, record: Dict):
+        """Index record under key, replacing what was indexed for key before."""
+        self.remove(key)
+        phone = record.get("phone") or ""
+        name = normalize_name(record.get("full_name"))
+        blocks = _name_blocks(name, record)
+        aliases = tuple(record.get("_aliases") or ())
+        self._entries[key] = (phone, name, blocks, aliases)
+        if phone:
+            self._by_phone.setdefault(phone, set()).add(key)
+        for block in blocks:
+            self._by_block.setdefault(block, set()).add(key)
+        for alias in aliases:
+            self._aliases[alias] = key
+
+    def remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        phone, _, blocks, aliases = entry
+        if phone:
+            _discard(self._by_phone, phone, key)
+        for block in blocks:
+            _discard(self._by_block, block, key)
+        for alias in aliases:
+            if self._aliases.get(alias) == key:
+                del self._aliases[alias]
+
+    def resolve(self, email: str) -> Optional[str]:
+        """Key of the candidate an email hash belongs to, if any."""
+        if email in self._entries:
+            return email
+        return self._aliases.get(email)
+
+    def match(self, record: Dict) -> Optional[Tuple[str, str]]:
+        """(key, "email" | "phone" | "name") of the stored candidate record duplicates, or None."""
+        email = record.get("email")
+        if email:
+            key = self.resolve(email)
+            if key is not None:
+                return key, "email"
+        name = normalize_name(record.get("full_name"))
+        if not name:
+            return None
+
+        phone = record.get("phone")
+        if phone:
+            best = self._best(name, self._by_phone.get(phone, ()), PHONE_NAME_THRESHOLD)
+            if best is not None:
+                return best, "phone"
+        candidates: Set[str] = set()
+        for block in _name_blocks(name, record):
+            candidates.update(islice(self._by_block.get(block, ()), MAX_BLOCK_COMPARE))
+        if phone:
+            candidates = {key for key in candidates if not self._entries[key][0]}
+        best = self._best(name, candidates, NAME_THRESHOLD)
+        if best is not None:
+            return best, "name"
+        return None
+
+    def _best(self, name: str, keys, threshold: float) -> Optional[str]:
+        best, best_score = None, threshold
+        for key in islice(keys, MAX_BLOCK_COMPARE):
+            score = name_similarity(name, self._entries[key][1])
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+
+def _name_blocks(name: str, record: Dict) -> Tuple[str, ...]:
+    """One block per name token prefix, qualified by the rest of the profile."""
+    location = normalize_value(record.get("current_location"))
+    position = normalize_value(record.get("desired_position"))
+    years = normalize_value(record.get("years_experience"))
+    if not (name and location and position and years):
+        return ()
+    profile = f"{location}|{position}|{years}"
+    tokens: List[str] = list(dict.fromkeys(token[:3] for token in name.split()))
+    return tuple(f"{token}|{profile}" for token in tokens)
+
+
+def _discard(index: Dict[str, Set[str]], value: str, key: str):
+    keys = index.get(value)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[value]
@@ -0,0 +1,113 @@
+"""
+Intent routing for chat turns.
+
+Keyword phrases are compiled once into a word-level trie. route() normalizes a
+message in one C-level pass (a byte translation table lowercases ASCII and
+turns punctuation into spaces, then split()), rejects it with one set
+intersection if no phrase's first word occurs, and otherwise walks the trie
+from the words that do. Matching is on whole words ("bye" matches "ok bye",
+not "abyeance"), and adding phrases does not add scans. Emails and URLs are
+dropped before matching, so "john.quit@example.com" holds no "quit". Placements:
+
+- "any":    anywhere in the message (exit)
+- "whole":  the entire message, ignoring punctuation (greeting, "more")
+- "prefix": the start of the message; the rest is the payload
+            ("new tech stack: go, rust" -> "go, rust")
+
+route(message, whole=...) narrows the listed intents to whole-message
+matches, e.g. exit while collecting names and locations ("Exit, Ohio").
+"""
+
+import re
+from typing import Collection, Dict, Iterable, List, Tuple
+
+from prompts import EXIT_KEYWORDS, GREETING_KEYWORDS, MORE_KEYWORDS, NEW_STACK_KEYWORDS
+
+PLACEMENTS = ("any", "whole", "prefix")
+
+# ASCII letters -> lowercase, other ASCII non-word bytes -> space; UTF-8 bytes kept
+_FOLD = bytes(
+    c + 32 if 65 <= c <= 90 else c if (c >= 128 or c == 95 or chr(c).isalnum()) else 32
+    for c in range(256)
+)
+_WORD_RE = re.compile(r"\w+")
+# Structured tokens whose parts are not words of the message
+_STRUCTURED_RE = re.compile(r"\S+@\S+|\S+://\S+")
+# Filler between a prefix phrase and its payload ("tech stack is: ...")
+_FILLER_RE = re.compile(r"^[\W_]*(?:(?:is|are|to|now)\b[\W_]*)*", re.IGNORECASE)
+
+_END = b""  # trie key holding the (intent, placement) pairs ending at a node
+
+
+def _words(text: str) -> List[bytes]:
+    if not text.isascii():
+        text = text.casefold()
+    return text.encode("utf-8").translate(_FOLD).split()
+
+
+class IntentRouter:
+    def __init__(self, phrases: Iterable[Tuple[str, str, str]] = ()):
+        self._trie: Dict[bytes, Dict] = {}
+        for intent, placement, phrase in phrases:
+            self.add(intent, placement, phrase)
+
+    def add(self, intent: str, placement: str, phrase: str):
+        """Register phrase (matched on whole words, case-insensitively) for intent."""
+        if placement not in PLACEMENTS:
+            raise ValueError(f"unknown placement {placement!r}")
+        words = _words(phrase)
+        if not words:
+            raise ValueError(f"empty phrase for intent {intent!r}")
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(_END, []).append((intent, placement))
+
+    def route(self, message: str, whole: Collection[str] = ()) -> Dict[str, str]:
+        """
+        {intent: payload} for every intent in message; payloads are "" except
+        for prefixes. Intents in whole match only as the entire message.
+        """
+        if "@" in message or "://" in message:
+            message = _STRUCTURED_RE.sub(" ", message)
+        words = _words(message)
+        trie = self._trie
+        if trie.keys().isdisjoint(words):
+            return {}
+        intents: Dict[str, str] = {}
+        n = len(words)
+        for start, word in enumerate(words):
+            node = trie.get(word)
+            pos = start
+            while node is not None:
+                for intent, placement in node.get(_END, ()):
+                    if placement == "any" and (intent not in whole or (start == 0 and pos == n - 1)):
+                        intents[intent] = ""
+                    elif start == 0 and placement == "whole" and pos == n - 1:
+                        intents[intent] = ""
+                    elif start == 0 and placement == "prefix":  # longest prefix wins
+                        intents[intent] = _payload(message, pos + 1)
+                pos += 1
+                node = node.get(words[pos]) if pos < n else None
+        return intents
+
+
+def _payload(message: str, skip: int) -> str:
+    """message after its first skip words, minus filler such as ": " or "is"."""
+    for i, match in enumerate(_WORD_RE.finditer(message), 1):
+        if i == skip:
+            return _FILLER_RE.sub("", message[match.end():]).strip()
+    return ""
+
+
+def default_phrases() -> List[Tuple[str, str, str]]:
+    """The chatbot's intents, from the keyword lists in prompts.py."""
+    phrases = [("exit", "any", word) for word in EXIT_KEYWORDS]
+    phrases += [("greeting", "whole", word) for word in GREETING_KEYWORDS]
+    phrases += [("more", "whole", word) for word in MORE_KEYWORDS]
+    phrases += [("new_stack", "prefix", word) for word in NEW_STACK_KEYWORDS]
+    return phrases
+
+
+# Compiled once at import; stateless, so safe to share across sessions
+ROUTER = IntentRouter(default_phrases())
@@ -0,0 +1,169 @@
+"""
+Offline language detector for the languages offered in the UI.
+
+Handles most chat turns in-process so they never need a network round-trip:
+- Telugu and Devanagari (Hindi) text is recognised by Unicode script range.
+- Structured or language-neutral input (numbers, emails, phone numbers, URLs,
+  short names / places / tech lists) is reported as neutral: it needs no
+  translation and keeps the session's current language.
+- Latin-script text (en, fr, de, es) is scored with a character-trigram
+  naive Bayes model plus function-word and diacritic evidence.
+
+Callers should fall back to the remote detector when confidence is low.
+"""
+
+import math
+import re
+from collections import Counter, namedtuple
+from typing import Dict, Optional
+
+Detection = namedtuple("Detection", ["lang", "confidence"])  # lang None => neutral
+
+LATIN_LANGUAGES = ("en", "fr", "de", "es")
+
+# Unicode blocks that identify a language outright
+_SCRIPT_RANGES = (
+    ("te", 0x0C00, 0x0C7F),  # Telugu
+    ("hi", 0x0900, 0x097F),  # Devanagari
+)
+
+_EMAIL_RE = re.compile(r"^\S+@\S+\.\S+$")
+_PHONE_RE = re.compile(r"^\+?[\d\s().-]{3,}$")
+_URL_RE = re.compile(r"^(https?://|www\.)\S+$", re.IGNORECASE)
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+# Frequent function words and chat words per language
+_FUNCTION_WORDS = {
+    "en": """the a an and or but is are was were be been am i you he she we they it my your our this that
+        these those of to in on at for with from by about as not no yes do does did have has had will would
+        can could should what which who how why when where there here hi hello hey bye goodbye thanks thank
+        please ok okay sure more exit quit done know think want like good great bad very really just""",
+    "fr": """le la les un une des et ou mais est sont était être suis je tu il elle nous vous ils elles mon
+        ma mes ton ta votre notre ce cette ces de du au aux en dans sur pour avec par pas ne oui non que qui
+        quoi comment pourquoi quand où bonjour salut merci au revoir plus très bien aussi avez avoir fait""",
+    "de": """der die das ein eine einen und oder aber ist sind war waren sein bin ich du er sie wir ihr es
+        mein meine dein ihr unser dieser diese von zu im in auf für mit aus nicht kein ja nein was wer wie
+        warum wann wo hallo danke bitte tschüss mehr sehr gut auch haben habe hat wird kann noch""",
+    "es": """el la los las un una unos unas y o pero es son era ser estoy soy yo tú él ella nosotros
+        vosotros ellos mi mis tu su nuestro este esta estos de del al en con por para sin no sí que qué quien
+        cómo por qué cuando dónde hola gracias adiós más muy bien también tengo tiene hay puedo""",
+}
+FUNCTION_WORDS = {lang: frozenset(words.split()) for lang, words in _FUNCTION_WORDS.items()}
+
+# Characters that strongly suggest one Latin language
+_MARKER_CHARS = {
+    "fr": "çœèêëàâîïôûù",
+    "de": "ßäöü",
+    "es": "ñ¿¡áíóú",
+}
+
+# Small built-in training text for the trigram model
+_TRAINING_TEXT = {
+    "en": """Hello, I am looking for a new job as a software engineer. I have three years of experience
+        working with web applications and databases. My main skills are in backend development and cloud
+        services. I would like to know more about the position and the team. Thank you for your time, I look
+        forward to hearing from you. What are the next steps in the interview process? I enjoy solving
+        difficult problems and learning new technologies every day. Could you please tell me about the
+        company culture and the working hours? I am not sure about this question but I will try my best.""",
+    "fr": """Bonjour, je cherche un nouveau poste d'ingénieur logiciel. J'ai trois ans d'expérience dans le
+        développement d'applications web et de bases de données. Mes compétences principales sont le
+        développement backend et les services cloud. Je voudrais en savoir plus sur le poste et sur l'équipe.
+        Merci pour votre temps, j'attends votre réponse avec impatience. Quelles sont les prochaines étapes
+        du processus d'entretien? J'aime résoudre des problèmes difficiles et apprendre de nouvelles
+        technologies chaque jour. Pourriez-vous me parler de la culture de l'entreprise et des horaires de
+        travail? Je ne suis pas sûr de cette question mais je vais faire de mon mieux.""",
+    "de": """Hallo, ich suche eine neue Stelle als Softwareentwickler. Ich habe drei Jahre Erfahrung mit
+        Webanwendungen und Datenbanken. Meine wichtigsten Fähigkeiten liegen in der Backend-Entwicklung und
+        bei Cloud-Diensten. Ich möchte gerne mehr über die Stelle und das Team erfahren. Vielen Dank für Ihre
+        Zeit, ich freue mich auf Ihre Antwort. Was sind die nächsten Schritte im Bewerbungsprozess? Ich löse
+        gerne schwierige Probleme und lerne jeden Tag neue Technologien. Könnten Sie mir bitte etwas über die
+        Unternehmenskultur und die Arbeitszeiten erzählen? Ich bin mir bei dieser Frage nicht sicher, aber
+        ich werde mein Bestes geben.""",
+    "es": """Hola, estoy buscando un nuevo trabajo como ingeniero de software. Tengo tres años de
+        experiencia trabajando con aplicaciones web y bases de datos. Mis principales habilidades están en el
+        desarrollo backend y los servicios en la nube. Me gustaría saber más sobre el puesto y el equipo.
+        Gracias por su tiempo, espero tener noticias suyas pronto. ¿Cuáles son los siguientes pasos en el
+        proceso de entrevista? Me gusta resolver problemas difíciles y aprender nuevas tecnologías todos los
+        días. ¿Podría hablarme de la cultura de la empresa y del horario de trabajo? No estoy seguro de esta
+        pregunta pero haré lo mejor que pueda.""",
+}
+
+
+def _trigrams(text: str):
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3]
+
+
+class LocalLanguageDetector:
+    """
+    In-process detector. detect() returns Detection(lang, confidence) where
+    lang is None for language-neutral input.
+    """
+
+    def __init__(self, short_token_limit: int = 3):
+        self.short_token_limit = short_token_limit
+        self._logprob: Dict[str, Dict[str, float]] = {}
+        self._unseen: Dict[str, float] = {}
+        for lang, text in _TRAINING_TEXT.items():
+            counts = Counter(_trigrams(text))
+            total = sum(counts.values())
+            vocab = len(counts) + 1
+            self._logprob[lang] = {g: math.log((c + 1) / (total + vocab)) for g, c in counts.items()}
+            self._unseen[lang] = math.log(1 / (total + vocab))
+
+    def detect(self, text: str) -> Detection:
+        stripped = (text or "").strip()
+        if not stripped:
+            return Detection(None, 1.0)
+
+        # 1. Script ranges (non-Latin languages)
+        script = self._script(stripped)
+        if script:
+            return Detection(script, 1.0)
+
+        # 2. Structured / language-neutral input
+        if _EMAIL_RE.match(stripped) or _PHONE_RE.match(stripped) or _URL_RE.match(stripped):
+            return Detection(None, 1.0)
+        words = _WORD_RE.findall(stripped.lower())
+        if not words:
+            return Detection(None, 1.0)
+
+        # 3. Latin languages: function words, marker characters, trigrams
+        hits = {lang: sum(w in FUNCTION_WORDS[lang] for w in words) for lang in LATIN_LANGUAGES}
+        lowered = stripped.lower()
+        markers = {lang: sum(lowered.count(ch) for ch in chars) for lang, chars in _MARKER_CHARS.items()}
+        is_list = "," in stripped or len(words) <= self.short_token_limit
+        if is_list and not any(hits.values()) and not any(markers.values()):
+            # Names, places, tech lists ("John Doe", "Python, Django, AWS")
+            return Detection(None, 0.9)
+        if len(words) <= self.short_token_limit:
+            # Chat words ("hi", "exit", "merci") known to exactly one language
+            candidates = {lang for lang in LATIN_LANGUAGES if hits[lang] or markers.get(lang)}
+            if len(candidates) == 1:
+                return Detection(candidates.pop(), 0.95)
+
+        scores = {}
+        grams = list(_trigrams(stripped))
+        for lang in LATIN_LANGUAGES:
+            table, unseen = self._logprob[lang], self._unseen[lang]
+            trigram_score = sum(table.get(g, unseen) for g in grams) / max(len(grams), 1)
+            scores[lang] = trigram_score * len(words) + 2.0 * hits[lang] + 1.5 * markers.get(lang, 0)
+
+        best = max(scores, key=scores.get)
+        # Softmax over languages as a confidence estimate
+        top = scores[best]
+        norm = sum(math.exp(s - top) for s in scores.values())
+        return Detection(best, 1.0 / norm)
+
+    @staticmethod
+    def _script(text: str) -> Optional[str]:
+        for ch in text:
+            code = ord(ch)
+            if code < 0x0900:
+                continue
+            for lang, lo, hi in _SCRIPT_RANGES:
+                if lo <= code <= hi:
+                    return lang
+        return None
@@ -0,0 +1,142 @@
+"""
+Process-wide logging configuration, called once from an entry point
+(app.py, api_server.py), never on import.
+
+Request threads only enqueue LogRecords (QueueHandler); a background
+QueueListener formats them as JSON lines, redacts emails and phone numbers,
+and writes them to a rotating logs/chatbot.log (plus stderr). Log with a
+short event name and structured fields rather than interpolated text:
+
+    logger.info("turn", extra={"stage": "collect", "chars": 12})
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LOG_PATH = os.path.join(ROOT, "logs", "chatbot.log")
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# A leading "+", or 9+ digits that do not start like an ISO date (2026-10-18 stays readable)
+_PHONE_RE = re.compile(r"\+\d[\d\s().-]{6,}\d|(?<![\w+])(?!\d{4}-\d{2}-\d{2})\(?\d(?:[\s().-]{0,2}\d){8,}")
+_CONTACT_RE = re.compile(f"(?P<email>{_EMAIL_RE.pattern})|(?P<phone>{_PHONE_RE.pattern})")
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def redact(text: str) -> str:
+    """Mask email addresses and phone numbers."""
+    return _PHONE_RE.sub("[phone]", _EMAIL_RE.sub("[email]", text))
+
+
+def pseudonymize(text: str, digest: Callable[[str, str], str]) -> str:
+    """Replace emails and phone numbers with "[email:<digest>]" / "[phone:<digest>]" (digest(field, value))."""
+    return _CONTACT_RE.sub(lambda m: f"[{m.lastgroup}:{digest(m.lastgroup, m.group())}]", text)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, event and extra fields, redacted."""
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": redact(record.getMessage()),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = redact(value) if isinstance(value, str) else value
+        if record.exc_info:
+            payload["exc"] = redact(self.formatException(record.exc_info))
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_lock = threading.Lock()
+
+
+def configure_logging(
+    log_path: Optional[str] = None,
+    level: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    backup_count: int = 5,
+    rotate_when: Optional[str] = None,
+    console: bool = True,
+) -> logging.handlers.QueueListener:
+    """
+    Route the root logger through a queue to a background listener.
+    Rotation is by size (max_bytes, default 5 MB) or, if rotate_when is set
+    (e.g. "midnight"), by time. Defaults come from TALENTSCOUT_LOG_PATH,
+    TALENTSCOUT_LOG_LEVEL, TALENTSCOUT_LOG_MAX_BYTES and TALENTSCOUT_LOG_ROTATE_WHEN.
+    Safe to call more than once; later calls return the running listener.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        log_path = log_path or os.getenv("TALENTSCOUT_LOG_PATH", DEFAULT_LOG_PATH)
+        level = (level or os.getenv("TALENTSCOUT_LOG_LEVEL", "INFO")).upper()
+        max_bytes = max_bytes or int(os.getenv("TALENTSCOUT_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+        rotate_when = rotate_when or os.getenv("TALENTSCOUT_LOG_ROTATE_WHEN") or None
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+
+        if rotate_when:
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                log_path, when=rotate_when, backupCount=backup_count, encoding="utf-8", utc=True)
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        formatter = JsonFormatter()
+        file_handler.setFormatter(formatter)
+        handlers = [file_handler]
+        if console:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(formatter)
+            handlers.append(stream_handler)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        _queue_handler = _DeferredQueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Drain the queue and stop the listener (registered with atexit)."""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,242 @@
+"""
+Low-overhead timing spans, histograms and counters.
+
+    with metrics.span("talentscout_stage_seconds", stage="collect"):
+        ...
+    metrics.inc("talentscout_validation_failures_total", field="email")
+
+Everything feeds one process-wide registry, rendered in the Prometheus text
+format by render_prometheus() (served at /metrics by the API) or written to a
+file periodically by start_periodic_dump(). Collection is on by default and
+can be switched off with TALENTSCOUT_METRICS=0 or disable(); while off,
+span() returns a shared no-op context manager and inc() returns immediately,
+so instrumented code costs well under a microsecond per call.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds (upper bounds; +Inf is implicit)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_enabled = os.getenv("TALENTSCOUT_METRICS", "1") != "0"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+
+class _Span:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class Registry:
+    """Histograms and counters keyed by (name, sorted labels)."""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._callbacks: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, labels: LabelKey = ()) -> Histogram:
+        key = (name, labels)
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, Histogram())
+        return hist
+
+    def inc(self, name: str, labels: LabelKey = (), amount: float = 1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def register_callback(self, name: str, fn: Callable[[], float], kind: str = "gauge", help_text: str = ""):
+        """Register a value read at render time (e.g. a cache's hit count)."""
+        self._callbacks[name] = (kind, fn)
+        if help_text:
+            self._help[name] = help_text
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def counter_value(self, name: str, **labels) -> float:
+        return self._counters.get((name, _label_key(labels)), 0)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+        seen = set()
+
+        def header(name, kind):
+            if name not in seen:
+                seen.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), hist in histograms:
+            header(name, "histogram")
+            with hist._lock:
+                counts, total, count = list(hist.counts), hist.sum, hist.count
+            cumulative = 0
+            for bound, n in zip(hist.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        for name, (kind, fn) in sorted(self._callbacks.items()):
+            try:
+                value = fn()
+            except Exception:  # a broken callback must not break the endpoint
+                logger.exception("Metric callback %s failed", name)
+                continue
+            header(name, kind)
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    if len(labels) == 1:  # the common case needs no sorting
+        (k, v), = labels.items()
+        return ((k, v if isinstance(v, str) else str(v)),)
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+
+# ---------- module-level API ----------
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def span(name: str, **labels):
+    """Time a block into histogram `name`; a shared no-op when disabled."""
+    if not _enabled:
+        return _NOOP
+    return _Span(REGISTRY.histogram(name, _label_key(labels) if labels else ()))
+
+
+def inc(name: str, amount: float = 1, **labels):
+    if not _enabled:
+        return
+    REGISTRY.inc(name, _label_key(labels) if labels else (), amount)
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render()
+
+
+def start_periodic_dump(path: str, interval: float = 60.0) -> threading.Thread:
+    """Write render_prometheus() to path every interval seconds (daemon thread)."""
+
+    def dump_loop():
+        while True:
+            time.sleep(interval)
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(render_prometheus())
+                os.replace(tmp_path, path)
+            except OSError as exc:
+                logger.warning("Metrics dump to %s failed: %s", path, exc)
+
+    thread = threading.Thread(target=dump_loop, name="metrics-dump", daemon=True)
+    thread.start()
+    return thread
+
+
+REGISTRY.describe("talentscout_messages_total", "Chat messages handled, by stage")
+REGISTRY.describe("talentscout_validation_failures_total", "Rejected field values, by field")
+REGISTRY.describe("talentscout_stage_seconds", "process_message time per stage branch")
+REGISTRY.describe("talentscout_translate_seconds", "Remote translator calls, by direction")
+REGISTRY.describe("talentscout_sentiment_seconds", "Sentiment scoring per message")
+REGISTRY.describe("talentscout_question_generation_seconds", "generate_questions() calls")
+REGISTRY.describe("talentscout_save_seconds", "DataHandler.save() (enqueue or synchronous write)")
+REGISTRY.describe("talentscout_store_commit_seconds", "Group-commit write + fsync of the candidate store")
+REGISTRY.describe("talentscout_duplicates_total", "Saves matching a stored candidate, by match rule and outcome")
+REGISTRY.describe("talentscout_erasures_total", "Candidates erased from the store")
+REGISTRY.describe("talentscout_purged_segments_total", "Store segments deleted by retention")
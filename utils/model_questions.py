@@ -0,0 +1,286 @@
+"""
+Optional local-model question generation for techs missing from the question bank.
+
+Off by default: set TALENTSCOUT_QUESTION_MODEL to a seq2seq model name (e.g.
+google/flan-t5-small) to enable it (TALENTSCOUT_QUESTION_MODEL_DEADLINE_MS and
+TALENTSCOUT_QUESTION_CACHE_DIR tune it); transformers and torch are then imported
+on first use and the model runs on CPU. Requests from concurrent sessions are
+collected into micro-batches (up to max_batch techs, waiting at most
+max_wait_ms for more) and run through one generate() call. Results are cached
+per tech in memory and on disk, so each tech is generated once per model. A
+tech that is not ready within the caller's deadline gets the template
+questions instead; its generation still completes and is cached for the next
+candidate.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(ROOT, "data", "generated_questions")
+
+PROMPT = "Write a technical interview question for a software engineer about {tech}."
+MIN_QUESTIONS = 4  # fewer usable questions than this counts as a failed generation
+
+# generate(prompts, per_prompt) -> per_prompt candidate questions per prompt
+Backend = Callable[[List[str], int], List[List[str]]]
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+class Seq2SeqBackend:
+    """transformers seq2seq model on CPU, loaded on first call."""
+
+    def __init__(self, model_name: str, max_new_tokens: int = 48, threads: Optional[int] = None):
+        self.model_name = model_name
+        self.max_new_tokens = max_new_tokens
+        self.threads = threads
+        self._model = None
+        self._tokenizer = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                import torch
+                from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+                if self.threads:
+                    torch.set_num_threads(self.threads)
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name).eval()
+
+    def __call__(self, prompts: List[str], per_prompt: int) -> List[List[str]]:
+        if self._model is None:
+            self._load()
+        import torch
+
+        inputs = self._tokenizer(prompts, return_tensors="pt", padding=True, truncation=True)
+        with torch.inference_mode():
+            output = self._model.generate(
+                **inputs, max_new_tokens=self.max_new_tokens, do_sample=True, top_p=0.92,
+                num_return_sequences=per_prompt)
+        texts = self._tokenizer.batch_decode(output, skip_special_tokens=True)
+        return [texts[i * per_prompt:(i + 1) * per_prompt] for i in range(len(prompts))]
+
+
+def clean_questions(texts: Iterable[str], limit: int) -> List[str]:
+    """Deduplicated, question-shaped lines (at most limit)."""
+    seen = set()
+    out = []
+    for text in texts:
+        text = _SPACE_RE.sub(" ", text or "").strip().strip("\"'")
+        if len(text) < 15:
+            continue
+        if not text.endswith("?"):
+            text = text.rstrip(".") + "?"
+        key = text.casefold()
+        if key not in seen:
+            seen.add(key)
+            out.append(text)
+        if len(out) == limit:
+            break
+    return out
+
+
+class ModelQuestionGenerator:
+    """
+    Micro-batching front end for a Backend with per-tech memory and disk caches.
+
+    - questions(techs, timeout): {tech: questions} for every tech ready within
+      timeout seconds (default deadline_ms); the others are left out
+    - close(): stop the batching thread
+    """
+
+    def __init__(
+        self,
+        backend: Backend,
+        model_name: str = "custom",
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        max_batch: int = 8,
+        max_wait_ms: float = 20.0,
+        deadline_ms: float = 1500.0,
+        per_tech: int = 8,
+    ):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.deadline = deadline_ms / 1000.0
+        self.per_tech = per_tech
+        self.cache_dir = os.path.join(cache_dir, _slug(model_name)) if cache_dir else None
+        self.batches = 0  # backend calls made
+        self.timeouts = 0
+        self._cache: Dict[str, List[str]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = threading.Thread(target=self._batch_loop, name="question-model", daemon=True)
+        self._worker.start()
+
+    def questions(self, techs: Iterable[str], timeout: Optional[float] = None) -> Dict[str, List[str]]:
+        """Generated questions per tech; techs not ready by the deadline are left out."""
+        deadline = time.monotonic() + (self.deadline if timeout is None else timeout)
+        results: Dict[str, List[str]] = {}
+        waiting: Dict[str, Future] = {}
+        for tech in dict.fromkeys(techs):
+            cached = self._cached(tech)
+            if cached is not None:
+                if cached:
+                    results[tech] = cached
+                continue
+            waiting[tech] = self._submit(tech)
+        for tech, future in waiting.items():
+            try:
+                generated = future.result(max(deadline - time.monotonic(), 0))
+            except FutureTimeout:
+                self.timeouts += 1
+                metrics.inc("talentscout_question_model_timeouts_total")
+                continue
+            except Exception:
+                continue  # logged by the batch loop
+            if generated:
+                results[tech] = generated
+        return results
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    # ---------- internals ----------
+
+    def _cached(self, tech: str) -> Optional[List[str]]:
+        """Questions for tech from memory or disk ([] = generation failed before); None if unknown."""
+        cached = self._cache.get(tech)
+        if cached is not None or self.cache_dir is None:
+            return cached
+        path = self._cache_path(tech)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)["questions"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            logger.warning("Ignoring unreadable question cache %s", path)
+            return None
+        self._cache[tech] = cached
+        return cached
+
+    def _submit(self, tech: str) -> Future:
+        with self._lock:
+            future = self._inflight.get(tech)
+            if future is None and tech in self._cache:  # finished since _cached() was checked
+                future = Future()
+                future.set_result(self._cache[tech])
+            elif future is None:
+                future = self._inflight[tech] = Future()
+                self._queue.put(tech)
+            return future
+
+    def _batch_loop(self):
+        while True:
+            tech = self._queue.get()
+            if tech is None:
+                return
+            batch = [tech]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    tech = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if tech is None:
+                    self._queue.put(None)  # stop after this batch
+                    break
+                batch.append(tech)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[str]):
+        try:
+            with metrics.span("talentscout_question_model_seconds"):
+                outputs = self.backend([PROMPT.format(tech=tech) for tech in batch], self.per_tech)
+            self.batches += 1
+            error = None
+        except Exception as exc:
+            logger.exception("Question model failed for %d techs", len(batch))
+            outputs, error = [[] for _ in batch], exc
+
+        for tech, texts in zip(batch, outputs):
+            questions = clean_questions(texts, self.per_tech) if error is None else []
+            if len(questions) < MIN_QUESTIONS:
+                questions = []
+            if error is None:
+                self._store(tech, questions)
+            with self._lock:
+                if error is None:
+                    self._cache[tech] = questions
+                future = self._inflight.pop(tech)
+            if error is None:
+                future.set_result(questions)
+            else:
+                future.set_exception(error)
+
+    def _cache_path(self, tech: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(tech.encode("utf-8")).hexdigest()[:20] + ".json")
+
+    def _store(self, tech: str, questions: List[str]):
+        if self.cache_dir is None:
+            return
+        path = self._cache_path(tech)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"tech": tech, "questions": questions}, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+        except OSError as exc:
+            logger.warning("Could not cache questions for %s: %s", tech, exc)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+_default_generator: Optional[ModelQuestionGenerator] = None
+_default_lock = threading.Lock()
+_default_loaded = False
+
+
+def get_question_model() -> Optional[ModelQuestionGenerator]:
+    """
+    The process-wide generator named by TALENTSCOUT_QUESTION_MODEL, or None
+    (the default) when no model is configured.
+    """
+    global _default_generator, _default_loaded
+    if not _default_loaded:
+        with _default_lock:
+            if not _default_loaded:
+                model_name = os.getenv("TALENTSCOUT_QUESTION_MODEL", "").strip()
+                if model_name:
+                    _default_generator = ModelQuestionGenerator(
+                        Seq2SeqBackend(model_name), model_name=model_name,
+                        cache_dir=os.getenv("TALENTSCOUT_QUESTION_CACHE_DIR", DEFAULT_CACHE_DIR),
+                        deadline_ms=float(os.getenv("TALENTSCOUT_QUESTION_MODEL_DEADLINE_MS", "1500")))
+                _default_loaded = True
+    return _default_generator
+
+
+def set_question_model(generator: Optional[ModelQuestionGenerator]):
+    """Install (or with None, remove) the generator used by generate_questions()."""
+    global _default_generator, _default_loaded
+    with _default_lock:
+        _default_generator = generator
+        _default_loaded = True
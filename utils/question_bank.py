@@ -0,0 +1,242 @@
+"""
+Compiled, memory-mapped question bank.
+
+The editable source is a JSON file (data/question_bank.json):
+
+    {"version": 1, "techs": {"postgresql": {"aliases": ["postgres"], "questions": [...]}}}
+
+compile_bank() turns it into a compact binary index (.idx) next to it:
+
+    header   <4sHIII   magic, version, n_techs, n_aliases, n_questions
+    techs    <IHII     name offset, name length, first question, question count
+    aliases  <IHI      alias offset, alias length, tech number
+    offsets  <I * (n_questions + 1)   question i is blob[off[i]:off[i + 1]]
+    blob     UTF-8 strings
+
+QuestionBank maps the index read-only. Only tech and alias keys are held in
+Python objects (interned); question text stays in the mapping and is decoded
+only when sampled. Question ids hash (tech, question text), so they survive
+recompiles and hot reloads. get_question_bank() recompiles and swaps in a new bank
+when the source file changes, without a restart.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCE = os.path.join(ROOT, "data", "question_bank.json")
+
+_MAGIC = b"QBNK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIII")
+_TECH = struct.Struct("<IHII")
+_ALIAS = struct.Struct("<IHI")
+_OFFSET = struct.Struct("<I")
+
+# Seconds between mtime checks of the source file for hot reload
+RELOAD_CHECK_INTERVAL = 2.0
+
+_generations = count(1)
+
+
+def normalize_tech(name: str) -> str:
+    return " ".join((name or "").lower().split())
+
+
+def compile_bank(source: str, target: Optional[str] = None) -> str:
+    """Compile a JSON question bank into a binary index; returns the index path."""
+    target = target or os.path.splitext(source)[0] + ".idx"
+    with open(source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    blob = bytearray()
+    strings: Dict[str, Tuple[int, int]] = {}
+
+    def add_string(value: str) -> Tuple[int, int]:
+        if value not in strings:
+            raw = value.encode("utf-8")
+            strings[value] = (len(blob), len(raw))
+            blob.extend(raw)
+        return strings[value]
+
+    # Question text first, so consecutive offsets delimit each question
+    tech_entries = []  # (name, q_start, q_count)
+    aliases = {}  # alias -> tech number
+    offsets = []
+    for number, (name, entry) in enumerate(sorted(data.get("techs", {}).items())):
+        name = normalize_tech(name)
+        questions = list(dict.fromkeys(q.strip() for q in entry.get("questions", []) if q.strip()))
+        tech_entries.append((name, len(offsets), len(questions)))
+        for question in questions:
+            offsets.append(len(blob))
+            blob.extend(question.encode("utf-8"))
+        for alias in entry.get("aliases", []):
+            alias = normalize_tech(alias)
+            if alias and alias != name:
+                aliases.setdefault(alias, number)
+    offsets.append(len(blob))  # end of the last question
+
+    techs = []  # (name_off, name_len, q_start, q_count)
+    for name, q_start, q_count in tech_entries:
+        techs.append(add_string(name) + (q_start, q_count))
+
+    alias_rows = []
+    for alias, number in sorted(aliases.items()):
+        alias_off, alias_len = add_string(alias)
+        alias_rows.append((alias_off, alias_len, number))
+
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(techs), len(alias_rows), len(offsets) - 1))
+        for row in techs:
+            f.write(_TECH.pack(*row))
+        for row in alias_rows:
+            f.write(_ALIAS.pack(*row))
+        for off in offsets:
+            f.write(_OFFSET.pack(off))
+        f.write(blob)
+    os.replace(tmp_path, target)
+    return target
+
+
+class QuestionBank:
+    """Read-only view over a compiled index."""
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n_techs, n_aliases, n_questions = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{index_path} is not a version {_VERSION} question bank index")
+
+        pos = _HEADER.size
+        tech_rows = [_TECH.unpack_from(self._mm, pos + i * _TECH.size) for i in range(n_techs)]
+        pos += n_techs * _TECH.size
+        alias_rows = [_ALIAS.unpack_from(self._mm, pos + i * _ALIAS.size) for i in range(n_aliases)]
+        pos += n_aliases * _ALIAS.size
+        raw_offsets = memoryview(self._mm)[pos: pos + (n_questions + 1) * _OFFSET.size]
+        if sys.byteorder == "little":
+            self._offsets = raw_offsets.cast("I")  # zero-copy view into the mapping
+        else:
+            self._offsets = array("I", raw_offsets.tobytes())
+            self._offsets.byteswap()
+        self._blob_start = pos + (n_questions + 1) * _OFFSET.size
+
+        # tech -> (first question, count); alias -> canonical tech
+        self._techs: Dict[str, Tuple[int, int]] = {}
+        names = []
+        for name_off, name_len, q_start, q_count in tech_rows:
+            name = sys.intern(self._string(name_off, name_len))
+            names.append(name)
+            self._techs[name] = (q_start, q_count)
+        self._aliases: Dict[str, str] = {
+            sys.intern(self._string(off, length)): names[number] for off, length, number in alias_rows
+        }
+        self.question_count = n_questions
+        self._ids: Dict[str, List[int]] = {}  # tech -> question ids, filled on first use
+        # Distinct for every bank loaded in this process; keys caches of anything derived from it
+        self.generation = next(_generations)
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._blob_start + offset
+        return self._mm[start: start + length].decode("utf-8")
+
+    def resolve(self, tech: str) -> Optional[str]:
+        """Canonical tech name for a tech or alias, or None if unknown."""
+        key = normalize_tech(tech)
+        if key in self._techs:
+            return key
+        return self._aliases.get(key)
+
+    def count(self, tech: str) -> int:
+        canonical = self.resolve(tech)
+        return self._techs[canonical][1] if canonical else 0
+
+    def question(self, tech: str, i: int) -> str:
+        """The i-th question of a (canonical) tech, decoded from the mapping."""
+        start, _ = self._techs[tech]
+        lo, hi = self._offsets[start + i], self._offsets[start + i + 1]
+        return self._string(lo, hi - lo)
+
+    def question_id(self, tech: str, i: int) -> int:
+        """
+        Id of the i-th question of a (canonical) tech: a non-negative 31-bit
+        hash of tech and question text, the same in every compile of the bank.
+        """
+        ids = self._ids.get(tech)
+        if ids is None:
+            ids = self._ids[tech] = [
+                zlib.crc32(f"{tech}\n{self.question(tech, k)}".encode("utf-8")) & 0x7FFFFFFF
+                for k in range(self._techs[tech][1])
+            ]
+        return ids[i]
+
+    def questions(self, tech: str) -> List[str]:
+        canonical = self.resolve(tech)
+        if canonical is None:
+            return []
+        return [self.question(canonical, i) for i in range(self._techs[canonical][1])]
+
+    def techs(self) -> List[str]:
+        return list(self._techs)
+
+    def __contains__(self, tech: str) -> bool:
+        return self.resolve(tech) is not None
+
+    def __len__(self):
+        return len(self._techs)
+
+
+def load_bank(source: str = DEFAULT_SOURCE) -> QuestionBank:
+    """Load the compiled index for source, (re)compiling it if stale."""
+    index_path = os.path.splitext(source)[0] + ".idx"
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(source):
+        compile_bank(source, index_path)
+    return QuestionBank(index_path)
+
+
+_bank: Optional[QuestionBank] = None
+_bank_mtime = 0.0
+_last_check = 0.0
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """
+    Process-wide bank for QUESTION_BANK_PATH (default data/question_bank.json).
+    The source mtime is checked at most every RELOAD_CHECK_INTERVAL seconds;
+    when it changes the bank is recompiled and swapped in. Readers holding the
+    previous bank keep a valid mapping until they drop it.
+    """
+    global _bank, _bank_mtime, _last_check
+    now = time.monotonic()
+    if _bank is not None and now - _last_check < RELOAD_CHECK_INTERVAL:
+        return _bank
+    with _bank_lock:
+        source = os.getenv("QUESTION_BANK_PATH", DEFAULT_SOURCE)
+        _last_check = now
+        try:
+            mtime = os.path.getmtime(source)
+        except OSError:
+            if _bank is None:
+                raise
+            return _bank
+        if _bank is None or mtime != _bank_mtime:
+            _bank = load_bank(source)
+            _bank_mtime = mtime
+            logger.info("Loaded question bank %s (%d techs, %d questions)", source, len(_bank), _bank.question_count)
+    return _bank
@@ -1,120 +1,122 @@
 """
 Generates 4–5 unique technical questions per declared tech stack item.
 Ensures no duplicates are returned.
+Questions come from the compiled question bank (see utils/question_bank.py).
+Techs missing from the bank get template questions, or, if a local model is
+configured (utils/model_questions.py), questions generated for that tech.
 """
 
-from typing import List, Dict
+from typing import Dict, List, Optional, Set
+import hashlib
 import random
+import zlib
 
-# Seed for predictability in tests
-random.seed(42)
-
-# Small knowledge base of sample questions per tech
-_QBANK = {
-    "python": [
-        "Explain list comprehensions and give an example.",
-        "What is the GIL in Python and how does it affect concurrency?",
-        "How would you profile and optimize a slow Python function?",
-        "What are Python decorators and when would you use them?",
-        "Explain the difference between shallow and deep copy in Python."
-    ],
-    "django": [
-        "Explain the Django request/response lifecycle.",
-        "What is Django ORM and how do you write migrations?",
-        "How would you create a custom middleware in Django?",
-        "What are Django signals and when to use them?",
-        "How does Django handle static and media files?"
-    ],
-    "flask": [
-        "Describe how routing works in Flask.",
-        "How do you manage configuration and environment variables in Flask apps?",
-        "How would you structure a medium-sized Flask application?",
-        "What are Flask Blueprints and why are they useful?",
-        "Explain how Flask handles sessions."
-    ],
-    "javascript": [
-        "Explain event loop and microtasks vs macrotasks in JavaScript.",
-        "What's the difference between var, let and const?",
-        "How do closures work in JavaScript?",
-        "Explain promises and async/await with an example.",
-        "What is hoisting in JavaScript?"
-    ],
-    "react": [
-        "Explain the virtual DOM and why React uses it.",
-        "When would you use useEffect and how to avoid infinite loops?",
-        "Describe the difference between controlled and uncontrolled components.",
-        "What is React context and when would you use it?",
-        "Explain React reconciliation."
-    ],
-    "sql": [
-        "What is an index and how does it improve query performance?",
-        "Explain the difference between INNER JOIN and LEFT JOIN.",
-        "How do you approach query optimization for large tables?",
-        "What is a primary key vs a foreign key?",
-        "Explain normalization and denormalization."
-    ],
-    "postgresql": [
-        "How do you perform full-text search in PostgreSQL?",
-        "Explain VACUUM and why it's necessary in PostgreSQL.",
-        "How would you set up replication for a Postgres database?",
-        "What are materialized views and when to use them?",
-        "Explain PostgreSQL transactions and isolation levels."
-    ],
-    "aws": [
-        "Explain the difference between EC2 and Lambda and when to use each.",
-        "How do you secure an S3 bucket and make static websites available?",
-        "What is IAM and how do you design least-privilege policies?",
-        "What is CloudFormation and how is it used?",
-        "Explain VPC and subnets in AWS."
-    ],
-    "linux": [
-        "How do you troubleshoot high CPU usage on a Linux server?",
-        "Explain file permissions and how to use chmod/chown.",
-        "How would you set up a scheduled task using cron?",
-        "What are systemd services?",
-        "Explain how to check open ports on a Linux system."
-    ],
-    "docker": [
-        "What is the difference between a Docker image and a container?",
-        "How do you create a multistage Dockerfile for a Python app?",
-        "How do you persist data in Docker containers?",
-        "What is Docker Compose and how is it useful?",
-        "Explain the concept of Docker networking."
-    ],
-}
-
-def generate_questions(tech_stack: List[str], min_q=4, max_q=5) -> Dict[str, List[str]]:
+from utils.model_questions import get_question_model
+from utils.question_bank import get_question_bank
+
+# Generic fallback templates for techs missing from the question bank
+_GENERIC_TEMPLATES = (
+    "[{tech}] Describe core concepts and common pitfalls when working with {tech}.",
+    "[{tech}] What are best practices when using {tech} in production?",
+    "[{tech}] How would you troubleshoot performance issues in {tech}?",
+    "[{tech}] How do you handle scaling and optimization in {tech}?",
+    "[{tech}] Explain debugging and monitoring techniques for {tech}.",
+)
+
+
+def candidate_seed(email: str, tech_stack: List[str]) -> int:
+    """Deterministic seed for a candidate and stack (reproducible for audits)."""
+    key = (email or "").strip().lower() + "|" + ",".join(sorted(t.strip().lower() for t in tech_stack))
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+
+def _generic_id(tech: str, k: int) -> int:
+    # Negative ids never collide with bank ids (which are >= 0)
+    return -((zlib.crc32(tech.encode("utf-8")) & 0x0FFFFFFF) * len(_GENERIC_TEMPLATES) + k) - 1
+
+
+_MAX_GENERATED = 16  # generated questions per tech that get distinct ids
+
+
+def _generated_id(tech: str, k: int) -> int:
+    # Below every _generic_id and still within the signed 32-bit ids ConversationState stores
+    return -(1 << 31) + (zlib.crc32(tech.encode("utf-8")) & 0x007FFFFF) * _MAX_GENERATED + k
+
+
+def _pick(rng: random.Random, ids: List[int], exclude: Optional[Set[int]], min_q: int, max_q: int) -> List[int]:
+    """Sample positions into ids, skipping excluded ids; [] when none are left."""
+    available = [pos for pos, qid in enumerate(ids) if not exclude or qid not in exclude]
+    if not available:
+        return []
+    if exclude is None and len(available) < min_q:
+        # If bank has fewer than min_q, repeat random questions to reach min_q
+        return rng.sample(available * ((min_q // len(available)) + 1), min_q)
+    upper = min(max_q, len(available))
+    return rng.sample(available, rng.randint(min(min_q, upper), upper))
+
+
+def generate_questions(
+    tech_stack: List[str],
+    min_q=4,
+    max_q=5,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+    exclude: Optional[Set[int]] = None,
+    fallbacks: Optional[Set[str]] = None,
+) -> Dict[str, List[str]]:
     """
-    For each declared tech, sample unique questions from _QBANK.
+    For each declared tech, sample unique questions from the question bank
+    (aliases such as "postgres" resolve to their canonical tech).
     Ensures 4–5 questions PER tech stack item.
     Returns a dict {tech: [questions]}.
+
+    Sampling uses a per-call RNG (rng, or random.Random(seed)), so calls are
+    thread-safe and reproducible for a given seed. If exclude is given, ids of
+    questions already asked are skipped and the new picks are added to it, so
+    repeated calls draw fresh questions; techs with nothing left are omitted.
+    If fallbacks is given, techs that got template questions while a local
+    model is configured (it missed the deadline) are added to it, so callers
+    can avoid caching an answer the model will improve on.
     """
     techs = [t.strip().lower() for t in tech_stack if t and t.strip()]
     if not techs:
         return {"general": ["Please specify some technologies to generate questions for."]}
 
+    rng = rng or random.Random(seed)
+    bank = get_question_bank()
+    model = get_question_model()
+    generated = {}
+    if model is not None:
+        # One request (and one shared deadline) for every unknown tech
+        unknown = [tech for tech in techs if not (bank.resolve(tech) and bank.count(bank.resolve(tech)))]
+        if unknown:
+            generated = model.questions(unknown)
     results = {}
     for tech in techs:
-        bank = _QBANK.get(tech)
-        if bank:
-            # Ensure min 4 questions and max 5, even if bank has exactly 5
-            num_questions = random.randint(min_q, min(max_q, len(bank)))
-            # If bank has fewer than min_q, repeat random questions to reach min_q
-            if len(bank) < min_q:
-                extended_bank = bank * ((min_q // len(bank)) + 1)
-                results[tech] = [f"[{tech}] {q}" for q in random.sample(extended_bank, min_q)]
-            else:
-                results[tech] = [f"[{tech}] {q}" for q in random.sample(bank, num_questions)]
+        canonical = bank.resolve(tech)
+        count = bank.count(canonical) if canonical else 0
+        if count:
+            tech = canonical
+            if tech in results:
+                continue
+            ids = [bank.question_id(tech, i) for i in range(count)]
+            picks = _pick(rng, ids, exclude, min_q, max_q)
+            questions = [f"[{tech}] {bank.question(tech, i)}" for i in picks]
+        elif tech in generated:
+            texts = generated[tech][:_MAX_GENERATED]
+            ids = [_generated_id(tech, k) for k in range(len(texts))]
+            picks = _pick(rng, ids, exclude, min_q, max_q)
+            questions = [f"[{tech}] {texts[k]}" for k in picks]
         else:
             # Generic fallback for unknown tech
-            generic_qs = [
-                f"[{tech}] Describe core concepts and common pitfalls when working with {tech}.",
-                f"[{tech}] What are best practices when using {tech} in production?",
-                f"[{tech}] How would you troubleshoot performance issues in {tech}?",
-                f"[{tech}] How do you handle scaling and optimization in {tech}?",
-                f"[{tech}] Explain debugging and monitoring techniques for {tech}."
-            ]
-            num_questions = random.randint(min_q, max_q)
-            results[tech] = random.sample(generic_qs, num_questions)
+            ids = [_generic_id(tech, k) for k in range(len(_GENERIC_TEMPLATES))]
+            picks = _pick(rng, ids, exclude, min_q, max_q)
+            questions = [_GENERIC_TEMPLATES[k].format(tech=tech) for k in picks]
+            if model is not None and fallbacks is not None:
+                fallbacks.add(tech)
+        if exclude is not None:
+            exclude.update(ids[i] for i in picks)
+        if questions:
+            results[tech] = questions
 
     return results
@@ -0,0 +1,102 @@
+"""
+Cache of rendered question blocks for the tech_stack reply.
+
+Most candidates submit one of a few popular stacks, so the formatted and
+translated question list is rendered once per (normalized stack, sampling
+seed, language, question-bank generation) and shared; only the personalized "Thank you {name}" line is
+rendered per candidate. To keep replies varied, each stack has `variants`
+sampling seeds and a candidate is assigned one deterministically from their
+own seed (utils.question_generator.candidate_seed), so the questions a
+candidate saw can still be reproduced. A hot-reloaded bank has a new
+generation, so blocks rendered from the old one are never served again (they
+age out of the LRU). Blocks that hold template stand-ins for questions the
+local model has not generated yet are returned but not cached.
+"""
+
+import hashlib
+import threading
+from collections import namedtuple
+from typing import Callable, FrozenSet, Iterable, Optional, Tuple
+
+from utils import metrics
+from utils.translation import TranslationCache
+
+# text: formatted (and translated) question list; question_ids: ids to mark as asked
+RenderedBlock = namedtuple("RenderedBlock", ["text", "question_ids"])
+
+QUESTION_VARIANTS = 8
+
+
+def stack_key(tech_stack: Iterable[str]) -> Tuple[str, ...]:
+    """Normalized stack: lowercased, deduplicated, sorted."""
+    return tuple(sorted({t.strip().lower() for t in tech_stack if t and t.strip()}))
+
+
+def variant_seed(stack: Tuple[str, ...], variant: int) -> int:
+    """Sampling seed shared by every candidate assigned `variant` of `stack`."""
+    key = ",".join(stack) + f"#{variant}"
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+
+class RenderedQuestionCache:
+    """Size-bounded LRU of RenderedBlocks with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 512, variants: int = QUESTION_VARIANTS):
+        self.variants = variants
+        self._cache = TranslationCache(maxsize)
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def get_or_render(
+        self,
+        stack: Tuple[str, ...],
+        candidate_seed: int,
+        lang: str,
+        render: Callable[[Tuple[str, ...], int], Tuple[str, FrozenSet[int], bool]],
+        generation: int = 0,
+    ) -> RenderedBlock:
+        """
+        The block for stack (see stack_key) in lang from question-bank
+        generation; on a miss, render(stack, seed) builds it and returns
+        (text, question ids, cacheable).
+        """
+        seed = variant_seed(stack, candidate_seed % self.variants)
+        key = (stack, seed, lang, generation)
+        block = self._cache.get(key)
+        if block is None:
+            text, question_ids, cacheable = render(stack, seed)
+            block = RenderedBlock(text, frozenset(question_ids))
+            if cacheable:
+                self._cache.put(key, block)
+        return block
+
+
+_default_cache: Optional[RenderedQuestionCache] = None
+_default_lock = threading.Lock()
+
+
+def get_rendered_question_cache() -> RenderedQuestionCache:
+    """Return the process-wide RenderedQuestionCache (created on first use)."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                cache = RenderedQuestionCache()
+                metrics.REGISTRY.register_callback(
+                    "talentscout_rendered_questions_hits_total", lambda: cache.hits, "counter")
+                metrics.REGISTRY.register_callback(
+                    "talentscout_rendered_questions_misses_total", lambda: cache.misses, "counter")
+                _default_cache = cache
+    return _default_cache
@@ -0,0 +1,324 @@
+"""
+Streaming candidate reports and exports.
+
+iter_records() yields stored records one at a time from a JSON Lines file
+or a legacy JSON array, without loading the file; store_files() lists the
+files of a store (every segment of a segmented one, in order) and
+erased_keys() its pending erasures, whose records reports must skip.
+ReportAggregates folds records in as they stream past (submissions per day,
+resubmission and duplicate rates); candidate-level counts (candidates per
+tech, experience distribution) come from each candidate's latest record via
+candidate_stats(), so they do not depend on whether superseded versions have
+been compacted away yet. Only the stream totals are saved and resumed, so
+the report state stays small and an incremental run streams only records
+saved since the previous one. Writers
+emit CSV rows and PDF pages in chunks, keeping memory flat.
+"""
+
+import csv
+import json
+import os
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from data_handler import DataHandler, anonymize, list_segments, load_tombstones, segment_dir_for, segment_path
+from utils.candidate_index import CandidateIndex
+from utils.conversation_state import FIELD_KEYS
+
+EXPORT_COLUMNS = list(FIELD_KEYS) + ["tech_stack", "_saved_at"]
+
+# (label, lowest year) in ascending order
+EXPERIENCE_BUCKETS = (("0-1", 0), ("2-4", 2), ("5-9", 5), ("10-14", 10), ("15+", 15))
+
+_READ_CHUNK = 1 << 16
+
+
+def iter_records(path: str, start_offset: int = 0) -> Iterator[Tuple[Dict, int]]:
+    """
+    Yield (record, end_offset) pairs. JSON Lines stores can resume from a byte
+    offset; legacy JSON arrays are decoded incrementally (end_offset is 0).
+    """
+    with open(path, "rb") as f:
+        head = f.read(64).lstrip()
+    if head.startswith(b"["):
+        with open(path, "r", encoding="utf-8") as f:
+            for record in _iter_json_array(f):
+                yield record, 0
+        return
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for line in f:
+            offset += len(line)
+            if line.strip():
+                yield json.loads(line), offset
+
+
+def resolve_store(store: str) -> str:
+    """The segment directory when store names a segmented store by its base path."""
+    if not os.path.isdir(store) and os.path.isdir(segment_dir_for(store)):
+        return segment_dir_for(store)
+    return store
+
+
+def store_files(store: str) -> List[Tuple[str, str]]:
+    """(name, path) of each file of a store in read order: its segments, or the file itself."""
+    if os.path.isdir(store):
+        return [(segment, segment_path(store, segment)) for segment in list_segments(store)]
+    return [("", store)]
+
+
+def erased_keys(store: str) -> Dict[str, str]:
+    """{hashed email: erased_at} of a segmented store's erasures not yet compacted away."""
+    if not os.path.isdir(store):
+        return {}
+    return {key: erased_at for key, (erased_at, _) in load_tombstones(store).items()}
+
+
+def _iter_json_array(f) -> Iterator[Dict]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    pos = 0
+    started = False
+    while True:
+        # Skip separators
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+            started = started or buffer[pos] == "["
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        if pos >= len(buffer) or not started:
+            if eof:
+                return
+            chunk = f.read(_READ_CHUNK)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(_READ_CHUNK)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        yield record
+        pos = end
+
+
+def experience_bucket(value) -> str:
+    try:
+        years = int(str(value).strip())
+    except (TypeError, ValueError):
+        return "unknown"
+    if years < 0:
+        return "unknown"
+    label = EXPERIENCE_BUCKETS[0][0]
+    for name, lowest in EXPERIENCE_BUCKETS:
+        if years >= lowest:
+            label = name
+    return label
+
+
+def candidate_stats(store: str) -> Dict:
+    """
+    {"candidates", "techs", "years"} over each candidate's latest record (years
+    keyed by whole year, -1 unknown). A segmented store answers from its own
+    deduplicated index (DataHandler.stats()); a single file is indexed in passing.
+    """
+    if os.path.isdir(store):
+        dh = DataHandler(os.path.splitext(store)[0] + ".jsonl", write_behind=False, auto_compact=False, dedupe=False)
+        try:
+            return dh.stats()
+        finally:
+            dh.close()
+    index = CandidateIndex()
+    for i, (record, _) in enumerate(iter_records(store)):
+        index.add(anonymize(record).get("email") or f"#{i}", record)  # later records replace earlier ones
+    techs, years = index.counts()
+    return {"candidates": len(index), "techs": techs, "years": years}
+
+
+class ReportAggregates:
+    """
+    Running totals over a stream of records (records, resubmissions,
+    duplicates, submissions per day), plus candidate-level counts taken from
+    the store's latest records (set_candidates()), so neither depends on
+    whether superseded versions have been compacted away. A merged version is
+    a resubmission when the store matched it by email (or alias), else a
+    duplicate (matched by phone or name). Only the stream totals are saved:
+    the state stays the same size however many candidates the store holds.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.resubmissions = 0
+        self.duplicates = 0
+        self.candidates = 0
+        self.techs: Counter = Counter()
+        self.experience: Counter = Counter()
+        self.per_day: Counter = Counter()
+        self.watermark = ""  # highest _saved_at folded in
+
+    def add(self, record: Dict) -> bool:
+        """Fold one record in; returns False if it is a later version of a stored candidate."""
+        self.records += 1
+        saved_at = record.get("_saved_at") or ""
+        if saved_at:
+            self.per_day[saved_at[:10]] += 1
+            self.watermark = max(self.watermark, saved_at)
+        if int(record.get("_version") or 1) <= 1:
+            return True
+        if record.get("_merged_by", "email") == "email":
+            self.resubmissions += 1
+        else:
+            self.duplicates += 1
+        return False
+
+    def set_candidates(self, stats: Dict):
+        """Candidate-level counts from candidate_stats()."""
+        self.candidates = stats["candidates"]
+        self.techs = Counter(stats["techs"])
+        self.experience = Counter()
+        for years, count in stats["years"].items():
+            self.experience[experience_bucket(years) if int(years) >= 0 else "unknown"] += count
+
+    @property
+    def duplicate_rate(self) -> float:
+        return self.duplicates / self.records if self.records else 0.0
+
+    def summary(self) -> Dict:
+        order = [name for name, _ in EXPERIENCE_BUCKETS] + ["unknown"]
+        return {
+            "records": self.records,
+            "candidates": self.candidates,
+            "resubmissions": self.resubmissions,
+            "duplicates": self.duplicates,
+            "duplicate_rate": round(self.duplicate_rate, 4),
+            "candidates_per_tech": dict(self.techs.most_common()),
+            "experience": {name: self.experience[name] for name in order if self.experience[name]},
+            "submissions_per_day": dict(sorted(self.per_day.items())),
+            "watermark": self.watermark,
+        }
+
+    # ---------- incremental state ----------
+
+    def save_state(self, path: str, extra: Optional[Dict] = None):
+        """Write the stream totals to path (JSON)."""
+        state = {
+            "records": self.records,
+            "resubmissions": self.resubmissions,
+            "duplicates": self.duplicates,
+            "per_day": dict(self.per_day),
+            "watermark": self.watermark,
+        }
+        state.update(extra or {})
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load_state(cls, path: str) -> Tuple["ReportAggregates", Dict]:
+        """Resume from save_state(); returns (aggregates, raw state dict)."""
+        agg = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        agg.records = state["records"]
+        agg.resubmissions = state.get("resubmissions", 0)
+        agg.duplicates = state["duplicates"]
+        agg.per_day = Counter(state["per_day"])
+        agg.watermark = state["watermark"]
+        return agg, state
+
+
+# ---------- writers ----------
+
+def write_csv_chunks(records: Iterable[Dict], out: TextIO, chunk_size: int = 1000, header: bool = True) -> int:
+    """Write records as CSV rows, flushing every chunk_size rows; returns the row count."""
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    rows: List[List[str]] = []
+    count = 0
+    for record in records:
+        rows.append([_cell(record.get(column)) for column in EXPORT_COLUMNS])
+        if len(rows) >= chunk_size:
+            writer.writerows(rows)
+            out.flush()
+            count += len(rows)
+            rows = []
+    writer.writerows(rows)
+    out.flush()
+    return count + len(rows)
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+class PdfReport:
+    """
+    Summary PDF written page by page with reportlab (imported lazily).
+    The candidate listing is capped at max_rows, since reportlab keeps every
+    page in memory until save(); the CSV export is the full listing.
+    """
+
+    def __init__(self, path: str, title: str, max_rows: int = 2000):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_rows = max_rows
+        self.rows = 0
+        self._canvas = canvas.Canvas(path, pagesize=A4)
+        self._width, self._height = A4
+        self._y = self._height - 80
+        self._canvas.setFont("Helvetica-Bold", 18)
+        self._canvas.drawString(50, self._y, title)
+        self._y -= 30
+        self._canvas.setFont("Helvetica", 10)
+
+    def line(self, text: str = "", bold: bool = False):
+        if self._y < 50:
+            self._canvas.showPage()
+            self._y = self._height - 50
+        self._canvas.setFont("Helvetica-Bold" if bold else "Helvetica", 10)
+        self._canvas.drawString(50, self._y, text[:110])
+        self._y -= 14
+
+    def summary(self, summary: Dict):
+        self.line(f"Records: {summary['records']}   Candidates: {summary['candidates']}   "
+                  f"Duplicates: {summary['duplicates']} ({summary['duplicate_rate']:.1%})", bold=True)
+        self.line()
+        for title, key in (("Candidates per tech", "candidates_per_tech"),
+                           ("Experience (years)", "experience"),
+                           ("Submissions per day", "submissions_per_day")):
+            self.line(title, bold=True)
+            for name, count in summary[key].items():
+                self.line(f"    {name:<30} {count}")
+            self.line()
+
+    def candidates(self, records: Iterable[Dict]):
+        """Append the candidate listing; each full page is emitted as it fills."""
+        self.line("Candidates", bold=True)
+        for record in records:
+            if self.rows >= self.max_rows:
+                self.line(f"... listing capped at {self.max_rows} rows; see the CSV export")
+                return
+            self.line(f"{record.get('_saved_at', '')[:19]}  {_cell(record.get('full_name'))[:28]:<28} "
+                      f"{_cell(record.get('years_experience')):>3}y  {_cell(record.get('current_location'))[:18]:<18} "
+                      f"{_cell(record.get('tech_stack'))}")
+            self.rows += 1
+
+    def save(self):
+        self._canvas.save()
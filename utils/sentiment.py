@@ -0,0 +1,206 @@
+"""
+Shared sentiment engine.
+
+Scores each message once per turn for both the chatbot and the UI. Results
+are memoized on normalized text, and score_batch() scores many messages with
+one lexicon lookup per distinct token instead of one TextBlob per message.
+The scoring rules mirror TextBlob's PatternAnalyzer (modifiers, negation,
+exclamation marks, emoticons) over the same lexicon. TextBlob (and nltk
+behind it) is imported on first use, not at module import.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SentimentResult = namedtuple("SentimentResult", ["polarity", "label"])
+
+POSITIVE_THRESHOLD = 0.2
+NEGATIVE_THRESHOLD = -0.2
+
+
+def label_for(polarity: float) -> str:
+    """Map polarity to the categories used across the app."""
+    if polarity > POSITIVE_THRESHOLD:
+        return "positive"
+    if polarity < NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+
+def normalize(text: str) -> str:
+    """Normalization used as the memo key (whitespace insensitive)."""
+    return " ".join((text or "").split())
+
+
+def _pattern():
+    """TextBlob's pattern Sentiment lexicon (imported lazily; it pulls in nltk)."""
+    from textblob.en import sentiment
+    return sentiment
+
+
+def _clamp(value: float) -> float:
+    return max(-1.0, min(value, 1.0))
+
+
+class SentimentService:
+    """
+    Memoizing sentiment scorer over the pattern lexicon.
+    """
+
+    def __init__(self, maxsize: int = 8192):
+        self.maxsize = maxsize
+        self._memo: "OrderedDict[str, SentimentResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._table: Optional[Dict[str, Tuple[float, float, bool]]] = None
+        self._emoticons: Dict[str, float] = {}
+        self._punctuation = ()
+        self._negations = ()
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- public API ----------
+
+    def score(self, text: str) -> SentimentResult:
+        """Score one message (memoized)."""
+        key = normalize(text)
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        result = self._score_tokens(self._tokenize(key))
+        self._remember(key, result)
+        return result
+
+    def score_batch(self, texts: Iterable[str]) -> List[SentimentResult]:
+        """
+        Score many messages at once. Duplicate texts are scored once and each
+        distinct token is looked up in the lexicon once for the whole batch.
+        """
+        keys = [normalize(t) for t in texts]
+        results: Dict[str, SentimentResult] = {}
+        with self._lock:
+            for key in keys:
+                cached = self._memo.get(key)
+                if cached is not None:
+                    results[key] = cached
+        todo = [k for k in dict.fromkeys(keys) if k not in results]
+
+        tokenized = {key: self._tokenize(key) for key in todo}
+        table = self._lexicon()
+        vocab = {tok for toks in tokenized.values() for tok in toks}
+        lookup = {tok: table.get(tok) for tok in vocab}
+
+        for key, toks in tokenized.items():
+            result = self._score_tokens(toks, lookup)
+            results[key] = result
+            self._remember(key, result)
+        return [results[key] for key in keys]
+
+    def polarity(self, text: str) -> float:
+        return self.score(text).polarity
+
+    # ---------- internals ----------
+
+    def _remember(self, key: str, result: SentimentResult):
+        with self._lock:
+            self._memo[key] = result
+            while len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+
+    def _lexicon(self) -> Dict[str, Tuple[float, float, bool]]:
+        """Flatten the pattern lexicon into word -> (polarity, intensity, is_modifier)."""
+        if self._table is None:
+            with self._load_lock:
+                if self._table is None:
+                    self._load()
+        return self._table
+
+    def _load(self):
+        from textblob._text import EMOTICONS, PUNCTUATION
+
+        lexicon = _pattern()
+        lexicon.load()
+        table = {}
+        for word, senses in dict.items(lexicon):
+            p, _, i = senses.get(None, (0.0, 0.0, 1.0))
+            is_modifier = any(pos in senses for pos in lexicon.modifiers)
+            table[word] = (p, i, is_modifier)
+        self._emoticons = {
+            e.lower(): p for (_, p), faces in EMOTICONS.items() for e in faces
+        }
+        self._punctuation = PUNCTUATION
+        self._negations = lexicon.negations
+        self._tokenizer = lexicon.tokenizer
+        self._table = table
+
+    def warm_up(self):
+        """Import TextBlob and build the lexicon table ahead of the first message."""
+        self._lexicon()
+
+    def _tokenize(self, text: str) -> List[str]:
+        self._lexicon()
+        # Tokenize before lowercasing: the tokenizer is case-sensitive for emoticons
+        return [w.lower() for w in " ".join(self._tokenizer(text)).split()]
+
+    def _score_tokens(self, tokens: List[str], lookup: Optional[Dict] = None) -> SentimentResult:
+        table = lookup if lookup is not None else self._lexicon()
+        negations = self._negations
+        chunks = []  # [polarity, intensity, negated]
+        m = None  # preceding modifier ("really good")
+        n = None  # preceding negation ("not good")
+        for w in tokens:
+            entry = table.get(w)
+            if entry is not None:
+                p, i, is_modifier = entry
+                if m is None:
+                    chunks.append([p, i, False])
+                else:
+                    chunks[-1][0] = _clamp(p * chunks[-1][1])
+                    chunks[-1][1] = i
+                if n is not None:
+                    chunks[-1][1] = 1.0 / (chunks[-1][1] or 1.0)
+                    chunks[-1][2] = True
+                m = w if is_modifier else None
+                n = w if w in negations else None
+            else:
+                if w in negations:
+                    n = w
+                elif n and len(w.strip("'")) > 1:
+                    n = None
+                if n is not None and m is not None and m.endswith("ly"):
+                    chunks[-1][2] = True
+                    n = None
+                elif m and len(w) > 2:
+                    m = None
+                if w == "!" and chunks:
+                    chunks[-1][0] = _clamp(chunks[-1][0] * 1.25)
+                if w == "(!)":
+                    chunks.append([0.0, 1.0, False])
+                if not w.isalpha() and len(w) <= 5 and w not in self._punctuation and w in self._emoticons:
+                    chunks.append([self._emoticons[w], 1.0, False])
+
+        if not chunks:
+            polarity = 0.0
+        else:
+            polarity = sum(p * -0.5 if negated else p for p, _, negated in chunks) / len(chunks)
+        return SentimentResult(polarity, label_for(polarity))
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def get_sentiment_service() -> SentimentService:
+    """Return the process-wide SentimentService (created on first use)."""
+    global _default_service
+    if _default_service is None:
+        with _default_lock:
+            if _default_service is None:
+                _default_service = SentimentService()
+    return _default_service
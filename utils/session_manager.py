@@ -0,0 +1,155 @@
+"""
+In-process registry of candidate conversations for the API server.
+
+Live sessions are kept in an LRU bounded by max_live. Sessions idle for
+longer than idle_ttl (or pushed out of the LRU) are spilled to disk as
+compact ConversationState blobs and rehydrated on their next message, or
+dropped if no spill_dir is configured. Spilled sessions older than
+expire_ttl are deleted. Every chatbot shares the process-wide
+translation/sentiment services, so a session only carries its own state
+and the recent window of its ContextManager; with a transcript_dir the
+full transcript is on disk and survives spilling.
+"""
+
+import asyncio
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from chatbot import HiringAssistantChatbot
+from utils.context_manager import ContextManager, transcript_path
+from utils.conversation_state import ConversationState
+
+_SESSION_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class Session:
+    __slots__ = ("session_id", "chatbot", "context", "lock", "created_at", "last_seen", "sockets")
+
+    def __init__(self, session_id: str, chatbot: HiringAssistantChatbot, context: Optional[ContextManager] = None):
+        self.session_id = session_id
+        self.chatbot = chatbot
+        self.context = context if context is not None else ContextManager()
+        self.lock = asyncio.Lock()  # one in-flight message per session
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+        self.sockets = 0  # open WebSockets holding this object; never spilled while > 0
+
+
+class SessionManager:
+    """
+    Creates, looks up, spills and closes sessions. Turns of the same session
+    are serialized by a per-session asyncio lock; different sessions run
+    concurrently.
+    """
+
+    def __init__(
+        self,
+        max_live: int = 1000,
+        idle_ttl: float = 15 * 60,
+        expire_ttl: float = 24 * 60 * 60,
+        spill_dir: Optional[str] = None,
+        transcript_dir: Optional[str] = None,
+    ):
+        self.max_live = max_live
+        self.idle_ttl = idle_ttl
+        self.expire_ttl = expire_ttl
+        self.spill_dir = spill_dir
+        self.transcript_dir = transcript_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()  # LRU order
+
+    def create(self) -> Session:
+        session_id = uuid.uuid4().hex
+        session = Session(session_id, HiringAssistantChatbot(), self._context(session_id))
+        self._add(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._rehydrate(session_id)
+            if session is None:
+                return None
+            self._add(session)
+        self._sessions.move_to_end(session_id)
+        session.last_seen = time.time()
+        return session
+
+    def close(self, session_id: str) -> bool:
+        closed = self._sessions.pop(session_id, None) is not None
+        path = self._spill_path(session_id)
+        if path and os.path.exists(path):
+            os.remove(path)
+            closed = True
+        return closed
+
+    def sweep(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Spill (or drop) live sessions idle for longer than idle_ttl and delete
+        spilled sessions older than expire_ttl. Returns (evicted, expired).
+        """
+        now = now if now is not None else time.time()
+        evicted = 0
+        for session in list(self._sessions.values()):  # oldest first
+            if now - session.last_seen < self.idle_ttl:
+                break
+            if self._evict(session):
+                evicted += 1
+
+        expired = 0
+        if self.spill_dir:
+            for name in os.listdir(self.spill_dir):
+                path = os.path.join(self.spill_dir, name)
+                if name.endswith(".bin") and now - os.path.getmtime(path) > self.expire_ttl:
+                    os.remove(path)
+                    expired += 1
+        return evicted, expired
+
+    def __len__(self):
+        return len(self._sessions)
+
+    # ---------- internals ----------
+
+    def _add(self, session: Session):
+        self._sessions[session.session_id] = session
+        if len(self._sessions) > self.max_live:
+            for lru in list(self._sessions.values())[: len(self._sessions) - self.max_live]:
+                if lru is not session:
+                    self._evict(lru)
+
+    def _evict(self, session: Session) -> bool:
+        """Spill a session to disk (or drop it); sessions mid-turn or held by a socket are kept."""
+        if session.lock.locked() or session.sockets:
+            return False
+        path = self._spill_path(session.session_id)
+        if path:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(session.chatbot.conversation.to_bytes())
+            os.replace(tmp_path, path)
+        del self._sessions[session.session_id]
+        return True
+
+    def _rehydrate(self, session_id: str) -> Optional[Session]:
+        path = self._spill_path(session_id)
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            conversation = ConversationState.from_bytes(f.read())
+        os.remove(path)
+        return Session(session_id, HiringAssistantChatbot.from_state(conversation), self._context(session_id))
+
+    def _context(self, session_id: str) -> ContextManager:
+        """The session's context; reopening its transcript restores the window after a spill."""
+        path = transcript_path(session_id, self.transcript_dir) if self.transcript_dir else None
+        return ContextManager(transcript_path=path)
+
+    def _spill_path(self, session_id: str) -> Optional[str]:
+        if not self.spill_dir or not _SESSION_ID_RE.match(session_id or ""):
+            return None
+        return os.path.join(self.spill_dir, session_id + ".bin")
@@ -0,0 +1,224 @@
+"""
+Translation layer shared by every chat session.
+
+Wraps googletrans so that each turn costs at most one detect-and-translate
+call per direction, and keeps a bounded LRU cache keyed by (src, dest, text)
+so fixed prompts are only ever sent over the network once per language.
+googletrans is imported on first use, so English-only sessions never load it.
+Source languages are detected locally first (utils.lang_detect); the remote
+auto-detect is only used when the local detector is unsure.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils import metrics
+from utils.lang_detect import LocalLanguageDetector
+
+logger = logging.getLogger(__name__)
+
+# Languages offered in the Streamlit sidebar (label -> ISO code)
+SUPPORTED_LANGUAGES = {
+    "English": "en",
+    "French": "fr",
+    "German": "de",
+    "Spanish": "es",
+    "Telugu": "te",
+    "Hindi": "hi",
+}
+
+
+class TranslationCache:
+    """
+    Thread-safe, size-bounded LRU cache of translations.
+    Keys are (src, dest, text) tuples, values are (translated_text, src_lang).
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class TranslationService:
+    """
+    Single entry point for translating candidate input and bot replies.
+    """
+
+    def __init__(
+        self,
+        translator=None,
+        cache: Optional[TranslationCache] = None,
+        detector: Optional[LocalLanguageDetector] = None,
+        min_confidence: float = 0.8,
+    ):
+        self._translator = translator
+        self._translator_lock = threading.Lock()
+        self.cache = cache if cache is not None else TranslationCache()
+        self.detector = detector if detector is not None else LocalLanguageDetector()
+        self.min_confidence = min_confidence
+        self.local_detections = 0
+        self.remote_detections = 0
+
+    @property
+    def translator(self):
+        """googletrans Translator, created (and imported) on first use."""
+        if self._translator is None:
+            with self._translator_lock:
+                if self._translator is None:
+                    from googletrans import Translator
+                    self._translator = Translator()
+        return self._translator
+
+    def to_english(self, text: str, src: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """
+        Translate text into English in a single round-trip.
+        When src is None the language is detected locally; low-confidence
+        input falls back to auto-detection by the same remote call.
+        Returns (english_text, source_language). Language-neutral input
+        (emails, numbers, names) is returned as is without a remote call; its
+        source_language is src when given, else None.
+        """
+        if not text or src == "en":
+            return text, "en"
+
+        detection = self.detector.detect(text)
+        confident = detection.confidence >= self.min_confidence
+        if confident and detection.lang is None:
+            self.local_detections += 1
+            return text, src
+        if src is None:
+            if confident:
+                self.local_detections += 1
+                if detection.lang == "en":
+                    return text, "en"
+                src = detection.lang
+            else:
+                self.remote_detections += 1
+
+        key = (src or "auto", "en", text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with metrics.span("talentscout_translate_seconds", direction="to_en"):
+            result = self.translator.translate(text, src=src or "auto", dest="en")
+        lang = (result.src or src or "en").lower()
+        value = (result.text if lang != "en" else text, lang)
+        self.cache.put(key, value)
+        return value
+
+    def to_english_batch(self, texts: Iterable[str], src: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """
+        to_english() for many texts. Uncached texts are grouped by (detected)
+        source language and sent with one remote call per group; the results
+        land in the cache, so later to_english() calls for them are free.
+        """
+        texts = list(texts)
+        groups: Dict[str, List[str]] = {}
+        for text in dict.fromkeys(texts):
+            if not text or src == "en":
+                continue
+            lang = src
+            detection = self.detector.detect(text)
+            if detection.confidence >= self.min_confidence:
+                if detection.lang is None or (lang is None and detection.lang == "en"):
+                    continue
+                lang = lang or detection.lang
+            key = (lang or "auto", "en", text)
+            if self.cache.get(key) is None:
+                groups.setdefault(lang or "auto", []).append(text)
+
+        for lang, pending in groups.items():
+            with metrics.span("talentscout_translate_seconds", direction="to_en_batch"):
+                results = self.translator.translate(pending, src=lang, dest="en")
+            for text, result in zip(pending, results):
+                detected = (result.src or lang).lower() if lang == "auto" else lang
+                self.cache.put((lang, "en", text), (result.text if detected != "en" else text, detected))
+        return [self.to_english(text, src) for text in texts]
+
+    def from_english(self, text: str, dest: str) -> str:
+        """Translate an English reply into dest (no-op for English)."""
+        if not text or not dest or dest == "en":
+            return text
+
+        key = ("en", dest, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0]
+
+        with metrics.span("talentscout_translate_seconds", direction="from_en"):
+            translated = self.translator.translate(text, src="en", dest=dest).text
+        self.cache.put(key, (translated, "en"))
+        return translated
+
+    def prewarm(self, texts: Iterable[str], langs: Iterable[str]) -> int:
+        """
+        Populate the cache with translations of fixed prompt strings.
+        Failures are logged and skipped; returns the number of entries warmed.
+        """
+        texts = list(texts)
+        warmed = 0
+        for lang in langs:
+            if lang == "en":
+                continue
+            for text in texts:
+                try:
+                    self.from_english(text, lang)
+                    warmed += 1
+                except Exception as exc:  # network errors must not break startup
+                    logger.warning("Prewarm failed for lang '%s': %s", lang, exc)
+        return warmed
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def get_translation_service() -> TranslationService:
+    """Return the process-wide TranslationService (created on first use)."""
+    global _default_service
+    if _default_service is None:
+        with _default_lock:
+            if _default_service is None:
+                service = TranslationService()
+                metrics.REGISTRY.register_callback(
+                    "talentscout_translation_cache_hits_total", lambda: service.cache.hits, "counter")
+                metrics.REGISTRY.register_callback(
+                    "talentscout_translation_cache_misses_total", lambda: service.cache.misses, "counter")
+                metrics.REGISTRY.register_callback(
+                    "talentscout_language_detections_local_total", lambda: service.local_detections, "counter")
+                metrics.REGISTRY.register_callback(
+                    "talentscout_language_detections_remote_total", lambda: service.remote_detections, "counter")
+                _default_service = service
+    return _default_service
@@ -1,9 +1,18 @@
 # utils/validators.py
 import re
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from utils.conversation_state import FIELD_KEYS
+
+_EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+_PHONE_RE = re.compile(r"^\+\d{1,3}(?:\s?\d){6,14}$")
+_NAME_RE = re.compile(r"^[A-Za-z\s]{2,50}$")
+_LOCATION_RE = _NAME_RE
+_WHITESPACE_RE = re.compile(r"\s+")
 
 def validate_email(email: str) -> bool:
-    pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-    return re.match(pattern, email or "") is not None
+    return _EMAIL_RE.match(email or "") is not None
 
 def validate_phone(value: str) -> bool:
     """
@@ -17,8 +26,7 @@ def validate_phone(value: str) -> bool:
         +91 98765 43210
         +44 20 7946 0958
     """
-    pattern = r"^\+\d{1,3}(?:\s?\d){6,14}$"
-    return re.match(pattern, value or "") is not None
+    return _PHONE_RE.match(value or "") is not None
 
 def sanitize_tech_stack(stack: str):
     if not stack:
@@ -26,7 +34,82 @@ def sanitize_tech_stack(stack: str):
     return [tech.strip().lower() for tech in stack.split(",") if tech.strip()]
 
 def validate_name(name: str) -> bool:
-    return bool(re.match(r"^[A-Za-z\s]{2,50}$", name or ""))
+    return bool(_NAME_RE.match(name or ""))
 
 def validate_location(location: str) -> bool:
-    return bool(re.match(r"^[A-Za-z\s]{2,50}$", location or ""))
+    return bool(_LOCATION_RE.match(location or ""))
+
+def validate_years(value: str) -> bool:
+    return (value or "").isdigit()
+
+def validate_position(value: str) -> bool:
+    return bool(value)
+
+
+# ---------- field registry ----------
+
+def _collapse(value) -> str:
+    """Trim and collapse runs of whitespace to single spaces."""
+    return _WHITESPACE_RE.sub(" ", str(value)).strip()
+
+def _strip(value) -> str:
+    return str(value).strip()
+
+FieldValidator = namedtuple("FieldValidator", ["normalize", "check"])
+
+# One entry per collected field (keys match HiringAssistantChatbot.fields)
+FIELD_VALIDATORS: Dict[str, FieldValidator] = {
+    "full_name": FieldValidator(_collapse, validate_name),
+    "email": FieldValidator(_strip, validate_email),
+    "phone": FieldValidator(_collapse, validate_phone),
+    "years_experience": FieldValidator(_strip, validate_years),
+    "desired_position": FieldValidator(_collapse, validate_position),
+    "current_location": FieldValidator(_collapse, validate_location),
+}
+assert set(FIELD_VALIDATORS) == set(FIELD_KEYS)
+
+def validate_field(key: str, value) -> Tuple[bool, str]:
+    """Normalize and validate a single field; returns (ok, normalized_value)."""
+    validator = FIELD_VALIDATORS[key]
+    normalized = validator.normalize(value) if value is not None else ""
+    return validator.check(normalized), normalized
+
+
+BatchValidation = namedtuple("BatchValidation", ["columns", "errors", "valid"])
+BatchValidation.__doc__ = """
+columns: field -> list of normalized values (one per row)
+errors:  field -> list of row indices that failed (missing or invalid)
+valid:   list of bools, True when every field of the row passed
+"""
+
+def validate_batch(
+    records: Iterable[Mapping],
+    fields: Optional[Sequence[str]] = None,
+    accept: Optional[Callable[[str], bool]] = None,
+) -> BatchValidation:
+    """
+    Validate many candidate rows at once (e.g. a stored dump or a CSV upload).
+    Works column by column so each field's normalizer and pattern are bound once.
+    Values for which accept(value) is true pass unchecked (e.g. anonymized hashes).
+    """
+    rows = records if isinstance(records, list) else list(records)
+    fields = tuple(fields or FIELD_KEYS)
+    columns: Dict[str, List[str]] = {}
+    errors: Dict[str, List[int]] = {}
+    valid = [True] * len(rows)
+    for key in fields:
+        normalize, check = FIELD_VALIDATORS[key]
+        column: List[str] = []
+        failed: List[int] = []
+        append, fail = column.append, failed.append
+        for i, row in enumerate(rows):
+            value = row.get(key)
+            normalized = normalize(value) if value is not None else ""
+            append(normalized)
+            if not check(normalized) and not (accept and accept(normalized)):
+                fail(i)
+                valid[i] = False
+        columns[key] = column
+        if failed:
+            errors[key] = failed
+    return BatchValidation(columns, errors, valid)
@@ -0,0 +1,45 @@
+"""
+Background warm-up for lazily imported dependencies.
+
+TextBlob and googletrans are imported on first use so the first page renders
+quickly; this optionally preloads them (and pre-translates fixed prompts) on a
+daemon thread once the page is up. Set TALENTSCOUT_WARMUP=0 to disable.
+"""
+
+import logging
+import os
+import threading
+from typing import Iterable, Optional
+
+from utils.sentiment import get_sentiment_service
+from utils.translation import get_translation_service
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(languages: Iterable[str] = (), prompts: Iterable[str] = ()):
+    """Load the sentiment lexicon and, for non-English languages, the translator."""
+    get_sentiment_service().warm_up()
+    langs = [lang for lang in languages if lang != "en"]
+    if langs:
+        service = get_translation_service()
+        service.translator  # triggers the googletrans import
+        service.prewarm(prompts, langs)
+
+
+def _run(languages, prompts):
+    try:
+        warm_up(languages, prompts)
+    except Exception:
+        logger.exception("Background warm-up failed")
+
+
+def start_background_warmup(languages: Iterable[str] = (), prompts: Iterable[str] = ()) -> Optional[threading.Thread]:
+    """Start warm_up() on a daemon thread unless disabled via TALENTSCOUT_WARMUP=0."""
+    if os.getenv("TALENTSCOUT_WARMUP", "1") == "0":
+        return None
+    thread = threading.Thread(
+        target=_run, args=(list(languages), list(prompts)), name="warmup", daemon=True
+    )
+    thread.start()
+    return thread